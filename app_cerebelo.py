@@ -0,0 +1,20 @@
+"""Ponto de entrada único: os dois apps como páginas de um mesmo servidor.
+
+    streamlit run app_cerebelo.py
+
+Um processo só serve as duas páginas, que compartilham os caches do processo
+(`st.cache_resource` com o cache de simulações e o pool do
+`servico_simulacao`, conteúdo, matriz de impacto e specs dos gráficos) e a
+memória de base do Python e do Streamlit. Cada página é executada, e importa
+os seus módulos, só quando é aberta; nenhuma das duas importa pandas, e o
+Altair só é importado pela página de divisões quando os modelos dos gráficos
+não estão no cache em disco (`python graficos_divisoes.py`). Os scripts das
+páginas continuam rodando sozinhos com `streamlit run`.
+"""
+import streamlit as st
+
+pagina = st.navigation([
+    st.Page("divisoes_funcionais_cerebelo.py", title="Divisões, Movimento e Lesões", icon="🧠", default=True),
+    st.Page("streamlit_cerebelo_circuito.py", title="Circuito Cerebelar", icon="🔬"),
+])
+pagina.run()
@@ -0,0 +1,272 @@
+"""Aprendizado motor por LTD nas sinapses fibra paralela → célula de Purkinje.
+
+Modelo de taxas (Marr-Albus-Ito), um ensaio por movimento:
+
+- cada movimento (contexto) ativa um subconjunto fixo de fibras paralelas
+  (FP), com amplitude proporcional às FM;
+- a CP i dispara `W[i] · x` e a média das CPs vira a escala de inibição do
+  `modelo_ncp`, que dá a saída dos NCP;
+- o erro é a diferença entre a saída desejada do movimento e a dos NCP; a
+  fibra trepadeira de cada CP dispara acima do basal quando a saída ficou
+  abaixo do alvo (e abaixo do basal no caso contrário), com ganho dado pela
+  intensidade das FT;
+- FP ativa + FT acima do basal deprime a sinapse (LTD); abaixo do basal, a
+  sinapse se recupera (LTP), de modo que os NCP convergem para o alvo.
+
+No diretório da configuração:
+
+- `work.npy`: pesos em treino, num `.npy` mapeado em memória
+  (`np.lib.format.open_memmap`), alterado no lugar a cada ensaio; a matriz
+  CP × FP fica no cache de páginas do sistema, não no heap do processo;
+- `weights-<ensaio>.npy`: cópia imutável dos pesos de um checkpoint;
+- `curves.f32`: (contexto, saída NCP, erro) de cada ensaio, float32 cru; cada
+  checkpoint só acrescenta as linhas novas;
+- `checkpoint.npz`: ensaio atual, configuração e nome da cópia dos pesos,
+  trocado de forma atômica (arquivo temporário + `os.replace`) por último.
+
+A cada `CHECKPOINT_EVERY` ensaios (e ao fim de cada treino) a cópia dos pesos
+e as linhas novas das curvas são gravadas antes do `checkpoint.npz`, que
+passa a apontar para elas: o estado em disco é sempre o de algum ensaio, e um
+treino interrompido continua dele. Cada ensaio usa o subfluxo Philox do seu
+índice, então pausar e retomar reproduz exatamente o treino contínuo. Em
+memória ficam só as linhas das curvas ainda não gravadas (no máximo
+`CHECKPOINT_EVERY` mais um bloco).
+
+Abrir uma configuração não grava nada; o primeiro treino cria o diretório, e
+então os diretórios além dos `MAX_RUNS` usados mais recentemente são
+apagados (`prune_runs`).
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+from cache_simulacao import STREAM_LEARNING, philox_rng
+from modelo_ncp import PC_INHIBITION_SCALE_MAX, NCPParams, ncp_response
+
+LEARNING_DIR = Path(os.environ.get("CEREBELO_LEARNING_DIR",
+                                   Path(__file__).resolve().parent / ".cache" / "aprendizado"))
+CHECKPOINT_EVERY = 500
+MAX_RUNS = int(os.environ.get("CEREBELO_LEARNING_MAX_RUNS", "16"))   # Configurações mantidas em disco
+CHECKPOINT_FILE = "checkpoint.npz"
+WORK_FILE = "work.npy"
+CURVES_FILE = "curves.f32"
+CURVE_FIELDS = 3                 # Contexto, saída NCP e erro por ensaio
+DEFAULT_BLOCK_TRIALS = 100       # Ensaios entre duas atualizações da curva na interface
+MAX_TRIALS_PER_CALL = 20_000
+
+
+@dataclass(frozen=True)
+class LearningConfig:
+    n_pf: int = 2000
+    n_pc: int = 100
+    n_contexts: int = 4
+    pf_active_fraction: float = 0.05
+    w_init: float = 1.6              # Hz da CP por unidade de atividade de FP
+    pc_max_rate_hz: float = 200.0    # Taxa da CP que corresponde à inibição máxima
+    target_min_hz: float = 10.0      # Saídas desejadas dos NCP, espalhadas entre os movimentos
+    target_max_hz: float = 30.0
+    learning_rate: float = 0.005
+    cf_baseline_hz: float = 1.0
+    cf_noise_hz: float = 0.5
+    fm_strength: float = 5.0
+    ft_strength: float = 1.0
+    seed: int = 0
+
+    def run_id(self):
+        return hashlib.sha1(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()[:16]
+
+
+class LearningRun:
+    """Treino persistente de uma configuração; thread-safe (um bloco de ensaios por vez)."""
+
+    def __init__(self, config=LearningConfig(), directory=None, ncp_params=NCPParams()):
+        self.config = c = config
+        self.ncp_params = ncp_params
+        self.directory = Path(directory) if directory is not None else LEARNING_DIR / c.run_id()
+        self.lock = threading.Lock()
+
+        # Padrões de FP e alvos de cada movimento: fixos pela semente
+        rng = philox_rng(c.seed, STREAM_LEARNING)
+        n_active = max(1, int(round(c.pf_active_fraction * c.n_pf)))
+        self.active_pf = np.stack([np.sort(rng.choice(c.n_pf, n_active, replace=False))
+                                   for _ in range(c.n_contexts)])
+        self.pf_rate = c.fm_strength / 10.0     # Atividade das FP ativas (0-1), proporcional às FM
+        self.targets_hz = np.linspace(c.target_min_hz, c.target_max_hz, c.n_contexts)
+
+        if (self.directory / CHECKPOINT_FILE).exists():
+            self._load_checkpoint()
+        else:
+            self._initial_state()
+
+    # --- Persistência ---
+
+    def _initial_state(self):
+        self.weights = None       # `w_init` em todas as sinapses até o primeiro treino
+        self._working = False     # `weights` é o memmap gravável de `WORK_FILE`
+        self.trial = 0
+        self._saved_curves = np.empty((0, CURVE_FIELDS), dtype=np.float32)   # Linhas já em `CURVES_FILE`
+        self._new_curves = []     # Blocos de linhas ainda não gravados
+
+    def _load_checkpoint(self):
+        with np.load(self.directory / CHECKPOINT_FILE) as data:
+            if json.loads(str(data["config"])) != asdict(self.config):
+                raise ValueError(f"Checkpoint em {self.directory} pertence a outra configuração.")
+            weights_file = str(data["weights_file"])
+            self.trial = int(data["trial"])
+        # Só leitura até o primeiro treino, que copia os pesos para `WORK_FILE`
+        self.weights = np.load(self.directory / weights_file, mmap_mode="r")
+        self._working = False
+        self._saved_curves = self._map_curves(self.trial)
+        self._new_curves = []
+
+    def _map_curves(self, n_rows):
+        if n_rows == 0:
+            return np.empty((0, CURVE_FIELDS), dtype=np.float32)
+        # Linhas além de `n_rows` são de um checkpoint que não chegou a ser confirmado
+        return np.memmap(self.directory / CURVES_FILE, dtype=np.float32, mode="r", shape=(n_rows, CURVE_FIELDS))
+
+    def _working_weights(self):
+        """Pesos graváveis, mapeados de `WORK_FILE` (criado no primeiro treino após abrir ou reiniciar)."""
+        if not self._working:
+            first = not self.directory.exists()
+            self.directory.mkdir(parents=True, exist_ok=True)
+            work = np.lib.format.open_memmap(self.directory / WORK_FILE, mode="w+", dtype=np.float32,
+                                             shape=(self.config.n_pc, self.config.n_pf))
+            work[:] = self.config.w_init if self.weights is None else self.weights
+            self.weights, self._working = work, True
+            if first and self.directory.parent == LEARNING_DIR:
+                prune_runs(keep=self.directory)
+        return self.weights
+
+    def checkpoint(self):
+        """Grava cópia dos pesos e linhas novas das curvas e só então troca o `checkpoint.npz` (chamar com `lock`)."""
+        if self.weights is None:
+            return                # Nada treinado desde a abertura ou o reinício
+        # O diretório pode ter sido apagado por `prune_runs` com o treino aberto: os
+        # memmaps continuam válidos e o estado inteiro é regravado
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = f"tmp.{os.getpid()}.{threading.get_ident()}"
+        weights_file = f"weights-{self.trial:09d}.npy"
+        tmp = self.directory / f"{weights_file}.{suffix}"
+        with open(tmp, "wb") as f:
+            np.save(f, self.weights)
+        os.replace(tmp, self.directory / weights_file)
+
+        n_saved = len(self._saved_curves)
+        row_bytes = CURVE_FIELDS * np.dtype(np.float32).itemsize
+        curves_path = self.directory / CURVES_FILE
+        with open(curves_path, "r+b" if curves_path.exists() else "wb") as f:
+            if f.seek(0, os.SEEK_END) < n_saved * row_bytes:
+                f.seek(0)
+                f.write(np.ascontiguousarray(self._saved_curves).tobytes())
+            f.seek(n_saved * row_bytes)
+            for block in self._new_curves:
+                f.write(block.tobytes())
+            f.truncate()
+
+        tmp = self.directory / f"checkpoint.{suffix}.npz"
+        np.savez(tmp, trial=self.trial, weights_file=weights_file,
+                 config=json.dumps(asdict(self.config), sort_keys=True))
+        os.replace(tmp, self.directory / CHECKPOINT_FILE)
+
+        self._saved_curves = self._map_curves(self.trial)
+        self._new_curves = []
+        for old in self.directory.glob("weights-*.npy"):
+            if old.name != weights_file:
+                old.unlink(missing_ok=True)
+
+    def reset(self):
+        """Volta aos pesos iniciais e apaga o diretório da configuração (chamar com `lock`)."""
+        self._initial_state()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    # --- Treino ---
+
+    def _trial(self, trial):
+        c = self.config
+        rng = philox_rng(c.seed, STREAM_LEARNING, trial + 1)   # Subfluxo 0 é o dos padrões
+        context = int(rng.integers(c.n_contexts))
+        active = self.active_pf[context]
+
+        w_active = self.weights[:, active]
+        pc_rate = np.clip(w_active.sum(axis=1) * self.pf_rate, 0.0, c.pc_max_rate_hz)
+        pc_scale = PC_INHIBITION_SCALE_MAX * pc_rate.mean() / c.pc_max_rate_hz
+        ncp_rate = float(ncp_response(c.fm_strength, c.ft_strength, pc_scale, self.ncp_params).final_rate_hz)
+        error = self.targets_hz[context] - ncp_rate
+
+        # FT: desvio do basal proporcional ao erro e à intensidade das FT, com ruído por CP
+        cf_rate = np.maximum(c.cf_baseline_hz + c.ft_strength * error / 10.0
+                             + c.cf_noise_hz * rng.standard_normal(c.n_pc), 0.0)
+        delta = (-c.learning_rate * self.pf_rate) * (cf_rate - c.cf_baseline_hz)
+        self.weights[:, active] = np.maximum(w_active + delta[:, None].astype(np.float32), 0.0)
+        return context, ncp_rate, error
+
+    def train(self, n_trials, block_trials=DEFAULT_BLOCK_TRIALS):
+        """Gera o ensaio atual após cada bloco (para a interface atualizar a curva); grava checkpoints.
+
+        O lock vale por bloco, nunca entre dois `yield`: um treino abandonado no
+        meio (rerun do Streamlit) não bloqueia as outras sessões até ser coletado.
+        """
+        if not 1 <= n_trials <= MAX_TRIALS_PER_CALL:
+            raise ValueError(f"n_trials deve estar entre 1 e {MAX_TRIALS_PER_CALL} (recebido {n_trials}).")
+        remaining = n_trials
+        try:
+            while remaining > 0:
+                with self.lock:
+                    self._working_weights()
+                    n = min(block_trials, remaining)
+                    block = np.array([self._trial(t) for t in range(self.trial, self.trial + n)], dtype=np.float32)
+                    self._new_curves.append(block)
+                    previous, self.trial = self.trial, self.trial + n
+                    if self.trial // CHECKPOINT_EVERY > previous // CHECKPOINT_EVERY:
+                        self.checkpoint()
+                    trial = self.trial
+                remaining -= n
+                yield trial
+        finally:
+            # Também ao ser interrompido (p.ex. rerun do Streamlit no meio do treino)
+            with self.lock:
+                if self._new_curves:
+                    self.checkpoint()
+
+    # --- Leituras ---
+
+    @property
+    def curves(self):
+        """(contexto, saída NCP, erro) de cada ensaio: as linhas gravadas seguidas das pendentes."""
+        with self.lock:
+            return np.concatenate([self._saved_curves, *self._new_curves])
+
+    def learning_curve(self, window=DEFAULT_BLOCK_TRIALS):
+        """Erro absoluto médio e saída média por contexto em janelas de `window` ensaios."""
+        curves = self.curves
+        n_windows = len(curves) // window
+        if n_windows == 0:
+            return np.empty(0), np.empty(0), np.empty((0, self.config.n_contexts))
+        blocks = curves[:n_windows * window].reshape(n_windows, window, CURVE_FIELDS)
+        abs_error = np.abs(blocks[:, :, 2]).mean(axis=1)
+        context = blocks[:, :, 0].astype(np.int64)
+        onehot = context[:, :, None] == np.arange(self.config.n_contexts)
+        counts = onehot.sum(axis=1)
+        ncp_mean = np.where(counts > 0, (onehot * blocks[:, :, 1:2]).sum(axis=1) / np.maximum(counts, 1), np.nan)
+        trial_axis = (np.arange(n_windows) + 1) * window
+        return trial_axis, abs_error, ncp_mean
+
+
+def prune_runs(directory=LEARNING_DIR, max_runs=MAX_RUNS, keep=None):
+    """Apaga os diretórios de treino além dos `max_runs` com checkpoint mais recente.
+
+    Um treino ainda aberto em alguma sessão não perde nada: os pesos estão em
+    memória e o próximo checkpoint recria o diretório.
+    """
+    runs = [run for run in Path(directory).iterdir() if run.is_dir() and run != keep]
+    runs.sort(key=lambda run: (run / CHECKPOINT_FILE).stat().st_mtime if (run / CHECKPOINT_FILE).exists() else 0.0,
+              reverse=True)
+    for run in runs[max_runs - (keep is not None):]:
+        shutil.rmtree(run, ignore_errors=True)
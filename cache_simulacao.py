@@ -0,0 +1,118 @@
+"""Cache de resultados de simulação compartilhado pelo processo do servidor.
+
+Os resultados são determinísticos: cada simulação usa um gerador baseado em
+contador (Philox) cuja chave é derivada da semente e do fluxo, de modo que os
+mesmos parâmetros produzem sempre os mesmos picos. Assim, alunos que movem os
+controles para os mesmos valores recebem o resultado do cache em vez de uma
+nova simulação. A memória é limitada por `max_bytes`, com descarte LRU.
+"""
+import dataclasses
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("CEREBELO_SIM_CACHE_MB", "256")) * 1024 * 1024)
+
+# Fluxos independentes do gerador para cada tipo de simulação
+STREAM_SPIKE_TRAIN = 0
+STREAM_LIF_POPULATION = 1
+STREAM_NETWORK = 2
+STREAM_MONTE_CARLO = 3
+STREAM_OSCILLOSCOPE = 4
+STREAM_LEARNING = 5
+STREAM_SWEEP = 6
+
+
+def philox_rng(seed, stream=0, substream=0):
+    """Gerador Philox (baseado em contador) com chave (semente, fluxo).
+
+    `substream` ocupa a palavra mais alta do contador: subfluxos diferentes
+    (p.ex. um por ensaio) nunca se sobrepõem e não dependem de quem os sorteia.
+    """
+    key = np.array([seed, stream], dtype=np.uint64)
+    counter = np.array([0, 0, 0, substream], dtype=np.uint64)
+    return np.random.Generator(np.random.Philox(counter=counter, key=key))
+
+
+def cache_key(kind, *values):
+    """Chave hashável; floats são arredondados para absorver ruído de ponto flutuante."""
+    return (kind,) + tuple(round(v, 6) if isinstance(v, float) else v for v in values)
+
+
+def estimate_nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sum(estimate_nbytes(getattr(value, f.name)) for f in dataclasses.fields(value))
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    return sys.getsizeof(value)
+
+
+class SimulationCache:
+    """Cache LRU thread-safe com limite de memória e contadores de acerto/falta."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # chave -> (valor, nbytes)
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        nbytes = estimate_nbytes(value)
+        if nbytes > self.max_bytes:
+            return value
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self.total_bytes += nbytes
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_bytes
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Devolve o valor em cache ou calcula (fora do lock) e armazena."""
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,334 @@
+"""Gerador de carga: muitas sessões simultâneas contra um app iniciado localmente.
+
+Para cada nível de concorrência (padrão 10/50/200/500 sessões) sobe um
+servidor `streamlit run` novo e abre as sessões pelo mesmo websocket que o
+navegador usa (`/_stcore/stream`). Cada sessão repete o que um aluno faz:
+move um dos controles de interesse (sliders FM/FT/CP, fase do movimento,
+lesão) para uma posição "redonda", espera o rerun terminar, pensa um pouco
+e repete. Os controles dentro de fragmentos disparam reruns só do fragmento,
+como no navegador.
+
+No ponto de entrada multipágina (`app_cerebelo.py`) as sessões se dividem
+entre as páginas, cada uma com os controles da sua página.
+
+Relata, por nível: latência de rerun p50/p95/p99, vazão (reruns/s), RSS de
+pico e tempo de CPU do servidor, somados sobre o processo do Streamlit e os
+seus filhos (os workers do `servico_simulacao`, onde rodam as simulações). Como as posições são discretas, sessões
+diferentes pedem as mesmas simulações e o cache compartilhado
+(`cache_simulacao`) aparece como queda da latência ao longo do teste. Uso:
+
+    python carga_sessoes.py --levels 10 50 200 500 --output .cache/carga/resultado.json
+
+RSS e CPU do servidor dependem do pacote opcional `psutil`.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+APP_DIR = Path(__file__).resolve().parent
+# Controles exercitados em cada app (rótulos exatos dos widgets)
+CIRCUIT_CONTROLS = (
+    "⚡ Intensidade da Ativação por Fibras Musgosas (FM)",
+    "🌋 Intensidade da Ativação por Fibras Trepadeiras (FT)",
+    "🛡️ Força da Inibição da Célula de Purkinje (CP) sobre os NCP",
+)
+DIVISIONS_CONTROLS = (
+    "Selecione a Fase do Movimento:",
+    "Selecione a Área Cerebelar Lesada para Simulação:",
+)
+INTERACTIONS = {
+    "streamlit_cerebelo_circuito.py": CIRCUIT_CONTROLS,
+    "divisoes_funcionais_cerebelo.py": DIVISIONS_CONTROLS,
+    "app_cerebelo.py": CIRCUIT_CONTROLS + DIVISIONS_CONTROLS,
+}
+# Páginas (caminho da URL; "" é a página padrão) pelas quais as sessões se dividem
+PAGES = {"app_cerebelo.py": ("", "streamlit_cerebelo_circuito")}
+DEFAULT_LEVELS = (10, 50, 200, 500)
+DEFAULT_INTERACTIONS = 5          # Interações por sessão
+DEFAULT_THINK_S = 1.0             # Pausa média entre interações (exponencial)
+DEFAULT_RAMP_S = 5.0              # Intervalo em que as sessões se conectam
+DEFAULT_SLIDER_POSITIONS = 11     # Posições distintas por slider (0, 1, ..., 10)
+DEFAULT_TIMEOUT_S = 120.0
+SESSIONS_PER_CLIENT_PROCESS = 250
+SERVER_START_TIMEOUT_S = 60.0
+RSS_SAMPLE_INTERVAL_S = 0.25
+DEFAULT_OUTPUT = Path(".cache") / "carga" / "resultado.json"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(script, port):
+    """Sobe `streamlit run` headless e espera o health check responder."""
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", str(APP_DIR / script),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+        cwd=APP_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_S
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"O servidor de {script} terminou ao iniciar (código {server.returncode}).")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"O servidor de {script} não respondeu em {SERVER_START_TIMEOUT_S:.0f} s.")
+
+
+class ServerMonitor:
+    """Amostra RSS e CPU do servidor e dos seus filhos numa thread (requer psutil).
+
+    O RSS de pico é o da soma dos processos em cada amostra; o CPU soma, por
+    processo, o consumido desde o início (ou desde que o processo apareceu).
+    """
+
+    def __init__(self, pid):
+        try:
+            import psutil
+        except ImportError:
+            self._process = None
+        else:
+            self._process = psutil.Process(pid)
+        self.peak_rss_mb = None
+        self.cpu_s = None
+        self._cpu_start = {}      # pid -> CPU na primeira amostra (0 para filhos novos)
+        self._cpu_last = {}       # pid -> CPU na última amostra
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self, first=False):
+        import psutil
+
+        rss = 0
+        for process in [self._process, *self._process.children(recursive=True)]:
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+            except psutil.Error:
+                continue          # Processo terminou entre a listagem e a leitura
+            cpu = times.user + times.system
+            self._cpu_start.setdefault(process.pid, cpu if first else 0.0)
+            self._cpu_last[process.pid] = cpu
+        self.peak_rss_mb = max(self.peak_rss_mb or 0.0, rss / 2**20)
+
+    def _run(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL_S):
+            self._sample()
+
+    def __enter__(self):
+        if self._process is not None:
+            self._sample(first=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._process is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+            self.cpu_s = sum(self._cpu_last[pid] - self._cpu_start[pid] for pid in self._cpu_last)
+
+
+# --- Protocolo do navegador (protobuf sobre websocket) ---
+
+def _widget_choices(element, kind, slider_positions):
+    """Valores possíveis de um widget, já no formato do WidgetState."""
+    if kind == "slider" and element.type == element.SELECT_SLIDER:
+        return "string_array_value", [[option] for option in element.options]
+    if kind == "slider":
+        values = np.linspace(element.min, element.max, slider_positions)
+        values = np.round(values / element.step) * element.step
+        return "double_array_value", [[float(v)] for v in values]
+    return "string_value", list(element.options)
+
+
+def _fill_state(widget, field, value):
+    if field == "string_value":
+        widget.string_value = value
+    else:
+        getattr(widget, field).data[:] = value
+
+
+async def _rerun(ws, states, fragment_id, timeout_s, page_name=""):
+    """Envia um rerun e espera o `script_finished`; devolve (widgets vistos, bytes)."""
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+    message = BackMsg()
+    message.rerun_script.query_string = ""
+    message.rerun_script.page_script_hash = ""
+    message.rerun_script.page_name = page_name
+    if fragment_id:
+        message.rerun_script.fragment_id = fragment_id
+    for widget_id, (field, value) in states.items():
+        widget = message.rerun_script.widget_states.widgets.add()
+        widget.id = widget_id
+        _fill_state(widget, field, value)
+    await ws.send(message.SerializeToString())
+
+    async def collect():
+        widgets, nbytes = {}, 0
+        while True:
+            raw = await ws.recv()
+            nbytes += len(raw)
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                element = forward.delta.new_element
+                element_kind = element.WhichOneof("type")
+                if element_kind in ("slider", "selectbox"):
+                    widgets[getattr(element, element_kind).id] = (
+                        element_kind, getattr(element, element_kind), forward.delta.fragment_id)
+            elif kind == "script_finished":
+                return widgets, nbytes
+
+    return await asyncio.wait_for(collect(), timeout_s)
+
+
+async def _session(url, labels, pages, session_id, start_delay_s, args, samples):
+    import websockets
+
+    rng = np.random.default_rng([args.seed, session_id])
+    page_name = pages[session_id % len(pages)]
+    await asyncio.sleep(start_delay_s)
+    try:
+        async with websockets.connect(url, subprotocols=["streamlit"], max_size=None) as ws:
+            widgets, _ = await _rerun(ws, {}, "", args.timeout, page_name)
+            targets = []
+            for widget_id, (kind, element, fragment_id) in widgets.items():
+                if element.label in labels:
+                    field, choices = _widget_choices(element, kind, args.slider_positions)
+                    targets.append((widget_id, field, choices, fragment_id))
+            if not targets:
+                raise RuntimeError("nenhum dos controles de interesse foi encontrado")
+            states = {}
+            for _ in range(args.interactions):
+                await asyncio.sleep(rng.exponential(args.think))
+                widget_id, field, choices, fragment_id = targets[rng.integers(len(targets))]
+                states[widget_id] = (field, choices[rng.integers(len(choices))])
+                start = time.perf_counter()
+                _, nbytes = await _rerun(ws, states, fragment_id, args.timeout, page_name)
+                samples.append((time.perf_counter() - start, nbytes, time.time()))
+    except Exception as exc:  # noqa: BLE001 - erros entram no relatório, não derrubam o nível
+        samples.append((None, 0, f"{type(exc).__name__}: {exc}"))
+
+
+def _client_process(port, script, session_ids, n_sessions, args):
+    """Roda um lote de sessões num loop asyncio; devolve as amostras brutas."""
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    labels = set(INTERACTIONS[script])
+    pages = PAGES.get(script, ("",))
+    samples = []
+
+    async def run_all():
+        await asyncio.gather(*(
+            _session(url, labels, pages, i, args.ramp * i / n_sessions, args, samples) for i in session_ids
+        ))
+
+    asyncio.run(run_all())
+    return samples
+
+
+def run_level(script, n_sessions, args):
+    port = _free_port()
+    server = start_server(script, port)
+    n_processes = min(os.cpu_count() or 1, math.ceil(n_sessions / SESSIONS_PER_CLIENT_PROCESS))
+    try:
+        with ServerMonitor(server.pid) as monitor:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=n_processes, mp_context=get_context("spawn")) as pool:
+                batches = [pool.submit(_client_process, port, script, list(range(k, n_sessions, n_processes)),
+                                       n_sessions, args) for k in range(n_processes)]
+                samples = [sample for batch in batches for sample in batch.result()]
+            wall_s = time.perf_counter() - start
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = np.array([s[0] for s in samples if s[0] is not None])
+    errors = [s[2] for s in samples if s[0] is None]
+    finished = [s[2] for s in samples if s[0] is not None]
+    # Vazão medida entre o primeiro e o último rerun concluído (sem rampa e sem saída)
+    busy_s = max(finished) - min(finished) if len(finished) > 1 else wall_s
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (np.nan,) * 3
+    return {
+        "sessions": n_sessions,
+        "reruns": int(len(latencies)),
+        "errors": len(errors),
+        "error_examples": sorted(set(errors))[:5],
+        "p50_ms": float(p50 * 1000),
+        "p95_ms": float(p95 * 1000),
+        "p99_ms": float(p99 * 1000),
+        "throughput_rps": len(latencies) / busy_s if busy_s > 0 else float("nan"),
+        "mean_payload_kb": float(np.mean([s[1] for s in samples if s[0] is not None]) / 1024) if len(latencies) else 0.0,
+        "server_peak_rss_mb": monitor.peak_rss_mb,
+        "server_cpu_s": monitor.cpu_s,
+        "wall_s": wall_s,
+        "client_processes": n_processes,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões Streamlit simultâneas.")
+    parser.add_argument("--app", nargs="+", choices=sorted(INTERACTIONS), default=list(INTERACTIONS),
+                        help="Apps a testar (padrão: todos).")
+    parser.add_argument("--levels", nargs="+", type=int, default=list(DEFAULT_LEVELS),
+                        help="Números de sessões simultâneas.")
+    parser.add_argument("--interactions", type=int, default=DEFAULT_INTERACTIONS, help="Interações por sessão.")
+    parser.add_argument("--think", type=float, default=DEFAULT_THINK_S, help="Pausa média entre interações (s).")
+    parser.add_argument("--ramp", type=float, default=DEFAULT_RAMP_S, help="Tempo para conectar todas as sessões (s).")
+    parser.add_argument("--slider-positions", type=int, default=DEFAULT_SLIDER_POSITIONS,
+                        help="Posições distintas sorteadas em cada slider.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Timeout por rerun (s).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Arquivo JSON de saída.")
+    args = parser.parse_args(argv)
+
+    report = {"meta": {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "cpus": os.cpu_count(),
+                       **{k: v for k, v in vars(args).items() if k != "output"}},
+              "apps": {}}
+    print(f"{'app':<34} {'sessões':>7} {'reruns':>6} {'erros':>5} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'rerun/s':>8} {'RSS MB':>7} {'CPU s':>6}")
+    for script in args.app:
+        report["apps"][script] = results = []
+        for n_sessions in args.levels:
+            r = run_level(script, n_sessions, args)
+            results.append(r)
+            rss = "n/d" if r["server_peak_rss_mb"] is None else f"{r['server_peak_rss_mb']:.0f}"
+            cpu = "n/d" if r["server_cpu_s"] is None else f"{r['server_cpu_s']:.1f}"
+            print(f"{script:<34} {n_sessions:>7} {r['reruns']:>6} {r['errors']:>5} {r['p50_ms']:>8.0f} "
+                  f"{r['p95_ms']:>8.0f} {r['p99_ms']:>8.0f} {r['throughput_rps']:>8.1f} {rss:>7} {cpu:>6}")
+            for example in r["error_examples"]:
+                print(f"    erro: {example}", file=sys.stderr)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"Resultado salvo em {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""Conteúdo didático (divisões, fases do movimento e lesões) carregado de arquivo versionado.
+
+O arquivo `dados/conteudo_cerebelo.json` é lido e validado uma única vez por
+processo e vira um `ConteudoCerebelo` imutável. As tabelas "tidy" usadas
+pelos gráficos (fase × divisão) já ficam prontas no carregamento: cada rerun
+apenas indexa a linha do estado selecionado, então o custo não cresce com a
+quantidade de fases cadastradas. O impacto das lesões fica em `impacto_lesoes`.
+"""
+import json
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
+
+CONTEUDO_PATH = Path(__file__).resolve().parent / "dados" / "conteudo_cerebelo.json"
+VERSOES_SUPORTADAS = (1,)
+CONTRIB_MAXIMA = 5
+
+COLUNAS_GRAFICO_FASE = ("Divisão", "Contribuição", "cor")
+
+_COR_HEX = re.compile(r"^#[0-9A-Fa-f]{6}$")
+
+
+@dataclass(frozen=True)
+class Fase:
+    nome: str
+    desc_geral: str
+    contrib: Mapping[str, float]
+    detalhes: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Lesao:
+    nome: str
+    sintomas: Tuple[str, ...]
+    impacto_fases: str
+    contrib_modificada: Optional[Mapping[str, float]]
+
+
+@dataclass(frozen=True)
+class ConteudoCerebelo:
+    versao: int
+    divisoes: Tuple[str, ...]
+    cores: Mapping[str, str]
+    cor_lesionada: str
+    fase_exemplo_lesao: str
+    fases: Mapping[str, Fase]
+    lesoes: Mapping[str, Lesao]
+    # Tabelas pré-calculadas: estado -> tupla de linhas (na ordem das colunas acima)
+    tabela_fases: Mapping[str, Tuple[tuple, ...]]
+
+    def valores_grafico_fase(self, fase):
+        return [dict(zip(COLUNAS_GRAFICO_FASE, linha)) for linha in self.tabela_fases[fase]]
+
+
+def _exigir(condicao, mensagem):
+    if not condicao:
+        raise ValueError(f"Conteúdo inválido: {mensagem}")
+
+
+def _validar_contrib(contrib, divisoes, contexto, completa):
+    _exigir(isinstance(contrib, dict), f"{contexto}: contribuições devem ser um objeto.")
+    desconhecidas = set(contrib) - set(divisoes)
+    _exigir(not desconhecidas, f"{contexto}: divisões desconhecidas {sorted(desconhecidas)}.")
+    if completa:
+        faltando = set(divisoes) - set(contrib)
+        _exigir(not faltando, f"{contexto}: faltam contribuições para {sorted(faltando)}.")
+    for divisao, valor in contrib.items():
+        _exigir(isinstance(valor, (int, float)) and 0 <= valor <= CONTRIB_MAXIMA,
+                f"{contexto}: contribuição de '{divisao}' deve estar entre 0 e {CONTRIB_MAXIMA}.")
+
+
+def construir_conteudo(bruto):
+    """Valida o documento JSON já decodificado e monta o conteúdo imutável."""
+    _exigir(bruto.get("versao") in VERSOES_SUPORTADAS,
+            f"versão {bruto.get('versao')!r} não suportada (suportadas: {VERSOES_SUPORTADAS}).")
+
+    divisoes = tuple(d["nome"] for d in bruto["divisoes"])
+    _exigir(len(set(divisoes)) == len(divisoes), "nomes de divisões repetidos.")
+    cores = {d["nome"]: d["cor"] for d in bruto["divisoes"]}
+    for nome, cor in list(cores.items()) + [("cor_lesionada", bruto["cor_lesionada"])]:
+        _exigir(bool(_COR_HEX.match(cor)), f"cor inválida para '{nome}': {cor!r}.")
+
+    fases = {}
+    for item in bruto["fases"]:
+        _exigir(item["nome"] not in fases, f"fase repetida: {item['nome']!r}.")
+        _validar_contrib(item["contrib"], divisoes, f"fase '{item['nome']}'", completa=True)
+        fases[item["nome"]] = Fase(item["nome"], item["desc_geral"],
+                                   MappingProxyType(dict(item["contrib"])), tuple(item["detalhes"]))
+    _exigir(bool(fases), "nenhuma fase cadastrada.")
+    _exigir(bruto["fase_exemplo_lesao"] in fases,
+            f"fase_exemplo_lesao {bruto['fase_exemplo_lesao']!r} não existe.")
+
+    lesoes = {}
+    for item in bruto["lesoes"]:
+        _exigir(item["nome"] not in lesoes, f"lesão repetida: {item['nome']!r}.")
+        modificada = item.get("contrib_modificada")
+        if modificada is not None:
+            _validar_contrib(modificada, divisoes, f"lesão '{item['nome']}'", completa=False)
+            modificada = MappingProxyType(dict(modificada))
+        _exigir(len(item["sintomas"]) > 0, f"lesão '{item['nome']}' sem sintomas.")
+        lesoes[item["nome"]] = Lesao(item["nome"], tuple(item["sintomas"]), item["impacto_fases"], modificada)
+    _exigir(bool(lesoes), "nenhuma lesão cadastrada.")
+
+    tabela_fases = {
+        fase.nome: tuple((d, fase.contrib[d], cores[d]) for d in divisoes)
+        for fase in fases.values()
+    }
+
+    return ConteudoCerebelo(
+        versao=bruto["versao"],
+        divisoes=divisoes,
+        cores=MappingProxyType(cores),
+        cor_lesionada=bruto["cor_lesionada"],
+        fase_exemplo_lesao=bruto["fase_exemplo_lesao"],
+        fases=MappingProxyType(fases),
+        lesoes=MappingProxyType(lesoes),
+        tabela_fases=MappingProxyType(tabela_fases),
+    )
+
+
+@lru_cache(maxsize=None)
+def carregar_conteudo(caminho=CONTEUDO_PATH):
+    """Lê, valida e devolve o conteúdo; executado uma vez por processo e caminho."""
+    with open(caminho, encoding="utf-8") as arquivo:
+        bruto = json.load(arquivo)
+    try:
+        return construir_conteudo(bruto)
+    except KeyError as exc:
+        raise ValueError(f"Conteúdo inválido em {caminho}: campo obrigatório ausente {exc}.") from exc
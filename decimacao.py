@@ -0,0 +1,103 @@
+"""Decimação dos traços antes de enviá-los ao navegador.
+
+O gráfico nunca recebe mais que `max_points` pontos: cada balde de tempo
+("pixel") é representado pelo seu mínimo e máximo, o que mantém os picos
+visíveis mesmo em simulações de vários segundos. O raster da população LIF
+também é limitado: mostra só os primeiros neurônios cujos picos cabem em
+`max_points`, com as linhas inteiras. Gráficos de várias séries no mesmo eixo
+(`decimate_columns`) mantêm o mínimo e o máximo de cada série por balde. Os
+arrays vão para os specs de `graficos_circuito`, sem passar por um DataFrame.
+"""
+import numpy as np
+
+DEFAULT_MAX_POINTS = 2000
+
+
+def _extrema_indices(y, edges):
+    """Posições do mínimo e do máximo de `y` em cada balde [edges[i], edges[i+1])."""
+    n_buckets = len(edges) - 1
+    y = np.asarray(y, dtype=float)
+    # NaN (p.ex. janela sem ensaios de um movimento) nunca vence; balde só de NaN usa o primeiro
+    y_lo = np.where(np.isnan(y), np.inf, y)
+    y_hi = np.where(np.isnan(y), -np.inf, y)
+    lo = np.minimum.reduceat(y_lo, edges[:-1])
+    hi = np.maximum.reduceat(y_hi, edges[:-1])
+    # Primeira ocorrência do mínimo/máximo de cada balde (a atribuição em ordem
+    # reversa faz a primeira ocorrência prevalecer)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    is_lo = y_lo == lo[bucket]
+    is_hi = y_hi == hi[bucket]
+    idx_lo = np.full(n_buckets, -1)
+    idx_hi = np.full(n_buckets, -1)
+    pos = np.arange(len(y))
+    idx_lo[bucket[is_lo][::-1]] = pos[is_lo][::-1]
+    idx_hi[bucket[is_hi][::-1]] = pos[is_hi][::-1]
+    return idx_lo, idx_hi
+
+
+def minmax_decimate(t, y, max_points=DEFAULT_MAX_POINTS):
+    """Reduz (t, y) a no máximo `max_points` pontos preservando mínimo e máximo por balde."""
+    t, y = np.asarray(t), np.asarray(y)
+    n = len(y)
+    if n <= max_points:
+        return t, y
+    n_buckets = max(1, max_points // 2)
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    idx = np.sort(np.concatenate(_extrema_indices(y, edges)))   # Na ordem temporal
+    return t[idx], y[idx]
+
+
+def decimate_columns(data, x, max_points=DEFAULT_MAX_POINTS):
+    """Colunas de um gráfico de várias séries (`{campo: array}`) com no máximo `max_points` linhas.
+
+    Cada balde guarda, uma vez só, as linhas do mínimo e do máximo de cada
+    série, de modo que nenhum pico de nenhuma série some.
+    """
+    data = {field: np.asarray(values) for field, values in data.items()}
+    n = len(data[x])
+    series = [field for field in data if field != x]
+    if n <= max_points or not series:
+        return data
+    n_buckets = max(1, max_points // (2 * len(series)))
+    edges = np.linspace(0, n, n_buckets + 1).astype(np.int64)
+    idx = np.unique(np.concatenate([np.concatenate(_extrema_indices(data[field], edges)) for field in series]))
+    return {field: values[idx] for field, values in data.items()}
+
+
+def spike_trace_envelope(spike_times_ms, window_start_ms, window_end_ms, max_points=DEFAULT_MAX_POINTS,
+                         resting_mv=-70.0, peak_mv=30.0):
+    """Envelope mínimo/máximo do traço esquemático calculado direto dos tempos de pico.
+
+    Custa O(picos + max_points), sem materializar o traço na resolução original.
+    """
+    n_buckets = max(1, max_points // 2)
+    edges = np.linspace(window_start_ms, window_end_ms, n_buckets + 1)
+    lo, hi = np.searchsorted(spike_times_ms, [window_start_ms, window_end_ms])
+    spikes = spike_times_ms[lo:hi]
+    bucket = np.minimum(np.searchsorted(edges, spikes, side="right") - 1, n_buckets - 1)
+
+    # Por balde: um ponto de repouso no início e um segundo ponto que é o primeiro pico
+    # do balde (se houver) ou o repouso no meio do balde
+    t = np.empty(2 * n_buckets)
+    v = np.full(2 * n_buckets, resting_mv, dtype=float)
+    t[0::2] = edges[:-1]
+    t[1::2] = 0.5 * (edges[:-1] + edges[1:])
+    has_spike, first = np.unique(bucket, return_index=True)
+    t[2 * has_spike + 1] = np.maximum(spikes[first], edges[has_spike] + 1e-9)
+    v[2 * has_spike + 1] = peak_mv
+    return t, v
+
+
+def raster_limit(times_ms, neurons, n_neurons, max_points=DEFAULT_MAX_POINTS):
+    """Pontos do raster dos primeiros neurônios (de `n_neurons`) cujos picos, somados, cabem em `max_points`.
+
+    Devolve (tempos, neurônios, número de neurônios mostrados); pelo menos um
+    neurônio aparece, mesmo que sozinho passe do limite (truncado).
+    """
+    times_ms, neurons = np.asarray(times_ms), np.asarray(neurons)
+    if len(neurons) <= max_points:
+        return times_ms, neurons, n_neurons
+    per_neuron = np.cumsum(np.bincount(neurons, minlength=n_neurons))
+    n_shown = max(1, int(np.searchsorted(per_neuron, max_points, side="right")))
+    keep = np.flatnonzero(neurons < n_shown)[:max_points]
+    return times_ms[keep], neurons[keep], n_shown
@@ -0,0 +1,304 @@
+"""Benchmark headless dos apps Streamlit com o harness `AppTest`.
+
+Para cada script mede, num processo novo (início a frio de verdade):
+
+- tempo do primeiro run (imports, construção de caches e renderização; no
+  ponto de entrada único `app_cerebelo.py`, o da página padrão);
+- tempo de cada interação: todo slider, select_slider, selectbox e radio é
+  movido para a opção vizinha, e todo multiselect ganha (ou, cheio, perde)
+  uma opção, `repeats` vezes (mediana), inclusive os que
+  só aparecem depois de outra escolha (p.ex. num modo não padrão do radio
+  de visualização): depois de medido, cada radio e selectbox passa por
+  todas as opções, e os widgets novos são medidos em seguida, alcançados
+  repetindo a escolha que os revelou;
+- pico de memória residente (RSS máximo) do processo somado ao do maior
+  worker do pool de simulação, onde rodam as simulações pesadas (com um
+  único worker, o padrão em máquinas de um núcleo, é o total; com vários, uma
+  cota inferior);
+- tamanho do payload de elementos (soma dos protobufs) por rerun.
+
+O resultado vai para um JSON; com `--baseline`, qualquer métrica que piore
+mais que `--threshold` (fração) em relação à linha de base faz o comando
+terminar com código 1. Uso:
+
+    python desempenho_apps.py --output .cache/desempenho/atual.json \
+        --baseline .cache/desempenho/base.json --threshold 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent
+APPS = ("streamlit_cerebelo_circuito.py", "divisoes_funcionais_cerebelo.py", "app_cerebelo.py")
+WIDGET_TYPES = ("slider", "select_slider", "selectbox", "radio", "multiselect")
+SELECTOR_TYPES = ("selectbox", "radio")       # Podem revelar outros widgets a cada opção
+DEFAULT_OUTPUT = Path(".cache") / "desempenho" / "resultado.json"
+DEFAULT_THRESHOLD = float(os.environ.get("CEREBELO_BENCH_THRESHOLD", "0.25"))
+DEFAULT_REPEATS = 3
+DEFAULT_TIMEOUT_S = 120
+# Diferenças de tempo abaixo disto são ruído de medição, não regressão
+MIN_TIME_DELTA_S = 0.005
+
+
+class _OpcaoFormatada(str):
+    """Opção de select_slider já formatada; passa intacta por qualquer `format_func`.
+
+    O AppTest só expõe as opções formatadas e serializa o valor com o
+    `format_func` do widget, então não há como recuperar o valor original.
+    """
+
+    def __format__(self, spec):
+        return str(self)
+
+
+def payload_bytes(node):
+    """Soma do tamanho serializado dos protobufs da árvore de elementos."""
+    proto = getattr(node, "proto", None)
+    total = proto.ByteSize() if hasattr(proto, "ByteSize") else 0
+    for child in getattr(node, "children", {}).values():
+        total += payload_bytes(child)
+    return total
+
+
+def peak_rss_mb():
+    """RSS máximo do processo atual mais o do maior filho já encerrado, em MB.
+
+    `RUSAGE_CHILDREN` só conta filhos que terminaram: os pools devem ser
+    encerrados antes. None onde `resource` não existe (p.ex. Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux informa kB; macOS, bytes
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def _widgets(at):
+    """Widgets medidos, identificados por (tipo, rótulo, ocorrência)."""
+    found = []
+    for kind in WIDGET_TYPES:
+        seen = {}
+        for widget in getattr(at, kind):
+            n = seen[widget.label] = seen.get(widget.label, -1) + 1
+            found.append((kind, widget.label, n))
+    return found
+
+
+def _find(at, kind, label, n):
+    matches = [w for w in getattr(at, kind) if w.label == label]
+    return matches[n] if n < len(matches) else None
+
+
+def _neighbour_value(widget, kind):
+    """Valor adjacente ao atual (um passo do slider, a próxima opção ou uma opção a mais/menos)."""
+    if kind == "multiselect":
+        selected = list(widget.values)
+        missing = [o for o in widget.options if o not in selected]
+        if missing:
+            selected.append(missing[0])
+        elif selected:
+            selected.pop()
+        else:
+            return None
+        return [_OpcaoFormatada(o) for o in selected]
+    if kind == "slider":
+        value = widget.value
+        if isinstance(value, (tuple, list)):
+            return None
+        step = widget.step or 1
+        return value + step if value + step <= widget.max else value - step
+    options = list(widget.options)
+    if len(options) < 2:
+        return None
+    if kind in ("selectbox", "radio"):
+        current = options.index(widget.format_func(widget.value)) if widget.value is not None else 0
+        return options[(current + 1) % len(options)]
+    current = options.index(widget.format_func(widget.value))
+    return _OpcaoFormatada(options[(current + 1) % len(options)])
+
+
+def _set(widget, kind, value):
+    if kind == "selectbox":
+        return widget.select(value)
+    return widget.set_value(value)
+
+
+def _collect(at, path, seen, pending):
+    """Enfileira os widgets ainda não vistos, com as escolhas que levam até eles."""
+    for key in _widgets(at):
+        if key not in seen:
+            seen.add(key)
+            pending.append((key, path))
+
+
+def _move(at, script, kind, label, n, value):
+    at = _set(_find(at, kind, label, n), kind, value).run()
+    if at.exception:
+        raise RuntimeError(f"{script}: exceção ao mover '{label}': {at.exception[0].value}")
+    return at
+
+
+def _reach(at, script, widget_key, path):
+    """Reaplica as escolhas de `path` até o widget existir no app."""
+    for kind, label, n, value in path:
+        if _find(at, *widget_key) is not None:
+            break
+        if _find(at, kind, label, n) is not None:
+            at = _move(at, script, kind, label, n, value)
+    return at
+
+
+def benchmark_app(script, repeats=DEFAULT_REPEATS, timeout_s=DEFAULT_TIMEOUT_S):
+    """Mede um script; deve rodar num processo novo para que o início seja a frio."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(APP_DIR)
+    start = time.perf_counter()
+    at = AppTest.from_file(str(APP_DIR / script), default_timeout=timeout_s).run()
+    cold_start_s = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{script}: exceção no primeiro run: {at.exception[0].value}")
+    result = {
+        "cold_start_s": cold_start_s,
+        "payload_bytes": payload_bytes(at._tree),
+        "interactions": {},
+    }
+
+    # Fila de (widget, escolhas que o revelam); cada run pode revelar widgets novos
+    pending = [(key, ()) for key in _widgets(at)]
+    seen = {key for key, _ in pending}
+    while pending:
+        (kind, label, n), path = pending.pop(0)
+        at = _reach(at, script, (kind, label, n), path)
+        times, sizes = [], []
+        for _ in range(repeats):
+            widget = _find(at, kind, label, n)
+            value = None if widget is None else _neighbour_value(widget, kind)
+            if value is None:
+                break
+            start = time.perf_counter()
+            at = _move(at, script, kind, label, n, value)
+            times.append(time.perf_counter() - start)
+            sizes.append(payload_bytes(at._tree))
+            _collect(at, path + ((kind, label, n, value),), seen, pending)
+        if times and kind in SELECTOR_TYPES:
+            # Opções não visitadas pelas repetições (sem medir tempo), só para achar widgets
+            for option in list(_find(at, kind, label, n).options):
+                if _find(at, kind, label, n) is None:
+                    break
+                at = _move(at, script, kind, label, n, option)
+                _collect(at, path + ((kind, label, n, option),), seen, pending)
+        if times:
+            name = f"{kind}:{label}" + (f"#{n}" if n else "")
+            result["interactions"][name] = {
+                "median_s": statistics.median(times),
+                "max_s": max(times),
+                "payload_bytes": max(sizes),
+            }
+
+    # Os pools do app (guardados em `st.cache_resource`) travariam a saída deste
+    # processo; encerrados antes da leitura, os workers entram em `RUSAGE_CHILDREN`
+    from servico_simulacao import shutdown_all
+    shutdown_all()
+    result["peak_memory_mb"] = peak_rss_mb()
+    return result
+
+
+def run_suite(apps=APPS, repeats=DEFAULT_REPEATS, timeout_s=DEFAULT_TIMEOUT_S):
+    import streamlit
+
+    results = {}
+    for script in apps:
+        # Um interpretador novo por app: imports e caches não vazam entre medições
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[script] = pool.submit(benchmark_app, script, repeats, timeout_s).result()
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "platform": platform.platform(),
+            "repeats": repeats,
+        },
+        "apps": results,
+    }
+
+
+def _metrics(app_result):
+    """Achata o resultado de um app em {nome: (valor, é_tempo)}."""
+    flat = {
+        "cold_start_s": (app_result["cold_start_s"], True),
+        "payload_bytes": (app_result["payload_bytes"], False),
+    }
+    if app_result["peak_memory_mb"] is not None:
+        flat["peak_memory_mb"] = (app_result["peak_memory_mb"], False)
+    for name, interaction in app_result["interactions"].items():
+        flat[f"{name} median_s"] = (interaction["median_s"], True)
+        flat[f"{name} payload_bytes"] = (interaction["payload_bytes"], False)
+    return flat
+
+
+def find_regressions(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Lista (app, métrica, base, atual) das métricas que pioraram além do limite."""
+    regressions = []
+    for script, base_result in baseline["apps"].items():
+        if script not in current["apps"]:
+            continue
+        now = _metrics(current["apps"][script])
+        for name, (base_value, is_time) in _metrics(base_result).items():
+            if name not in now:
+                continue
+            value = now[name][0]
+            if is_time and value - base_value < MIN_TIME_DELTA_S:
+                continue
+            if value > base_value * (1.0 + threshold):
+                regressions.append((script, name, base_value, value))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless dos apps Streamlit.")
+    parser.add_argument("apps", nargs="*", default=list(APPS), help="Scripts a medir (padrão: todos).")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Arquivo JSON de saída.")
+    parser.add_argument("--baseline", type=Path, help="JSON de uma execução anterior para comparação.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Piora relativa tolerada antes de falhar (0.25 = 25%%).")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Repetições por interação.")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Timeout de cada run (s).")
+    args = parser.parse_args(argv)
+
+    report = run_suite(tuple(args.apps), args.repeats, args.timeout)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    for script, result in report["apps"].items():
+        memory = result["peak_memory_mb"]
+        print(f"{script}: início {result['cold_start_s']:.2f} s, "
+              f"pico {'n/d' if memory is None else f'{memory:.0f} MB'}, "
+              f"payload {result['payload_bytes'] / 1024:.1f} kB")
+        for name, interaction in result["interactions"].items():
+            print(f"  {name}: {interaction['median_s'] * 1000:.0f} ms, "
+                  f"{interaction['payload_bytes'] / 1024:.1f} kB")
+    print(f"Resultado salvo em {args.output}")
+
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = find_regressions(report, baseline, args.threshold)
+    for script, name, base_value, value in regressions:
+        print(f"REGRESSÃO {script} · {name}: {base_value:.4g} → {value:.4g}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""Fluxogramas Graphviz dos apps e cache de SVG pré-renderizado.
+
+Cada fonte DOT é renderizada para SVG uma única vez, com o arquivo salvo em
+disco sob o hash SHA-256 da própria fonte; editar um diagrama invalida apenas
+ele. Uso como etapa de build (pré-renderiza tudo e remove SVGs órfãos):
+
+    python diagramas.py --prune
+
+Sem o executável `dot` do Graphviz, os apps voltam a `st.graphviz_chart`,
+que faz o layout no navegador.
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import subprocess
+import threading
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("CEREBELO_DIAGRAM_CACHE", Path(__file__).resolve().parent / ".cache" / "diagramas"))
+
+# --- Fontes DOT ---
+FLUXOGRAMA_VESTIBULAR = """
+digraph G_Vestibular {
+    rankdir=TB;
+    node [shape=box, style="rounded,filled", fontname="Helvetica"];
+
+    subgraph cluster_afferents {
+        label = "Aferências Principais";
+        fillcolor = "lightblue"; style="filled";
+        A1 [label="Núcleos Vestibulares\n(Info: Posição/Movimento da Cabeça)"];
+        A2 [label="Vias Visuais e Somatosensoriais\n(Contexto para equilíbrio)"];
+    }
+
+    subgraph cluster_nuclei {
+        label = "Núcleos Cerebelares e Associados";
+        fillcolor = "lightpink"; style="filled";
+        NC [label="Núcleo Fastigial (parte medial)\nNúcleos Vestibulares (direto)"];
+    }
+
+    subgraph cluster_efferents {
+        label = "Eferências (Tratos Motores)";
+        fillcolor = "lightgreen"; style="filled";
+        E1 [label="Tratos Vestibulospinais\n(Medial e Lateral)"];
+        E2 [label="Conexões com Núcleos Oculomotores\n(via Fascículo Longitudinal Medial)"];
+    }
+
+    subgraph cluster_muscles {
+        label = "Musculatura Controlada";
+        fillcolor = "lightyellow"; style="filled";
+        M1 [label="Músculos Axiais e Proximais Extensores\n(Postura, Equilíbrio)"];
+        M2 [label="Músculos Extrínsecos do Olho\n(Estabilização do olhar - RVO)"];
+    }
+
+    A1 -> NC;
+    A2 -> NC [style=dashed, label="modula"];
+    NC -> E1;
+    NC -> E2;
+    E1 -> M1 [label="influencia"];
+    E2 -> M2 [label="controla"];
+}
+"""
+
+FLUXOGRAMA_ESPINAL = """
+digraph G_Espinal {
+    rankdir=TB;
+    node [shape=box, style="rounded,filled", fontname="Helvetica"];
+
+    subgraph cluster_afferents_spinal {
+        label = "Aferências Principais";
+        fillcolor = "lightblue"; style="filled";
+        AS1 [label="Medula Espinal\n(Tratos Espinocerebelares: propriocepção, tato)"];
+        AS2 [label="Córtex Motor e Pré-Motor\n(Cópia dos comandos - via núcleos pontinos, oliva)"];
+        AS3 [label="Núcleos do Tronco Encefálico"];
+    }
+
+    subgraph cluster_nuclei_spinal {
+        label = "Núcleos Cerebelares Envolvidos";
+        fillcolor = "lightpink"; style="filled";
+        NCS_Verme [label="Núcleo Fastigial\n(Verme)"];
+        NCS_Paraverme [label="Núcleos Interpostos\n(Globoso e Emboliforme)\n(Zonas Paravermais)"];
+    }
+
+    subgraph cluster_efferents_spinal {
+        label = "Eferências (Tratos Motores)";
+        fillcolor = "lightgreen"; style="filled";
+        ES_Verme [label="Sistemas Motores Medial Descendentes\n(ex: Tratos Vestibulospinais, Reticulospinais)"];
+        ES_Paraverme [label="Sistemas Motores Lateral Descendentes\n(ex: Trato Rubrospinal, Trato Corticospinal Lateral)"];
+    }
+
+    subgraph cluster_muscles_spinal {
+        label = "Musculatura Controlada";
+        fillcolor = "lightyellow"; style="filled";
+        MS_Verme [label="Músculos Axiais e Proximais\n(Postura e locomoção)"];
+        MS_Paraverme [label="Músculos Distais dos Membros\n(Coordenação e correção de movimentos)"];
+    }
+
+    AS1 -> NCS_Verme; AS1 -> NCS_Paraverme;
+    AS2 -> NCS_Verme; AS2 -> NCS_Paraverme;
+    AS3 -> NCS_Verme; AS3 -> NCS_Paraverme;
+
+    NCS_Verme -> ES_Verme;
+    NCS_Paraverme -> ES_Paraverme;
+
+    ES_Verme -> MS_Verme [label="influencia"];
+    ES_Paraverme -> MS_Paraverme [label="influencia"];
+}
+"""
+
+FLUXOGRAMA_CORTICAL = """
+digraph G_Cortical {
+    rankdir=TB;
+    node [shape=box, style="rounded,filled", fontname="Helvetica"];
+
+    subgraph cluster_afferents_cortical {
+        label = "Aferências Principais";
+        fillcolor = "lightblue"; style="filled";
+        AC1 [label="Córtex Cerebral (Áreas Motoras, Pré-Motoras, Associação)\n(Via Núcleos Pontinos - Trato Cortico-Ponto-Cerebelar)"];
+    }
+
+    subgraph cluster_nuclei_cortical {
+        label = "Núcleo Cerebelar Envolvido";
+        fillcolor = "lightpink"; style="filled";
+        NCC [label="Núcleo Denteado"];
+    }
+
+    subgraph cluster_efferents_cortical {
+        label = "Eferências (Influência sobre Tratos Motores)";
+        fillcolor = "lightgreen"; style="filled";
+        EC1 [label="Córtex Motor Primário e Pré-Motor\n(Via Núcleo Ventrolateral do Tálamo)"];
+    }
+
+    subgraph cluster_muscles_cortical {
+        label = "Musculatura Controlada (Indiretamente)";
+        fillcolor = "lightyellow"; style="filled";
+        MC1 [label="Músculos Distais dos Membros\n(Movimentos habilidosos, precisos, sequenciais)"];
+        MC2 [label="Musculatura da Fala\n(Articulação precisa)"];
+    }
+
+    AC1 -> NCC;
+    NCC -> EC1 [label="projeta para"];
+    EC1 -> MC1 [label="controla via Trato Corticospinal"];
+    EC1 -> MC2 [label="controla via Trato Corticobulbar"];
+}
+"""
+
+CIRCUIT_DIAGRAM_DETAILED = """
+digraph CerebellarCircuitDetailed {
+    rankdir=LR;
+    node [shape=box, style="rounded,filled", fillcolor=lightgrey];
+
+    subgraph cluster_Cortex {
+        label = "Córtex Cerebelar";
+        style = "filled";
+        color = "lightyellow";
+        node [fillcolor=white];
+
+        GC [label="Células Granulares\n(Glutamato)"];
+        CP [label="CÉLULA DE PURKINJE\n(GABA)", fillcolor=lightpink, shape=ellipse, style="filled,bold"];
+        // Nota: Fibras Paralelas são os axônios das Células Granulares
+    }
+
+    FM [label="FIBRAS MUSGOSAS\n(Entrada Excitatória - Glutamato)", fillcolor=lightblue];
+    FT [label="FIBRAS TREPADEIRAS\n(Entrada Excitatória - Aspartato/Glutamato)", fillcolor=lightcyan];
+    NCP [label="NÚCLEOS CEREBELARES PROFUNDOS\n(Saída Excitatória - Glutamato)", fillcolor=lightgreen, shape=ellipse, style="filled,bold"];
+    Output [label="Saída para outras áreas\ndo SNC (ex: Tálamo, Tronco)", shape=cds, fillcolor=gold];
+
+    FM -> GC [label=" excita (+)"];
+    GC -> CP [label=" excita (+)\n(via Fibras Paralelas)"]; // Representa a ação das Fibras Paralelas
+
+    FT -> CP [label=" excita MUITO (+)\n(Picos Complexos)", color=purple, penwidth=2];
+
+    FM -> NCP [label=" excita (+)\n(colateral)"];
+    FT -> NCP [label=" excita (+)\n(colateral)", color=purple];
+
+    CP -> NCP [label=" INIBE (-)", color=red, fontcolor=red, penwidth=2, style=bold];
+    NCP -> Output [label=" modula"];
+
+    {rank=same; FM; FT;}
+    {rank=same; GC;}
+    {rank=same; CP;}
+    {rank=same; NCP;}
+    {rank=same; Output;}
+}
+"""
+
+
+DIAGRAMAS = {
+    "fluxograma_vestibular": FLUXOGRAMA_VESTIBULAR,
+    "fluxograma_espinal": FLUXOGRAMA_ESPINAL,
+    "fluxograma_cortical": FLUXOGRAMA_CORTICAL,
+    "circuit_diagram_detailed": CIRCUIT_DIAGRAM_DETAILED,
+}
+
+# --- Cache de SVG (memória do processo + disco) ---
+_svg_memory = {}
+_svg_lock = threading.Lock()
+
+
+def dot_hash(dot_source):
+    return hashlib.sha256(dot_source.encode("utf-8")).hexdigest()
+
+
+def svg_cache_path(dot_source, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"{dot_hash(dot_source)}.svg"
+
+
+def render_svg(dot_source):
+    """Executa o layout do Graphviz; devolve None se `dot` não estiver instalado."""
+    dot = shutil.which("dot")
+    if dot is None:
+        return None
+    result = subprocess.run([dot, "-Tsvg"], input=dot_source.encode("utf-8"),
+                            capture_output=True, check=True, timeout=60)
+    return result.stdout.decode("utf-8")
+
+
+def get_svg(dot_source, cache_dir=CACHE_DIR):
+    """SVG do diagrama, renderizado no máximo uma vez por conteúdo de fonte."""
+    key = dot_hash(dot_source)
+    svg = _svg_memory.get(key)
+    if svg is not None:
+        return svg
+    with _svg_lock:
+        if key in _svg_memory:
+            return _svg_memory[key]
+        path = Path(cache_dir) / f"{key}.svg"
+        if path.exists():
+            svg = path.read_text(encoding="utf-8")
+        else:
+            svg = render_svg(dot_source)
+            if svg is None:
+                return None
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(svg, encoding="utf-8")
+            os.replace(tmp, path)   # Escrita atômica: outros processos nunca leem SVG parcial
+        _svg_memory[key] = svg
+        return svg
+
+
+def exibir_diagrama(dot_source):
+    """Mostra o diagrama no app a partir do SVG em cache (ou via Graphviz no navegador)."""
+    import streamlit as st
+
+    svg = get_svg(dot_source)
+    if svg is None:
+        st.graphviz_chart(dot_source)
+    else:
+        st.image(svg, width="stretch")
+
+
+def build(cache_dir=CACHE_DIR, prune=False):
+    """Pré-renderiza todos os diagramas; opcionalmente remove SVGs sem fonte correspondente."""
+    if shutil.which("dot") is None:
+        raise SystemExit("Executável `dot` do Graphviz não encontrado no PATH.")
+    for name, source in DIAGRAMAS.items():
+        path = svg_cache_path(source, cache_dir)
+        status = "em cache" if path.exists() else "renderizado"
+        get_svg(source, cache_dir)
+        print(f"{name}: {status} -> {path}")
+    if prune:
+        valid = {svg_cache_path(source, cache_dir).name for source in DIAGRAMAS.values()}
+        for path in Path(cache_dir).glob("*.svg"):
+            if path.name not in valid:
+                path.unlink()
+                print(f"removido: {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-renderiza os fluxogramas Graphviz para SVG.")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, type=Path)
+    parser.add_argument("--prune", action="store_true", help="Remove SVGs de versões antigas dos diagramas.")
+    args = parser.parse_args()
+    build(args.cache_dir, args.prune)
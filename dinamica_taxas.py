@@ -0,0 +1,304 @@
+"""Modelo dinâmico de taxas (GC, CP, NCP) para entradas que variam no tempo.
+
+`modelo_ncp` dá só a taxa estacionária dos NCP; aqui cada população relaxa
+para o seu alvo com uma constante de tempo, o que mostra transientes como a
+pausa da CP depois de uma salva das FT desinibindo os NCP. Estado por cenário
+(taxas em Hz, tempo em ms):
+
+    τ_gc    dgc/dt    = [ganho_fm · FM]₊                                    − gc
+    τ_pausa dpausa/dt = FT                                                  − pausa
+    τ_cp    dcp/dt    = [basal + w_fp · gc + w_pc · FT − w_pausa · pausa]₊  − cp
+    τ_ncp   dncp/dt   = [basal + ganho FM/FT − inibição(escala CP) · cp / cp_ref]₊ − ncp
+
+O termo w_pc · FT é o pico complexo (excitação rápida da CP) e a variável
+lenta `pausa` a pausa que o segue. Com cp = `pc_reference_hz`, o ponto fixo
+dos NCP é exatamente `modelo_ncp.ncp_response`.
+
+FM e FT são formas de onda (`Waveform`: constante, degrau, pulso ou rampa) e
+um lote de S cenários é integrado de uma só vez, com o estado em arrays (4, S):
+`rk4` tem passo fixo (quinas sobre a grade dos passos são exatas, com o fim
+de cada passo avaliado pelo limite à esquerda); `rk23` (Bogacki-Shampine) ajusta um passo comum a todo
+o lote pelo erro máximo entre os cenários, sempre parando nas quinas das
+formas de onda, e interpola a saída (Hermite cúbico) na grade pedida.
+"""
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from modelo_ncp import DEFAULT_PARAMS, NCPParams
+from rede_cerebelar import MF_HZ_PER_UNIT
+
+WAVEFORM_KINDS = ("constante", "degrau", "pulso", "rampa")
+SOLVERS = ("rk4", "rk23")
+DEFAULT_DT_MS = 1.0              # Passo do rk4 (τ mínimo = 5 ms)
+RK4_CHUNK_STEPS = 100            # Passos do rk4 com entradas pré-calculadas de uma vez
+DEFAULT_OUTPUT_DT_MS = 1.0       # Grade da saída (os dois métodos)
+DEFAULT_RTOL = 1e-4
+DEFAULT_ATOL_HZ = 1e-3
+MAX_STEP_MS = 25.0               # Passo máximo do rk23
+DEFAULT_SWEEP_SCENARIOS = 1000   # Cenários da varredura mostrada no app
+
+
+@dataclass(frozen=True)
+class Waveform:
+    """Entrada no tempo: `baseline` até `start_ms`, depois `baseline + amplitude`.
+
+    "pulso" volta ao basal após `duration_ms`; em "rampa", `duration_ms` é o
+    tempo de subida.
+    """
+    kind: str = "constante"
+    baseline: float = 0.0
+    amplitude: float = 0.0
+    start_ms: float = 0.0
+    duration_ms: float = 0.0
+
+    def __post_init__(self):
+        if self.kind not in WAVEFORM_KINDS:
+            raise ValueError(f"Forma de onda desconhecida: {self.kind!r} (disponíveis: {WAVEFORM_KINDS}).")
+        if self.kind in ("pulso", "rampa") and self.duration_ms <= 0:
+            raise ValueError(f"duration_ms deve ser positivo para {self.kind!r} (recebido {self.duration_ms}).")
+
+
+class WaveformBatch:
+    """S formas de onda avaliadas juntas, sem laço por cenário."""
+
+    def __init__(self, waveforms):
+        waveforms = list(waveforms)
+        constant = np.array([w.kind == "constante" for w in waveforms])
+        self.baseline = np.array([w.baseline for w in waveforms], dtype=float)
+        self.amplitude = np.where(constant, 0.0, [w.amplitude for w in waveforms])
+        self.start_ms = np.array([w.start_ms for w in waveforms], dtype=float)
+        self.ramp = np.array([w.kind == "rampa" for w in waveforms])
+        self.rise_ms = np.where(self.ramp, [w.duration_ms for w in waveforms], 0.0)
+        self._inv_rise = np.where(self.ramp, 1.0 / np.where(self.ramp, self.rise_ms, 1.0), 0.0)
+        self._edge_start_ms = np.where(self.ramp, np.inf, self.start_ms)   # Degraus e pulsos
+        self.stop_ms = np.array([w.start_ms + w.duration_ms if w.kind == "pulso" else np.inf for w in waveforms])
+
+    def __len__(self):
+        return len(self.baseline)
+
+    def at(self, t_ms, left=False):
+        """Valores (S,) no instante `t_ms`; `left` dá o limite à esquerda nos degraus."""
+        # Só operações elementares (sem `np.where`/`np.clip`, bem mais lentos): o rk4
+        # avalia blocos (2n + 1, S) de uma vez
+        on = t_ms - self.start_ms
+        on *= self._inv_rise
+        np.minimum(on, 1.0, out=on)
+        np.maximum(on, 0.0, out=on)
+        if left:
+            on += self._edge_start_ms < t_ms
+            on *= self.stop_ms >= t_ms
+        else:
+            on += self._edge_start_ms <= t_ms
+            on *= self.stop_ms > t_ms
+        on *= self.amplitude
+        on += self.baseline
+        return on
+
+    def breakpoints(self):
+        """Instantes em que alguma forma de onda tem uma quina."""
+        edges = np.concatenate((self.start_ms, self.start_ms + self.rise_ms, self.stop_ms))
+        return np.unique(edges[np.isfinite(edges)])
+
+
+@dataclass(frozen=True)
+class RateModelParams:
+    tau_gc_ms: float = 5.0
+    tau_pause_ms: float = 80.0
+    tau_pc_ms: float = 10.0
+    tau_ncp_ms: float = 20.0
+    gc_hz_per_fm: float = MF_HZ_PER_UNIT     # Mesmo mapeamento FM → Hz da rede esparsa
+    pc_baseline_hz: float = 50.0             # Disparo simples espontâneo da CP
+    pc_hz_per_gc_hz: float = 0.5
+    pc_complex_hz_per_ft: float = 20.0
+    pc_pause_hz_per_ft: float = 40.0
+    pc_reference_hz: float = 70.0            # CP em FM = 5, FT = 0 no estado estacionário
+    ncp: NCPParams = DEFAULT_PARAMS
+
+
+@dataclass
+class RateTrajectories:
+    time_ms: np.ndarray          # (T,)
+    fm: np.ndarray               # (S, T) entradas
+    ft: np.ndarray
+    gc_rate_hz: np.ndarray       # (S, T) taxas
+    pc_rate_hz: np.ndarray
+    ncp_rate_hz: np.ndarray
+    solver: str
+    n_steps: int
+    elapsed_s: float
+
+    @property
+    def n_scenarios(self):
+        return self.ncp_rate_hz.shape[0]
+
+
+class _RateModel:
+    """Lado direito do sistema para um lote; `pc_scale` fixo por cenário.
+
+    A parte que depende só das entradas (`drive`) é separada da que depende do
+    estado, de modo que o rk4 calcula a primeira de uma vez para um bloco de
+    passos e cada avaliação custa ~10 operações in-place sobre arrays (S,).
+    """
+
+    def __init__(self, fm, ft, pc_inhibition_scale, params):
+        p, ncp = params, params.ncp
+        self.fm, self.ft, self.params = fm, ft, p
+        self.inv_tau = 1.0 / np.array([p.tau_gc_ms, p.tau_pause_ms, p.tau_pc_ms, p.tau_ncp_ms])[:, None]
+        self.inhibition_per_pc_hz = (np.broadcast_to(np.asarray(pc_inhibition_scale, dtype=float), (len(fm),))
+                                     / ncp.pc_scale_max * ncp.max_pc_inhibition_hz / p.pc_reference_hz)
+        self._work = np.empty(len(fm))
+
+    def drive(self, t_ms, left=False):
+        """Termos de entrada das quatro taxas-alvo, shape t_ms.shape + (4, S)."""
+        p, ncp = self.params, self.params.ncp
+        fm, ft = self.fm.at(t_ms, left), self.ft.at(t_ms, left)
+        return np.stack([p.gc_hz_per_fm * fm, ft,
+                         p.pc_baseline_hz + p.pc_complex_hz_per_ft * ft,
+                         ncp.baseline_hz + ncp.fm_gain * fm + ncp.ft_gain * ft], axis=-2)
+
+    def targets(self, drive, y, out):
+        """Taxas-alvo (4, S) para o estado `y`."""
+        p, work = self.params, self._work
+        np.copyto(out, drive)
+        np.multiply(y[0], p.pc_hz_per_gc_hz, out=work)
+        out[2] += work
+        np.multiply(y[1], p.pc_pause_hz_per_ft, out=work)
+        out[2] -= work
+        np.multiply(y[2], self.inhibition_per_pc_hz, out=work)
+        out[3] -= work
+        return np.maximum(out, 0.0, out=out)
+
+    def derivative(self, drive, y, out):
+        self.targets(drive, y, out)
+        out -= y
+        out *= self.inv_tau
+        return out
+
+    def steady_state(self, t_ms):
+        # Sistema em cascata: cada linha depende só das anteriores
+        y, drive = np.zeros((4, len(self.fm))), self.drive(t_ms)
+        for _ in range(4):
+            self.targets(drive, y.copy(), y)
+        return y
+
+
+def _rk4(model, t_out, dt_ms):
+    n_sub = max(1, int(round((t_out[1] - t_out[0]) / dt_ms))) if len(t_out) > 1 else 1
+    h = (t_out[1] - t_out[0]) / n_sub if len(t_out) > 1 else dt_ms
+    y = model.steady_state(t_out[0])
+    out = np.empty((len(t_out),) + y.shape, dtype=np.float32)
+    out[0] = y
+    k1, k2, k3, k4, tmp = (np.empty_like(y) for _ in range(5))
+    n_steps = (len(t_out) - 1) * n_sub
+    for chunk_start in range(0, n_steps, RK4_CHUNK_STEPS):
+        n_chunk = min(RK4_CHUNK_STEPS, n_steps - chunk_start)
+        # Entradas nos meios-passos do bloco numa única avaliação (2n + 1, S)
+        t_half = t_out[0] + (chunk_start + 0.5 * np.arange(2 * n_chunk + 1))[:, None] * h
+        drive = model.drive(t_half)
+        # Fim de cada passo pelo limite à esquerda, como no rk23: o passo que termina
+        # numa quina (degrau, pulso) ainda vê a entrada de antes dela
+        drive_end = model.drive(t_half[2::2], left=True)
+        for j in range(n_chunk):
+            d_start, d_mid, d_end = drive[2 * j], drive[2 * j + 1], drive_end[j]
+            model.derivative(d_start, y, k1)
+            np.multiply(k1, 0.5 * h, out=tmp)
+            tmp += y
+            model.derivative(d_mid, tmp, k2)
+            np.multiply(k2, 0.5 * h, out=tmp)
+            tmp += y
+            model.derivative(d_mid, tmp, k3)
+            np.multiply(k3, h, out=tmp)
+            tmp += y
+            model.derivative(d_end, tmp, k4)
+            k2 += k3
+            k2 *= 2.0
+            k1 += k2
+            k1 += k4
+            k1 *= h / 6.0
+            y += k1
+            step = chunk_start + j + 1
+            if step % n_sub == 0:
+                out[step // n_sub] = y
+    return out, n_steps
+
+
+def _rk23(model, t_out, rtol, atol, max_step_ms):
+    # Bogacki-Shampine 3(2) com FSAL; paradas obrigatórias nas quinas das entradas
+    t_end = t_out[-1]
+    stops = np.concatenate((model.fm.breakpoints(), model.ft.breakpoints(), [t_end]))
+    stops = np.unique(stops[(stops > t_out[0]) & (stops <= t_end)])
+    y = model.steady_state(t_out[0])
+    out = np.empty((len(t_out),) + y.shape, dtype=np.float32)
+    out[0] = y
+    k1, k2, k3, k4, y_new, err = (np.empty_like(y) for _ in range(6))
+    t, h, i_out, n_steps, i_stop = t_out[0], min(1.0, max_step_ms), 1, 0, 0
+    model.derivative(model.drive(t), y, k1)
+    while t < t_end:
+        while stops[i_stop] <= t:
+            i_stop += 1
+        h = min(h, max_step_ms, stops[i_stop] - t)
+        model.derivative(model.drive(t + 0.5 * h), y + 0.5 * h * k1, k2)
+        model.derivative(model.drive(t + 0.75 * h), y + 0.75 * h * k2, k3)
+        np.multiply(k1, 2.0 / 9.0 * h, out=y_new)
+        y_new += (h / 3.0) * k2
+        y_new += (4.0 / 9.0 * h) * k3
+        y_new += y
+        at_stop = h == stops[i_stop] - t
+        t_new = stops[i_stop] if at_stop else t + h   # Cai exatamente na quina
+        # Limite à esquerda: o passo inteiro vê a entrada do trecho que termina na quina
+        model.derivative(model.drive(t_new, left=True), y_new, k4)
+        np.multiply(k1, -5.0 / 72.0, out=err)
+        err += (1.0 / 12.0) * k2
+        err += (1.0 / 9.0) * k3
+        err -= 0.125 * k4
+        err *= h
+        ratio = float(np.max(np.abs(err) / (atol + rtol * np.maximum(np.abs(y), np.abs(y_new)))))
+        if ratio <= 1.0:
+            # Saídas em (t, t_new] por Hermite cúbico com as derivadas das pontas
+            j = i_out + np.searchsorted(t_out[i_out:], t_new, side="right")
+            if j > i_out:
+                s = ((t_out[i_out:j] - t) / h)[:, None, None]
+                h00, h10 = (1 + 2 * s) * (1 - s) ** 2, s * (1 - s) ** 2
+                h01, h11 = s ** 2 * (3 - 2 * s), s ** 2 * (s - 1)
+                out[i_out:j] = h00 * y + h10 * h * k1 + h01 * y_new + h11 * h * k4
+                i_out = j
+            t, y, k1, k4 = t_new, y_new, k4, k1
+            y_new = np.empty_like(y)
+            n_steps += 1
+            if at_stop:
+                model.derivative(model.drive(t), y, k1)   # Próximo trecho começa com a entrada nova
+        h *= min(5.0, max(0.2, 0.9 * ratio ** (-1.0 / 3.0))) if ratio > 0 else 5.0
+    return out, n_steps
+
+
+def simulate_rate_batch(fm_waveforms, ft_waveforms, pc_inhibition_scale, duration_ms,
+                        solver="rk4", params=RateModelParams(), dt_ms=DEFAULT_DT_MS,
+                        output_dt_ms=DEFAULT_OUTPUT_DT_MS, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL_HZ,
+                        max_step_ms=MAX_STEP_MS):
+    """Integra S cenários (uma forma de onda de FM e uma de FT por cenário) a partir do repouso em t = 0."""
+    if solver not in SOLVERS:
+        raise ValueError(f"Método desconhecido: {solver!r} (disponíveis: {SOLVERS}).")
+    fm, ft = WaveformBatch(fm_waveforms), WaveformBatch(ft_waveforms)
+    if len(fm) != len(ft) or len(fm) == 0:
+        raise ValueError(f"São necessárias listas de FM e FT não vazias e do mesmo tamanho ({len(fm)} e {len(ft)}).")
+    model = _RateModel(fm, ft, pc_inhibition_scale, params)
+    t_out = np.arange(int(round(duration_ms / output_dt_ms)) + 1) * output_dt_ms
+
+    start = time.perf_counter()
+    if solver == "rk4":
+        states, n_steps = _rk4(model, t_out, dt_ms)
+    else:
+        states, n_steps = _rk23(model, t_out, rtol, atol, max_step_ms)
+    elapsed = time.perf_counter() - start
+
+    # (T, 4, S) → um array (S, T) por população
+    states = states.transpose(1, 2, 0)
+    inputs = np.stack([fm.at(t_out[:, None]).T, ft.at(t_out[:, None]).T]).astype(np.float32)
+    return RateTrajectories(
+        time_ms=t_out, fm=inputs[0], ft=inputs[1],
+        gc_rate_hz=np.ascontiguousarray(states[0]), pc_rate_hz=np.ascontiguousarray(states[2]),
+        ncp_rate_hz=np.ascontiguousarray(states[3]),
+        solver=solver, n_steps=n_steps, elapsed_s=elapsed,
+    )
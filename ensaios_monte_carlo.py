@@ -0,0 +1,137 @@
+"""Modo Monte Carlo: K ensaios independentes do trem de picos dos NCP.
+
+Cada ensaio usa o mesmo modelo do traço único (`poisson_spike_times`) com o
+seu próprio subfluxo Philox (`philox_rng(semente, STREAM_MONTE_CARLO, ensaio)`),
+de modo que o ensaio k é sempre o mesmo, qualquer que seja a divisão em lotes
+ou o número de processos. Os ensaios são reduzidos em fluxo: cada bloco de
+`CHUNK_TRIALS` ensaios vira contagens (ensaio × bin) que são somadas a um
+`TrialAggregate` e descartadas. O agregado guarda apenas:
+
+- soma e soma dos quadrados das contagens por bin (PSTH e banda de 95%
+  do PSTH médio);
+- histograma de bins fixos da taxa de cada ensaio (distribuição das taxas).
+
+Lotes (`batch_ranges`) são a unidade de paralelismo: cada lote é um job do
+`servico_simulacao` e os agregados parciais são combinados com `merge`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from cache_simulacao import STREAM_MONTE_CARLO, philox_rng
+from trem_de_picos import MIN_RESOLUTION_MS, poisson_spike_times
+
+MAX_TRIALS = 10_000
+DEFAULT_PSTH_BIN_MS = 10.0
+DEFAULT_BATCH_TRIALS = 500       # Ensaios por job do pool
+CHUNK_TRIALS = 250               # Ensaios materializados de cada vez dentro de um job
+N_RATE_BINS = 40
+Z_95 = 1.959963984540054
+
+
+def rate_edges(rate_hz, duration_ms, n_bins=N_RATE_BINS):
+    """Bins fixos da taxa por ensaio: média ± 5 desvios de Poisson, truncados em 0."""
+    spread = 5.0 * np.sqrt(max(rate_hz, 1.0) / (duration_ms / 1000.0))
+    return np.linspace(max(0.0, rate_hz - spread), rate_hz + spread, n_bins + 1)
+
+
+@dataclass
+class TrialAggregate:
+    bin_ms: float
+    duration_ms: float
+    rate_edges_hz: np.ndarray
+    n_trials: int
+    count_sum: np.ndarray        # (bins,) soma das contagens por bin
+    count_sq_sum: np.ndarray     # (bins,) soma dos quadrados
+    rate_hist: np.ndarray        # (N_RATE_BINS,) ensaios por faixa de taxa (extremos incluem os excedentes)
+
+    @classmethod
+    def empty(cls, rate_hz, duration_ms, bin_ms=DEFAULT_PSTH_BIN_MS):
+        n_bins = int(duration_ms // bin_ms)
+        if n_bins < 1:
+            raise ValueError(f"bin_ms ({bin_ms}) deve ser menor que duration_ms ({duration_ms}).")
+        return cls(bin_ms, duration_ms, rate_edges(rate_hz, duration_ms), 0,
+                   np.zeros(n_bins), np.zeros(n_bins), np.zeros(N_RATE_BINS, dtype=np.int64))
+
+    @property
+    def n_bins(self):
+        return len(self.count_sum)
+
+    def fold_counts(self, counts):
+        """Acumula contagens (ensaios × bins) de um bloco de ensaios."""
+        self.n_trials += len(counts)
+        self.count_sum += counts.sum(axis=0)
+        self.count_sq_sum += np.einsum("ij,ij->j", counts, counts, dtype=float)
+        rates = counts.sum(axis=1) / (self.n_bins * self.bin_ms / 1000.0)
+        idx = np.clip(np.searchsorted(self.rate_edges_hz, rates, side="right") - 1, 0, N_RATE_BINS - 1)
+        self.rate_hist += np.bincount(idx, minlength=N_RATE_BINS)
+
+    def merge(self, other):
+        if other.n_bins != self.n_bins or not np.array_equal(other.rate_edges_hz, self.rate_edges_hz):
+            raise ValueError("Agregados com bins diferentes não podem ser combinados.")
+        self.n_trials += other.n_trials
+        self.count_sum += other.count_sum
+        self.count_sq_sum += other.count_sq_sum
+        self.rate_hist += other.rate_hist
+        return self
+
+    # --- Leituras ---
+
+    @property
+    def bin_centers_ms(self):
+        return (np.arange(self.n_bins) + 0.5) * self.bin_ms
+
+    @property
+    def psth_hz(self):
+        return self.count_sum / max(self.n_trials, 1) / (self.bin_ms / 1000.0)
+
+    @property
+    def band_hz(self):
+        """Banda de 95% do PSTH médio (média ± 1,96 · erro-padrão por bin)."""
+        n = max(self.n_trials, 1)
+        mean = self.count_sum / n
+        var = np.maximum(self.count_sq_sum / n - mean ** 2, 0.0) * n / max(n - 1, 1)
+        half = Z_95 * np.sqrt(var / n) / (self.bin_ms / 1000.0)
+        psth = self.psth_hz
+        return np.maximum(psth - half, 0.0), psth + half
+
+    @property
+    def rate_centers_hz(self):
+        return 0.5 * (self.rate_edges_hz[:-1] + self.rate_edges_hz[1:])
+
+    @property
+    def mean_rate_hz(self):
+        return float(self.psth_hz.mean())
+
+    def rate_quantiles(self, q=(0.025, 0.975)):
+        """Quantis aproximados (pelo histograma) da taxa de um ensaio isolado."""
+        cdf = np.cumsum(self.rate_hist) / max(self.rate_hist.sum(), 1)
+        return tuple(float(self.rate_centers_hz[min(np.searchsorted(cdf, p), N_RATE_BINS - 1)]) for p in q)
+
+
+def batch_ranges(n_trials, batch_trials=DEFAULT_BATCH_TRIALS):
+    """Lotes (primeiro ensaio, quantidade) que cobrem os `n_trials` ensaios."""
+    if not 1 <= n_trials <= MAX_TRIALS:
+        raise ValueError(f"n_trials deve estar entre 1 e {MAX_TRIALS} (recebido {n_trials}).")
+    return [(first, min(batch_trials, n_trials - first)) for first in range(0, n_trials, batch_trials)]
+
+
+def simulate_trial_batch(rate_hz, duration_ms, refractory_ms, resolution_ms, bin_ms, seed,
+                         first_trial, n_trials):
+    """Agregado dos ensaios [first_trial, first_trial + n_trials); memória limitada a um bloco."""
+    aggregate = TrialAggregate.empty(rate_hz, duration_ms, bin_ms)
+    n_bins = aggregate.n_bins
+    for chunk_start in range(first_trial, first_trial + n_trials, CHUNK_TRIALS):
+        chunk_trials = range(chunk_start, min(chunk_start + CHUNK_TRIALS, first_trial + n_trials))
+        trains = [
+            poisson_spike_times(rate_hz, duration_ms, rng=philox_rng(seed, STREAM_MONTE_CARLO, trial),
+                                refractory_ms=refractory_ms, resolution_ms=max(resolution_ms, MIN_RESOLUTION_MS))
+            for trial in chunk_trials
+        ]
+        # Uma única contagem para o bloco: índice linear (ensaio, bin)
+        rows = np.repeat(np.arange(len(trains)), [len(t) for t in trains])
+        bins = (np.concatenate(trains) // bin_ms).astype(np.int64) if len(rows) else np.empty(0, np.int64)
+        keep = bins < n_bins
+        counts = np.bincount(rows[keep] * n_bins + bins[keep], minlength=len(trains) * n_bins)
+        aggregate.fold_counts(counts.reshape(len(trains), n_bins).astype(float))
+    return aggregate
@@ -0,0 +1,167 @@
+"""Estatísticas de um trem de picos acumuladas em fluxo, bloco a bloco.
+
+`SpikeTrainStats.update` recebe os picos de cada bloco simulado (o
+osciloscópio manda um por quadro; o traço único é cortado em blocos) e
+guarda apenas acumuladores de tamanho fixo:
+
+- média e variância dos intervalos entre picos (ISI) por Welford, com a
+  fórmula de combinação de Chan para juntar um bloco inteiro de uma vez
+  (CV = desvio / média; 1 para Poisson, menor com período refratário);
+- histograma de bins fixos dos ISI (o último bin inclui os excedentes);
+- contagens em janelas fixas de `fano_window_ms`, também por Welford
+  (fator de Fano = variância / média das contagens); só a janela em curso
+  fica pendente entre blocos;
+- autocorrelograma até `max_lag_ms`: para cada pico novo, as defasagens em
+  relação aos picos anteriores dentro da janela, que são os únicos picos
+  guardados do passado.
+
+O custo de um bloco depende só dos picos e da duração do bloco, nunca do
+tempo já simulado.
+"""
+import numpy as np
+
+DEFAULT_ISI_BIN_MS = 2.0
+DEFAULT_ISI_MAX_MS = 200.0
+DEFAULT_FANO_WINDOW_MS = 100.0
+DEFAULT_LAG_BIN_MS = 2.0
+DEFAULT_MAX_LAG_MS = 100.0
+DEFAULT_CHUNK_MS = 1000.0         # Blocos usados para um trem já simulado por inteiro
+
+
+class Welford:
+    """Contagem, média e soma dos quadrados dos desvios (M2) em uma passada."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values):
+        """Acrescenta um bloco de valores (combinação de Chan et al.)."""
+        n_b = len(values)
+        if n_b == 0:
+            return
+        mean_b = float(np.mean(values))
+        m2_b = float(np.sum((values - mean_b) ** 2))
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * self.n * n_b / n
+        self.n = n
+
+    @property
+    def variance(self):
+        """Variância amostral (n - 1); NaN com menos de dois valores."""
+        return self.m2 / (self.n - 1) if self.n > 1 else float("nan")
+
+
+class SpikeTrainStats:
+    """Acumuladores de tamanho fixo de um trem de picos recebido em blocos consecutivos."""
+
+    def __init__(self, isi_bin_ms=DEFAULT_ISI_BIN_MS, isi_max_ms=DEFAULT_ISI_MAX_MS,
+                 fano_window_ms=DEFAULT_FANO_WINDOW_MS, lag_bin_ms=DEFAULT_LAG_BIN_MS,
+                 max_lag_ms=DEFAULT_MAX_LAG_MS):
+        if min(isi_bin_ms, isi_max_ms, fano_window_ms, lag_bin_ms, max_lag_ms) <= 0:
+            raise ValueError("Larguras de bin, janelas e defasagem máxima devem ser > 0.")
+        self.isi_bin_ms = isi_bin_ms
+        self.fano_window_ms = fano_window_ms
+        self.lag_bin_ms = lag_bin_ms
+        self.max_lag_ms = max_lag_ms
+        self.isi_hist = np.zeros(int(np.ceil(isi_max_ms / isi_bin_ms)), dtype=np.int64)
+        self.lag_hist = np.zeros(int(np.ceil(max_lag_ms / lag_bin_ms)), dtype=np.int64)
+        self.isi = Welford()
+        self.window_counts = Welford()
+        self.n_spikes = 0
+        self.start_ms = None
+        self.end_ms = None
+        self._window_partial = 0              # Picos da janela de contagem em curso
+        self._last_spike_ms = None
+        self._recent = np.empty(0)            # Picos a menos de `max_lag_ms` do fim do último bloco
+
+    def update(self, start_ms, end_ms, spike_times_ms):
+        """Acrescenta o bloco [start_ms, end_ms) com os seus picos (ordenados, em ms)."""
+        spikes = np.asarray(spike_times_ms, dtype=float)
+        if self.start_ms is None:
+            self.start_ms = start_ms
+        self.end_ms = end_ms
+        self.n_spikes += len(spikes)
+
+        # ISI, incluindo o intervalo entre o último pico anterior e o primeiro do bloco
+        if len(spikes):
+            previous = [] if self._last_spike_ms is None else [self._last_spike_ms]
+            isi = np.diff(np.concatenate((previous, spikes)))
+            self.isi.add(isi)
+            idx = np.minimum((isi // self.isi_bin_ms).astype(np.int64), len(self.isi_hist) - 1)
+            self.isi_hist += np.bincount(idx, minlength=len(self.isi_hist))
+            self._last_spike_ms = spikes[-1]
+
+        # Contagens por janela: fecha as janelas que terminaram neste bloco
+        w = self.fano_window_ms
+        first = int((start_ms - self.start_ms) // w)
+        n_closed = int((end_ms - self.start_ms) // w) - first
+        idx = np.clip(((spikes - self.start_ms) // w).astype(np.int64) - first, 0, n_closed)
+        counts = np.bincount(idx, minlength=n_closed + 1)
+        counts[0] += self._window_partial
+        self.window_counts.add(counts[:n_closed])
+        self._window_partial = int(counts[n_closed])
+
+        # Autocorrelograma: pares (anterior, novo) com defasagem < max_lag_ms
+        combined = np.concatenate((self._recent, spikes))
+        n_old = len(self._recent)
+        for k in range(1, len(combined)):
+            lags = combined[k:] - combined[:-k]
+            lags = lags[max(n_old - k, 0):]        # Só pares cujo pico mais recente é deste bloco
+            lags = lags[lags < self.max_lag_ms]
+            if not len(lags):
+                break                              # Defasagens só crescem com k
+            self.lag_hist += np.bincount((lags // self.lag_bin_ms).astype(np.int64), minlength=len(self.lag_hist))
+        self._recent = combined[combined > end_ms - self.max_lag_ms]
+
+    # --- Leituras ---
+
+    @property
+    def duration_ms(self):
+        return 0.0 if self.start_ms is None else self.end_ms - self.start_ms
+
+    @property
+    def rate_hz(self):
+        return self.n_spikes / (self.duration_ms / 1000.0) if self.duration_ms > 0 else float("nan")
+
+    @property
+    def isi_mean_ms(self):
+        return self.isi.mean if self.isi.n else float("nan")
+
+    @property
+    def isi_cv(self):
+        return np.sqrt(self.isi.variance) / self.isi.mean if self.isi.n > 1 and self.isi.mean > 0 else float("nan")
+
+    @property
+    def fano_factor(self):
+        w = self.window_counts
+        return w.variance / w.mean if w.n > 1 and w.mean > 0 else float("nan")
+
+    @property
+    def isi_centers_ms(self):
+        return (np.arange(len(self.isi_hist)) + 0.5) * self.isi_bin_ms
+
+    @property
+    def lag_centers_ms(self):
+        return (np.arange(len(self.lag_hist)) + 0.5) * self.lag_bin_ms
+
+    @property
+    def autocorrelogram_hz(self):
+        """Taxa condicional de disparo a cada defasagem após um pico (tende à taxa média)."""
+        return self.lag_hist / max(self.n_spikes, 1) / (self.lag_bin_ms / 1000.0)
+
+
+def spike_train_stats(spike_times_ms, duration_ms, chunk_ms=DEFAULT_CHUNK_MS, **options):
+    """Estatísticas de um trem inteiro, acumuladas em blocos de `chunk_ms`."""
+    stats = SpikeTrainStats(**options)
+    spike_times_ms = np.asarray(spike_times_ms, dtype=float)
+    for start_ms in np.arange(0.0, duration_ms, chunk_ms):
+        end_ms = min(start_ms + chunk_ms, duration_ms)
+        lo, hi = np.searchsorted(spike_times_ms, [start_ms, end_ms])
+        stats.update(start_ms, end_ms, spike_times_ms[lo:hi])
+    return stats
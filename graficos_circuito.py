@@ -0,0 +1,75 @@
+"""Specs Vega-Lite dos gráficos do app do circuito, montados direto das colunas NumPy.
+
+`st.line_chart` e companhia convertem os dados em DataFrame e montam o gráfico
+com o Altair: o primeiro gráfico de um processo importa pandas, pyarrow e
+Altair (cerca de 1 s e 100 MB), e cada rerun paga a conversão. Aqui o spec é
+um dict com os valores dentro da camada, que o `st.vega_lite_chart` repassa
+como estão, sem nenhuma dessas bibliotecas.
+
+Os dados vão em colunas (uma lista por coluna, numa única linha) e o
+transform `flatten` do Vega-Lite as abre em linhas no navegador: o nome de
+cada coluna aparece uma vez no payload, e não uma vez por ponto. Várias séries
+viram formato longo (x, série, valor) com `fold`, como o `st.line_chart` faz.
+NaN vira `null` (JSON válido) e os valores são arredondados a `DECIMALS`
+casas, que bastam para o gráfico.
+"""
+import numpy as np
+
+DECIMALS = 4
+SERIES_FIELD = "série"
+VALUE_FIELD = "valor"
+ZOOM = {"name": "zoom", "select": "interval", "bind": "scales"}
+
+
+def _field(name):
+    """Referência a um campo cujo nome pode ter pontos ou colchetes (sintaxe de caminho do Vega-Lite)."""
+    return name.replace("\\", "\\\\").replace(".", "\\.").replace("[", "\\[").replace("]", "\\]")
+
+
+def _json_column(values):
+    values = np.round(np.asarray(values, dtype=float), DECIMALS)
+    finite = np.isfinite(values)
+    return values.tolist() if finite.all() else np.where(finite, values, None).tolist()
+
+
+def _columns(columns):
+    return {name: _json_column(values) for name, values in columns.items()}
+
+
+def _channel(name, kind="quantitative", **extra):
+    return {"field": _field(name), "type": kind, "title": name, **extra}
+
+
+def _spec(columns, mark, encoding, height, transform=()):
+    # `as` com os nomes literais: as referências escapadas dos canais voltam a eles
+    flatten = {"flatten": [_field(name) for name in columns], "as": list(columns)}
+    return {"height": height,
+            "layer": [{"data": {"values": [_columns(columns)]}, "transform": [flatten, *transform],
+                       "mark": mark, "encoding": encoding, "params": [dict(ZOOM)]}]}
+
+
+def line_chart_spec(columns, x, height):
+    """Uma linha por coluna além de `x`; com mais de uma, legenda por série."""
+    series = [name for name in columns if name != x]
+    if len(series) == 1:
+        encoding = {"x": _channel(x), "y": _channel(series[0]),
+                    "tooltip": [_channel(x), _channel(series[0])]}
+        return _spec(columns, {"type": "line"}, encoding, height)
+    encoding = {
+        "x": _channel(x),
+        "y": _channel(VALUE_FIELD, title=None),
+        "color": _channel(SERIES_FIELD, "nominal", title=None, sort=series),
+        "tooltip": [_channel(x), _channel(SERIES_FIELD, "nominal"), _channel(VALUE_FIELD)],
+    }
+    fold = {"fold": [_field(name) for name in series], "as": [SERIES_FIELD, VALUE_FIELD]}
+    return _spec(columns, {"type": "line"}, encoding, height, [fold])
+
+
+def bar_chart_spec(columns, x, y, height):
+    encoding = {"x": _channel(x), "y": _channel(y), "tooltip": [_channel(x), _channel(y)]}
+    return _spec(columns, {"type": "bar"}, encoding, height)
+
+
+def scatter_chart_spec(columns, x, y, height, size=6):
+    encoding = {"x": _channel(x), "y": _channel(y), "tooltip": [_channel(x), _channel(y)]}
+    return _spec(columns, {"type": "circle", "size": size}, encoding, height)
@@ -0,0 +1,219 @@
+"""Specs Vega-Lite dos gráficos do app de divisões funcionais.
+
+Compartilhados pelo app (`divisoes_funcionais_cerebelo`) e pelo build
+estático (`pacote_estatico`): os dois mostram exatamente o mesmo gráfico para
+o mesmo estado.
+
+Montar um gráfico Altair e chamar `to_dict()` custa dezenas de ms por causa
+da validação do esquema, e o app tem só alguns estados. Por isso cada
+gráfico vira um modelo (spec sem dados), montado e validado uma única vez;
+cada estado só injeta os valores e o título no modelo, sem validar de novo,
+e o spec pronto fica memorizado por estado em `GraficosDivisoes` (LRU de
+`MAX_SPECS` specs; a combinação de lesões entra na ordem de
+`MatrizImpacto.lesoes`, qualquer que seja a ordem em que foi escolhida). Os dados
+vão dentro de cada camada (e não no nível de cima do spec), onde o
+`st.vega_lite_chart` os repassa como estão, sem convertê-los para Arrow a
+cada rerun.
+
+Os modelos validados ficam também em disco, sob o hash SHA-256 deste módulo,
+das entradas dos modelos e da versão do Altair (como os SVGs de `diagramas`):
+com o cache em disco, o processo nem importa o Altair. Uso como etapa de
+build:
+
+    python graficos_divisoes.py
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from importlib.metadata import version
+from pathlib import Path
+
+from conteudo import CONTEUDO_PATH, carregar_conteudo
+from impacto_lesoes import carregar_matriz_impacto
+
+CACHE_DIR = Path(os.environ.get("CEREBELO_CHART_CACHE", Path(__file__).resolve().parent / ".cache" / "graficos"))
+MAX_SPECS = int(os.environ.get("CEREBELO_MAX_CHART_SPECS", "512"))   # Specs memorizados por processo
+
+
+def descricao_lesoes(lesoes):
+    return " + ".join(lesoes) if lesoes else "nenhuma divisão"
+
+
+# --- Modelos (Altair, montados uma vez) ---
+
+def _grafico_fase(alt):
+    """Barras da contribuição de cada divisão numa fase do movimento."""
+    return alt.Chart().mark_bar().encode(
+        x=alt.X('Contribuição:Q', title="Nível de Contribuição (0-5)", scale=alt.Scale(domain=[0, 5])),
+        y=alt.Y('Divisão:N', sort=None, title="Divisão Cerebelar"),
+        color=alt.Color('cor:N', scale=None, legend=None),
+        tooltip=['Divisão:N', 'Contribuição:Q']
+    ).properties(height=220)
+
+
+def _grafico_impacto(alt, conteudo, matriz):
+    """Mapa de calor fase × divisão, com o valor de cada célula e as divisões lesionadas em cinza."""
+    base_heatmap = alt.Chart().encode(
+        x=alt.X('Divisão:N', sort=list(matriz.divisoes), title="Divisão Cerebelar"),
+        y=alt.Y('Fase:N', sort=list(matriz.fases), title="Fase do Movimento"),
+    )
+    return (
+        base_heatmap.mark_rect().encode(
+            color=alt.Color('Contribuição:Q', scale=alt.Scale(domain=[0, 5], scheme="blues"),
+                            title="Contribuição (0-5)"),
+            tooltip=['Fase:N', 'Divisão:N', alt.Tooltip('Normal:Q', format=".2f"),
+                     alt.Tooltip('Contribuição:Q', format=".2f"), alt.Tooltip('Perda:Q', format=".2f")],
+        )
+        + base_heatmap.mark_text().encode(
+            text=alt.Text('Contribuição:Q', format=".1f"),
+            color=alt.condition("datum['Lesionada']", alt.value(conteudo.cor_lesionada), alt.value("black")),
+        )
+    ).properties(height=260)
+
+
+def _grafico_impacto_fase(alt):
+    """Barras de uma fase com as divisões lesionadas em cinza."""
+    return alt.Chart().mark_bar().encode(
+        x=alt.X('Contribuição:Q', title="Nível de Contribuição (0-5)", scale=alt.Scale(domain=[0, 5])),
+        y=alt.Y('Divisão:N', sort=None, title="Divisão Cerebelar"),
+        color=alt.Color('cor_barra:N', scale=None, legend=None),
+        tooltip=['Divisão:N', alt.Tooltip('Normal:Q', format=".2f"), alt.Tooltip('Contribuição:Q', format=".2f")]
+    ).properties(height=220)
+
+
+def _modelo(grafico):
+    """Spec validado e sem dados; gráficos simples viram uma camada única."""
+    spec = grafico.to_dict()
+    # Sem dados, o Altair põe um dataset vazio no nível de cima
+    spec.pop("data", None)
+    spec.pop("datasets", None)
+    if "layer" not in spec:
+        spec["layer"] = [{chave: spec.pop(chave) for chave in ("mark", "encoding") if chave in spec}]
+    return spec
+
+
+def _preencher(modelo, valores, titulo):
+    return {**modelo, "title": titulo,
+            "layer": [{**camada, "data": {"values": valores}} for camada in modelo["layer"]]}
+
+
+def _entradas_modelos(conteudo, matriz):
+    """Tudo de que os modelos dependem além do código deste módulo."""
+    return {"divisoes": list(matriz.divisoes), "fases": list(matriz.fases), "cor_lesionada": conteudo.cor_lesionada}
+
+
+def cache_path(conteudo, matriz, cache_dir=CACHE_DIR):
+    chave = hashlib.sha256(Path(__file__).read_bytes())
+    chave.update(json.dumps([_entradas_modelos(conteudo, matriz), version("altair")], sort_keys=True).encode("utf-8"))
+    return Path(cache_dir) / f"{chave.hexdigest()}.json"
+
+
+def construir_modelos(conteudo, matriz):
+    """Monta e valida os modelos com o Altair (a única parte que precisa dele)."""
+    import altair as alt
+
+    modelos = {
+        "fase": _modelo(_grafico_fase(alt)),
+        "impacto": _modelo(_grafico_impacto(alt, conteudo, matriz)),
+        "impacto_fase": _modelo(_grafico_impacto_fase(alt)),
+    }
+    # Confere uma vez que a injeção de valores produz specs válidos
+    valores = matriz.valores_heatmap((), matriz.severidades[-1])
+    for modelo in modelos.values():
+        alt.LayerChart.from_dict(_preencher(modelo, valores, ""))
+    return modelos
+
+
+def carregar_modelos(conteudo, matriz, cache_dir=CACHE_DIR):
+    """Modelos do cache em disco; montados (e gravados de forma atômica) só se faltarem."""
+    path = cache_path(conteudo, matriz, cache_dir)
+    if path.exists():
+        return json.loads(path.read_text(encoding="utf-8"))
+    modelos = construir_modelos(conteudo, matriz)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(modelos, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+    return modelos
+
+
+# --- Specs por estado ---
+
+class GraficosDivisoes:
+    """Specs prontos para `st.vega_lite_chart`, memorizados por estado; thread-safe.
+
+    Os dicts devolvidos são compartilhados entre sessões e não devem ser
+    alterados (o Streamlit faz uma cópia rasa antes de mexer no spec).
+    """
+
+    def __init__(self, conteudo, matriz, modelos=None):
+        self.conteudo = conteudo
+        self.matriz = matriz
+        self._modelos = construir_modelos(conteudo, matriz) if modelos is None else modelos
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def modelos(self):
+        """Modelos sem dados (para o build estático preencher no navegador); não alterar."""
+        return self._modelos
+
+    def _memorizar(self, tipo, estado, montar):
+        chave = (tipo, estado)
+        with self._lock:
+            spec = self._specs.get(chave)
+            if spec is not None:
+                self._specs.move_to_end(chave)
+                return spec
+        spec = montar(self._modelos[tipo])          # Fora do lock: outro estado não espera
+        with self._lock:
+            spec = self._specs.setdefault(chave, spec)
+            self._specs.move_to_end(chave)
+            while len(self._specs) > MAX_SPECS:
+                self._specs.popitem(last=False)
+        return spec
+
+    def _combinacao(self, lesoes):
+        """Lesões na ordem de `matriz.lesoes`, sem repetição: a mesma combinação é o mesmo estado."""
+        return tuple(self.matriz.lesoes[i] for i in self.matriz.indices_lesoes(lesoes))
+
+    def fase(self, fase):
+        return self._memorizar("fase", fase, lambda modelo: _preencher(
+            modelo, self.conteudo.valores_grafico_fase(fase), f"Atividade Relativa na Fase: {fase}"))
+
+    def impacto(self, lesoes, severidade):
+        lesoes = self._combinacao(lesoes)
+        return self._memorizar("impacto", (lesoes, severidade), lambda modelo: _preencher(
+            modelo, self.matriz.valores_heatmap(lesoes, severidade),
+            f"Contribuição por Fase e Divisão com Lesão em: {descricao_lesoes(lesoes)} ({severidade:.0%})"))
+
+    def impacto_fase(self, lesoes, severidade, fase):
+        lesoes = self._combinacao(lesoes)
+        conteudo = self.conteudo
+
+        def montar(modelo):
+            valores = [
+                {**linha, "cor_barra": conteudo.cor_lesionada if linha["Lesionada"] else conteudo.cores[linha["Divisão"]]}
+                for linha in self.matriz.valores_heatmap(lesoes, severidade) if linha["Fase"] == fase
+            ]
+            return _preencher(modelo, valores, f"Contribuição Relativa Simulada na Fase de {fase} "
+                                               f"com Lesão em: {descricao_lesoes(lesoes)}")
+
+        return self._memorizar("impacto_fase", (lesoes, severidade, fase), montar)
+
+
+@lru_cache(maxsize=None)
+def carregar_graficos(caminho=CONTEUDO_PATH):
+    """`GraficosDivisoes` do conteúdo em `caminho`; um por processo, com os modelos do cache em disco."""
+    conteudo, matriz = carregar_conteudo(caminho), carregar_matriz_impacto(caminho)
+    return GraficosDivisoes(conteudo, matriz, carregar_modelos(conteudo, matriz))
+
+
+if __name__ == "__main__":
+    conteudo, matriz = carregar_conteudo(), carregar_matriz_impacto()
+    status = "em cache" if cache_path(conteudo, matriz).exists() else "montados"
+    carregar_modelos(conteudo, matriz)
+    print(f"Modelos dos gráficos: {status} -> {cache_path(conteudo, matriz)}")
@@ -0,0 +1,93 @@
+"""Impacto de lesões (e combinações de lesões) na contribuição fase × divisão.
+
+As lesões "elementares" são as do conteúdo que alteram alguma divisão
+(`contrib_modificada`). A matriz guarda só a contribuição normal (fases,
+divisões) e a residual de cada lesão elementar (lesões, divisões). Uma
+combinação (p.ex. vestibular + espinal) é resolvida na hora: cada divisão
+fica com a menor residual entre as lesões escolhidas, e a gravidade parcial
+interpola entre a contribuição normal e a residual:
+
+    contrib = normal + gravidade · máscara · (residual − normal)
+
+São só indexação, um mínimo e uma multiplicação sobre arrays pequenos; a
+memória cresce linearmente com o número de lesões, sem enumerar as 2^L
+combinações.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+from conteudo import CONTEUDO_PATH, carregar_conteudo
+
+SEVERIDADES = (0.25, 0.5, 0.75, 1.0)
+COLUNAS_HEATMAP = ("Fase", "Divisão", "Contribuição", "Normal", "Perda", "Lesionada")
+
+
+@dataclass(frozen=True)
+class MatrizImpacto:
+    fases: Tuple[str, ...]
+    divisoes: Tuple[str, ...]
+    lesoes: Tuple[str, ...]            # Lesões elementares
+    severidades: Tuple[float, ...]
+    normal: np.ndarray                 # (fases, divisões)
+    residual: np.ndarray               # (lesões, divisões); inf = divisão preservada
+
+    def indices_lesoes(self, lesoes):
+        """Índices das lesões elementares, na ordem de `self.lesoes` e sem repetição."""
+        for nome in lesoes:
+            if nome not in self.lesoes:
+                raise ValueError(f"Lesão desconhecida: {nome!r}.")
+        return [i for i, nome in enumerate(self.lesoes) if nome in lesoes]
+
+    def mascara(self, lesoes):
+        """Divisões (divisões,) atingidas pela combinação."""
+        return np.isfinite(self.residual[self.indices_lesoes(lesoes)].min(axis=0, initial=np.inf))
+
+    def indice_severidade(self, severidade):
+        if severidade not in self.severidades:
+            raise ValueError(f"Gravidade deve ser uma de {self.severidades} (recebido {severidade}).")
+        return self.severidades.index(severidade)
+
+    def fatia(self, lesoes, severidade):
+        """Contribuições (fases, divisões) da combinação com a gravidade dada."""
+        gravidade = self.severidades[self.indice_severidade(severidade)]
+        # Divisões atingidas por mais de uma lesão ficam com a menor contribuição residual
+        residual = self.residual[self.indices_lesoes(lesoes)].min(axis=0, initial=np.inf)
+        delta = np.where(np.isfinite(residual), residual - self.normal, 0.0)
+        return self.normal + gravidade * delta
+
+    def valores_heatmap(self, lesoes, severidade):
+        """Linhas tidy (fase, divisão) da combinação para o gráfico do app."""
+        contrib = self.fatia(lesoes, severidade)
+        mascara = self.mascara(lesoes)
+        return [
+            dict(zip(COLUNAS_HEATMAP, (fase, divisao, float(contrib[i, j]), float(self.normal[i, j]),
+                                       float(self.normal[i, j] - contrib[i, j]), bool(mascara[j]))))
+            for i, fase in enumerate(self.fases)
+            for j, divisao in enumerate(self.divisoes)
+        ]
+
+
+def construir_matriz_impacto(conteudo, severidades=SEVERIDADES):
+    """Monta a matriz a partir do conteúdo validado."""
+    fases, divisoes = tuple(conteudo.fases), conteudo.divisoes
+    elementares = tuple(nome for nome, lesao in conteudo.lesoes.items() if lesao.contrib_modificada)
+
+    normal = np.array([[conteudo.fases[f].contrib[d] for d in divisoes] for f in fases], dtype=float)
+    # Contribuição residual de cada lesão elementar por divisão (inf = divisão preservada)
+    residual = np.full((len(elementares), len(divisoes)), np.inf)
+    for i, nome in enumerate(elementares):
+        for j, divisao in enumerate(divisoes):
+            residual[i, j] = conteudo.lesoes[nome].contrib_modificada.get(divisao, np.inf)
+
+    for arr in (normal, residual):
+        arr.setflags(write=False)
+    return MatrizImpacto(fases, divisoes, elementares, tuple(severidades), normal, residual)
+
+
+@lru_cache(maxsize=None)
+def carregar_matriz_impacto(caminho=CONTEUDO_PATH):
+    """Matriz do conteúdo em `caminho`; calculada uma vez por processo."""
+    return construir_matriz_impacto(carregar_conteudo(caminho))
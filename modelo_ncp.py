@@ -0,0 +1,77 @@
+"""Modelo de taxa de disparo dos Núcleos Cerebelares Profundos (NCP).
+
+Módulo sem dependência do Streamlit: recebe escalares ou arrays NumPy de
+`fm_strength`, `ft_strength` e `pc_inhibition_scale` e, via broadcasting,
+devolve a superfície de resposta completa numa única chamada.
+"""
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+# --- Parâmetros do Modelo (didáticos) ---
+NCP_BASELINE_ACTIVITY_HZ = 10.0              # Atividade tônica intrínseca dos NCP em Hz
+FM_TO_NCP_GAIN = 4.0                         # Ganho da excitação das FM para os NCP
+FT_TO_NCP_GAIN = 6.0                         # Ganho da excitação das FT para os NCP
+MAX_TOTAL_PC_INHIBITORY_POTENTIAL_HZ = 120.0 # Inibição máxima da CP (escala = 10)
+PC_INHIBITION_SCALE_MAX = 10.0               # Valor máximo do controle de inibição da CP
+
+
+@dataclass(frozen=True)
+class NCPParams:
+    """Constantes de ganho do modelo; imutável para servir de chave de cache."""
+    baseline_hz: float = NCP_BASELINE_ACTIVITY_HZ
+    fm_gain: float = FM_TO_NCP_GAIN
+    ft_gain: float = FT_TO_NCP_GAIN
+    max_pc_inhibition_hz: float = MAX_TOTAL_PC_INHIBITORY_POTENTIAL_HZ
+    pc_scale_max: float = PC_INHIBITION_SCALE_MAX
+
+
+DEFAULT_PARAMS = NCPParams()
+
+
+class NCPResponse(NamedTuple):
+    """Termos intermediários e taxa final, todos com o shape do broadcast das entradas."""
+    excitation_from_fm: np.ndarray
+    excitation_from_ft: np.ndarray
+    total_direct_excitation: np.ndarray
+    effective_pc_inhibition: np.ndarray
+    final_rate_hz: np.ndarray
+
+
+def ncp_response(fm_strength, ft_strength, pc_inhibition_scale, params=DEFAULT_PARAMS):
+    """Calcula a resposta dos NCP para entradas escalares ou arrays (com broadcasting)."""
+    fm = np.asarray(fm_strength, dtype=float)
+    ft = np.asarray(ft_strength, dtype=float)
+    pc = np.asarray(pc_inhibition_scale, dtype=float)
+
+    excitation_from_fm = fm * params.fm_gain
+    excitation_from_ft = ft * params.ft_gain
+    total_direct_excitation = params.baseline_hz + excitation_from_fm + excitation_from_ft
+    effective_pc_inhibition = (pc / params.pc_scale_max) * params.max_pc_inhibition_hz
+    final_rate_hz = np.maximum(0.0, total_direct_excitation - effective_pc_inhibition)
+    return NCPResponse(
+        excitation_from_fm, excitation_from_ft, total_direct_excitation,
+        effective_pc_inhibition, final_rate_hz,
+    )
+
+
+def ncp_final_firing_rate_hz(fm_strength, ft_strength, pc_inhibition_scale, params=DEFAULT_PARAMS):
+    """Atalho que devolve apenas a taxa final de disparo dos NCP (Hz)."""
+    return ncp_response(fm_strength, ft_strength, pc_inhibition_scale, params).final_rate_hz
+
+
+def ncp_rate_grid(fm_values, ft_values, pc_values, params=DEFAULT_PARAMS):
+    """Superfície de resposta no produto cartesiano dos três eixos.
+
+    Devolve um `NCPResponse` com arrays de shape (len(fm), len(ft), len(pc)),
+    útil para curvas e mapas de calor com milhares de combinações.
+    """
+    fm, ft, pc = np.ix_(
+        np.atleast_1d(np.asarray(fm_values, dtype=float)),
+        np.atleast_1d(np.asarray(ft_values, dtype=float)),
+        np.atleast_1d(np.asarray(pc_values, dtype=float)),
+    )
+    response = ncp_response(fm, ft, pc, params)
+    shape = np.broadcast_shapes(fm.shape, ft.shape, pc.shape)
+    return NCPResponse(*(np.broadcast_to(term, shape) for term in response))
@@ -0,0 +1,125 @@
+"""Modo osciloscópio: trem de picos dos NCP simulado continuamente em blocos.
+
+`SpikeStream` avança o processo de Poisson com período refratário bloco a
+bloco, guardando apenas o próximo pico pendente; a taxa pode mudar entre
+blocos (o intervalo pendente é sorteado de novo, o que é exato para um
+processo sem memória). `RingBuffer` mantém um histórico de tamanho fixo do
+traço, de modo que a memória não cresce com a duração da sessão e cada
+quadro enviado ao navegador tem sempre o mesmo tamanho. As estatísticas do
+trem (ISI, CV, Fano, autocorrelograma) são acumuladas bloco a bloco em
+`SpikeTrainStats`, também sem guardar a história dos picos.
+"""
+import numpy as np
+
+from estatisticas_picos import SpikeTrainStats
+from trem_de_picos import RESTING_POTENTIAL_MV, SPIKE_PEAK_MV, voltage_trace
+
+FRAME_INTERVAL_S = 0.1           # Intervalo entre quadros (10 quadros/s)
+DEFAULT_RESOLUTION_MS = 1.0
+DEFAULT_HISTORY_MS = 2000.0      # Histórico visível no osciloscópio
+MAX_CATCH_UP_MS = 500.0          # Atraso máximo recuperado num único quadro
+
+
+class RingBuffer:
+    """Buffer circular (tempo, valor) de capacidade fixa; tempo em float64 para sessões longas."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._time = np.zeros(capacity)
+        self._value = np.zeros(capacity, dtype=np.float32)
+        self._next = 0
+        self.size = 0
+
+    def extend(self, time, value):
+        time, value = time[-self.capacity:], value[-self.capacity:]
+        n = len(time)
+        first = min(n, self.capacity - self._next)
+        self._time[self._next:self._next + first] = time[:first]
+        self._value[self._next:self._next + first] = value[:first]
+        self._time[:n - first] = time[first:]
+        self._value[:n - first] = value[first:]
+        self._next = (self._next + n) % self.capacity
+        self.size = min(self.capacity, self.size + n)
+
+    def view(self):
+        """Cópias (tempo, valor) em ordem cronológica."""
+        if self.size < self.capacity:
+            return self._time[:self.size].copy(), self._value[:self.size].copy()
+        order = np.r_[self._next:self.capacity, 0:self._next]
+        return self._time[order], self._value[order]
+
+
+class SpikeStream:
+    """Processo de Poisson com período refratário avançado em blocos de duração arbitrária."""
+
+    def __init__(self, rng, refractory_ms=0.0, resolution_ms=DEFAULT_RESOLUTION_MS):
+        self.rng = rng
+        self.refractory_ms = refractory_ms
+        self.resolution_ms = resolution_ms
+        self.t_ms = 0.0
+        self.rate_hz = 0.0
+        self._last_spike_ms = -np.inf
+        self._next_spike_ms = np.inf
+
+    def _draw_next(self, after_ms):
+        rate_per_ms = self.rate_hz / 1000.0
+        if rate_per_ms <= 0:
+            return np.inf
+        dead_fraction = rate_per_ms * self.refractory_ms
+        if dead_fraction >= 1.0:
+            return max(after_ms, self._last_spike_ms + self.refractory_ms)
+        # Mesmo λ' corrigido de `poisson_spike_times`: a taxa média continua igual a rate_hz
+        mean_exp_ms = (1.0 - dead_fraction) / rate_per_ms
+        return max(after_ms, self._last_spike_ms + self.refractory_ms) + self.rng.exponential(mean_exp_ms)
+
+    def advance(self, rate_hz, chunk_ms):
+        """Simula [t, t + chunk_ms) e devolve os tempos dos picos do bloco."""
+        if rate_hz != self.rate_hz:
+            self.rate_hz = rate_hz
+            self._next_spike_ms = self._draw_next(self.t_ms)
+        end_ms = self.t_ms + chunk_ms
+        spikes = []
+        while self._next_spike_ms < end_ms:
+            self._last_spike_ms = self._next_spike_ms
+            spikes.append(self._last_spike_ms)
+            self._next_spike_ms = self._draw_next(self._last_spike_ms + self.refractory_ms)
+        start_ms, self.t_ms = self.t_ms, end_ms
+        spikes = np.round(np.asarray(spikes) / self.resolution_ms) * self.resolution_ms
+        return start_ms, spikes
+
+
+class Oscilloscope:
+    """Estado de uma sessão: fluxo de picos + histórico circular do traço + estatísticas do trem."""
+
+    def __init__(self, rng, refractory_ms=0.0, resolution_ms=DEFAULT_RESOLUTION_MS,
+                 history_ms=DEFAULT_HISTORY_MS):
+        self.stream = SpikeStream(rng, refractory_ms, resolution_ms)
+        self.buffer = RingBuffer(int(round(history_ms / resolution_ms)))
+        self.n_spikes = 0
+        self.stats = SpikeTrainStats()
+        self.last_step_s = None
+
+    def reset_stats(self):
+        """Recomeça as estatísticas a partir do próximo bloco (ex.: após mudar a taxa)."""
+        self.stats = SpikeTrainStats()
+
+    def step_realtime(self, rate_hz, now_s):
+        """Avança o tempo real decorrido desde o último quadro (limitado a `MAX_CATCH_UP_MS`)."""
+        if self.last_step_s is None:
+            elapsed_ms = self.buffer.capacity * self.stream.resolution_ms   # Primeiro quadro: histórico cheio
+        else:
+            elapsed_ms = min((now_s - self.last_step_s) * 1000.0, MAX_CATCH_UP_MS)
+        self.last_step_s = now_s
+        # Blocos inteiros da resolução, para a grade do traço não escorregar
+        chunk_ms = np.floor(elapsed_ms / self.stream.resolution_ms) * self.stream.resolution_ms
+        return self.step(rate_hz, chunk_ms) if chunk_ms > 0 else 0
+
+    def step(self, rate_hz, chunk_ms):
+        """Avança um bloco e acrescenta ao histórico apenas as amostras novas."""
+        start_ms, spikes = self.stream.advance(rate_hz, chunk_ms)
+        time_ms, voltage = voltage_trace(spikes, start_ms, self.stream.t_ms, self.stream.resolution_ms,
+                                         RESTING_POTENTIAL_MV, SPIKE_PEAK_MV)
+        self.buffer.extend(time_ms, voltage)
+        self.n_spikes += len(spikes)
+        self.stats.update(start_ms, self.stream.t_ms, spikes)
+        return len(time_ms)
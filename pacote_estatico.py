@@ -0,0 +1,505 @@
+"""Build estático dos apps: HTML + JSON servidos por qualquer servidor de arquivos.
+
+Quem só lê o conteúdo não precisa de uma sessão Streamlit (e de um
+websocket) no servidor: este build pré-calcula todos os estados alcançáveis
+e a troca entre eles acontece no navegador.
+
+    python pacote_estatico.py [--output DIR]
+
+Conteúdo de DIR (padrão `.cache/estatico`, ou `CEREBELO_STATIC_DIR`):
+
+- `index.html`: página única com os dois apps; Vega-Embed, marked e viz.js
+  vêm de CDN;
+- `pacote.json`: textos dos apps, specs Vega-Lite de todas as fases e, para
+  as lesões, os modelos dos gráficos de `graficos_divisoes` com as
+  contribuições normal e residual de cada lesão; a combinação de lesões e a
+  gravidade escolhidas são resolvidas no navegador com a mesma conta de
+  `impacto_lesoes`, de modo que o pacote cresce linearmente com o número de
+  lesões;
+- `circuito.json`: grade FM × FT × inibição da CP com as taxas do
+  `modelo_ncp` e o trem de picos de cada ponto (mesma semente e opções
+  padrão do app, ou seja, o mesmo traço que o app mostraria);
+- `diagramas/*.svg`: fluxogramas pré-renderizados (sem o `dot` do Graphviz,
+  a fonte DOT vai no `pacote.json` e o layout é feito no navegador).
+
+Os textos estáticos (st.title/header/subheader/markdown/caption com literal
+e `exibir_diagrama`) são lidos da árvore sintática dos próprios scripts,
+então editar o texto de um app não exige mexer no build. As partes
+interativas entram nos pontos marcados em `ANCORAS`.
+"""
+import argparse
+import ast
+import json
+import os
+import textwrap
+import time
+from pathlib import Path
+
+import numpy as np
+
+from cache_simulacao import STREAM_SPIKE_TRAIN, philox_rng
+from conteudo import carregar_conteudo
+from diagramas import DIAGRAMAS, get_svg
+from graficos_divisoes import GraficosDivisoes
+from impacto_lesoes import carregar_matriz_impacto
+from modelo_ncp import DEFAULT_PARAMS, ncp_rate_grid
+from trem_de_picos import RESTING_POTENTIAL_MV, SPIKE_PEAK_MV, poisson_spike_times
+
+RAIZ = Path(__file__).resolve().parent
+DEFAULT_OUTPUT = Path(os.environ.get("CEREBELO_STATIC_DIR", RAIZ / ".cache" / "estatico"))
+APPS = {
+    "divisoes": RAIZ / "divisoes_funcionais_cerebelo.py",
+    "circuito": RAIZ / "streamlit_cerebelo_circuito.py",
+}
+# Chamada de função (fragmento) ou alvo de atribuição -> parte interativa renderizada no navegador
+ANCORAS = {"aba_etapas_movimento": "movimento", "aba_efeitos_lesoes": "lesoes", "col_params": "circuito"}
+CHAMADAS_LITERAIS = {"title": "titulo", "header": "cabecalho", "subheader": "subcabecalho",
+                     "markdown": "markdown", "caption": "legenda"}
+
+# Grade do circuito: passo dos três controles e opções padrão do app
+PASSO_GRADE = 0.5
+CIRCUITO_PADRAO = {"fm": 5.0, "ft": 1.0, "pc": 5.0}
+DURACAO_MS = 200
+REFRATARIO_MS = 1.0
+RESOLUCAO_MS = 1.0
+SEMENTE = 0
+
+
+# --- Textos dos scripts ---
+
+def _bloco_literal(no):
+    """Bloco de conteúdo de `st.<f>("literal")` ou `exibir_diagrama(NOME)`; None para o resto."""
+    if not (isinstance(no, ast.Expr) and isinstance(no.value, ast.Call)):
+        return None
+    chamada = no.value
+    func = chamada.func
+    if isinstance(func, ast.Name) and func.id == "exibir_diagrama" and isinstance(chamada.args[0], ast.Name):
+        return {"tipo": "diagrama", "nome": chamada.args[0].id.lower()}
+    if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "st"
+            and func.attr in CHAMADAS_LITERAIS and chamada.args
+            and isinstance(chamada.args[0], ast.Constant) and isinstance(chamada.args[0].value, str)):
+        return {"tipo": CHAMADAS_LITERAIS[func.attr], "texto": textwrap.dedent(chamada.args[0].value).strip()}
+    return None
+
+
+def _ancora(no):
+    if isinstance(no, ast.Expr) and isinstance(no.value, ast.Call) and isinstance(no.value.func, ast.Name):
+        return ANCORAS.get(no.value.func.id)
+    if isinstance(no, ast.Assign):
+        nomes = [alvo.id for t in no.targets for alvo in ast.walk(t) if isinstance(alvo, ast.Name)]
+        return next((ANCORAS[nome] for nome in nomes if nome in ANCORAS), None)
+    return None
+
+
+def _perfil(no):
+    """Linhas de `perfil_secoes` (start_profile / lap / finish), ignoradas na extração."""
+    chamada = no.value if isinstance(no, (ast.Expr, ast.Assign)) else None
+    if not isinstance(chamada, ast.Call):
+        return False
+    func = chamada.func
+    return ((isinstance(func, ast.Name) and func.id == "start_profile")
+            or (isinstance(func, ast.Attribute) and func.attr in ("lap", "finish")))
+
+
+def _abas(no):
+    """Nomes das variáveis e rótulos de `a, b = st.tabs([...])`."""
+    if (isinstance(no, ast.Assign) and isinstance(no.value, ast.Call) and isinstance(no.value.func, ast.Attribute)
+            and no.value.func.attr == "tabs" and isinstance(no.targets[0], ast.Tuple)):
+        rotulos = [ast.literal_eval(elt) for elt in no.value.args[0].elts]
+        return dict(zip((alvo.id for alvo in no.targets[0].elts), rotulos))
+    return {}
+
+
+def extrair_secoes(script):
+    """Seções [{"rotulo", "blocos"}] do script: a primeira sem rótulo, depois uma por aba."""
+    modulo = ast.parse(Path(script).read_text(encoding="utf-8"))
+    funcoes = {no.name: no for no in modulo.body if isinstance(no, ast.FunctionDef)}
+    abas = {}
+    secoes = [{"rotulo": None, "blocos": []}]
+
+    def percorrer(corpo, blocos):
+        for no in corpo:
+            bloco, ancora = _bloco_literal(no), _ancora(no)
+            abas.update(_abas(no))
+            if bloco is not None:
+                blocos.append(bloco)
+            elif ancora is not None:
+                # Textos fixos do início do fragmento vêm antes dos controles
+                funcao = funcoes.get(no.value.func.id) if isinstance(no, ast.Expr) else None
+                for interno in funcao.body if funcao else ():
+                    interno_bloco = _bloco_literal(interno)
+                    if interno_bloco is not None:
+                        blocos.append(interno_bloco)
+                    elif not _perfil(interno):
+                        break
+                blocos.append({"tipo": "interativo", "id": ancora})
+            elif isinstance(no, ast.With) and isinstance(no.items[0].context_expr, ast.Name):
+                nome = no.items[0].context_expr.id
+                if nome in abas:
+                    secoes.append({"rotulo": abas[nome], "blocos": []})
+                    percorrer(no.body, secoes[-1]["blocos"])
+
+    percorrer(modulo.body, secoes[0]["blocos"])
+    return [secao for secao in secoes if secao["blocos"] or secao["rotulo"]]
+
+
+# --- Estados pré-calculados ---
+
+def estados_divisoes(conteudo, matriz):
+    """Specs Vega-Lite de cada fase; modelos e contribuições para os gráficos de lesões."""
+    graficos = GraficosDivisoes(conteudo, matriz)
+    movimento = {
+        "fases": list(conteudo.fases),
+        "graficos": {fase: graficos.fase(fase) for fase in conteudo.fases},
+        "detalhes": {fase: {"desc_geral": info.desc_geral, "detalhes": list(info.detalhes)}
+                     for fase, info in conteudo.fases.items()},
+    }
+    lesoes = {
+        "lesoes": list(conteudo.lesoes),
+        "normal": next(nome for nome, lesao in conteudo.lesoes.items() if not lesao.contrib_modificada),
+        "textos": {nome: {"sintomas": list(lesao.sintomas), "impacto_fases": lesao.impacto_fases}
+                   for nome, lesao in conteudo.lesoes.items()},
+        "combinaveis": list(matriz.lesoes),
+        "severidades": list(matriz.severidades),
+        "fases": list(matriz.fases),
+        "divisoes": list(matriz.divisoes),
+        "fase_padrao": conteudo.fase_exemplo_lesao,
+        "contrib_normal": matriz.normal.tolist(),
+        # Residual de cada lesão por divisão; null = divisão preservada
+        "contrib_residual": [[None if np.isinf(r) else float(r) for r in linha] for linha in matriz.residual],
+        "cores": dict(conteudo.cores),
+        "cor_lesionada": conteudo.cor_lesionada,
+        "modelos": {tipo: graficos.modelos[tipo] for tipo in ("impacto", "impacto_fase")},
+    }
+    return movimento, lesoes
+
+
+def grafico_tensao():
+    """Spec do traço de voltagem com dados nomeados ("tensao"), preenchidos no navegador."""
+    import altair as alt
+
+    return alt.Chart(alt.Data(name="tensao")).mark_line().encode(
+        x=alt.X("Tempo (ms):Q"), y=alt.Y("Potencial de Membrana (mV):Q"),
+    ).properties(height=300, width="container").to_dict()
+
+
+def grade_circuito(passo=PASSO_GRADE):
+    """Taxas do `modelo_ncp` e trem de picos em cada ponto da grade FM × FT × CP (ordem C)."""
+    eixo = np.round(np.arange(0.0, 10.0 + passo / 2, passo), 6)
+    resposta = ncp_rate_grid(eixo, eixo, eixo)
+    taxas = resposta.final_rate_hz.ravel()
+    picos = [
+        poisson_spike_times(float(taxa), DURACAO_MS, rng=philox_rng(SEMENTE, STREAM_SPIKE_TRAIN),
+                            refractory_ms=REFRATARIO_MS, resolution_ms=RESOLUCAO_MS).astype(int).tolist()
+        for taxa in taxas
+    ]
+    arredondar = lambda valores: np.round(np.ravel(valores), 2).tolist()  # noqa: E731
+    return {
+        "eixo": eixo.tolist(),
+        "padrao": CIRCUITO_PADRAO,
+        "basal_hz": DEFAULT_PARAMS.baseline_hz,
+        "duracao_ms": DURACAO_MS,
+        "repouso_mv": RESTING_POTENTIAL_MV,
+        "pico_mv": SPIKE_PEAK_MV,
+        "excitacao_hz": arredondar(resposta.total_direct_excitation),
+        "inibicao_hz": arredondar(resposta.effective_pc_inhibition),
+        "taxa_hz": arredondar(taxas),
+        "picos_ms": picos,
+        "grafico_tensao": grafico_tensao(),
+    }
+
+
+def _diagramas(usados, saida):
+    resultado = {}
+    for nome in usados:
+        svg = get_svg(DIAGRAMAS[nome])
+        if svg is None:
+            resultado[nome] = {"dot": DIAGRAMAS[nome]}
+        else:
+            caminho = saida / "diagramas" / f"{nome}.svg"
+            caminho.parent.mkdir(parents=True, exist_ok=True)
+            caminho.write_text(svg, encoding="utf-8")
+            resultado[nome] = {"svg": caminho.relative_to(saida).as_posix()}
+    return resultado
+
+
+def _gravar_json(caminho, dados):
+    caminho.write_text(json.dumps(dados, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    return caminho.stat().st_size
+
+
+def build(saida=DEFAULT_OUTPUT):
+    """Gera o pacote estático em `saida`; devolve {arquivo: bytes}."""
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    conteudo, matriz = carregar_conteudo(), carregar_matriz_impacto()
+
+    apps = [{"id": app, "secoes": extrair_secoes(script)} for app, script in APPS.items()]
+    usados = sorted({bloco["nome"] for app in apps for secao in app["secoes"]
+                     for bloco in secao["blocos"] if bloco["tipo"] == "diagrama"})
+    movimento, lesoes = estados_divisoes(conteudo, matriz)
+    pacote = {"versao": conteudo.versao, "apps": apps, "diagramas": _diagramas(usados, saida),
+              "movimento": movimento, "lesoes": lesoes}
+
+    tamanhos = {
+        "pacote.json": _gravar_json(saida / "pacote.json", pacote),
+        "circuito.json": _gravar_json(saida / "circuito.json", grade_circuito()),
+    }
+    (saida / "index.html").write_text(INDEX_HTML, encoding="utf-8")
+    tamanhos["index.html"] = (saida / "index.html").stat().st_size
+    return tamanhos
+
+
+# --- Página ---
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Cerebelo: Divisões Funcionais e Circuito</title>
+<script src="https://cdn.jsdelivr.net/npm/vega@6"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-lite@6"></script>
+<script src="https://cdn.jsdelivr.net/npm/vega-embed@7"></script>
+<script src="https://cdn.jsdelivr.net/npm/marked@12/marked.min.js"></script>
+<script src="https://cdn.jsdelivr.net/npm/@viz-js/viz@3/lib/viz-standalone.js"></script>
+<style>
+  body { font-family: "Source Sans Pro", Helvetica, Arial, sans-serif; margin: 0 auto; max-width: 1100px;
+         padding: 1rem 2rem; color: #31333f; }
+  nav button { font-size: 1rem; padding: .4rem .9rem; margin: 0 .3rem .3rem 0; border: 1px solid #ccc;
+               background: #fff; border-radius: .5rem; cursor: pointer; }
+  nav button.ativo { border-color: #ff4b4b; color: #ff4b4b; }
+  nav.abas { border-bottom: 1px solid #ddd; margin: 1rem 0; }
+  .legenda { color: #808495; font-size: .9rem; }
+  .sucesso { background: #dff5e3; padding: .8rem 1rem; border-radius: .5rem; }
+  .controle { margin: .8rem 0; }
+  .controle label { display: block; font-size: .9rem; margin-bottom: .2rem; }
+  .metricas { display: flex; gap: 2rem; flex-wrap: wrap; margin: 1rem 0; }
+  .metrica span { display: block; font-size: .85rem; color: #808495; }
+  .metrica strong { font-size: 1.6rem; font-weight: 400; }
+  .grafico { width: 100%; }
+  img.diagrama, .diagrama svg { max-width: 100%; height: auto; }
+</style>
+</head>
+<body>
+<nav id="apps"></nav>
+<main id="conteudo">Carregando...</main>
+<script>
+const OPCOES_VEGA = { actions: false, renderer: "svg" };
+let PACOTE, CIRCUITO;
+
+function el(tag, propriedades = {}, filhos = []) {
+  const no = Object.assign(document.createElement(tag), propriedades);
+  for (const filho of [].concat(filhos)) no.append(filho);
+  return no;
+}
+const md = (texto) => el("div", { innerHTML: marked.parse(texto) });
+const grafico = () => el("div", { className: "grafico" });
+
+function controle(rotulo, entrada) {
+  return el("div", { className: "controle" }, [el("label", { textContent: rotulo }), entrada]);
+}
+function selecao(opcoes, valor, formatar = (x) => x) {
+  const sel = el("select");
+  opcoes.forEach((opcao, i) => sel.append(el("option", { value: i, textContent: formatar(opcao) })));
+  sel.value = Math.max(0, opcoes.indexOf(valor));
+  return sel;
+}
+
+function bloco(b) {
+  switch (b.tipo) {
+    case "titulo": return el("h1", { textContent: b.texto });
+    case "cabecalho": return el("h2", { textContent: b.texto });
+    case "subcabecalho": return el("h3", { textContent: b.texto });
+    case "markdown": return md(b.texto);
+    case "legenda": return el("div", { className: "legenda", innerHTML: marked.parse(b.texto) });
+    case "diagrama": return diagrama(PACOTE.diagramas[b.nome]);
+    case "interativo": return INTERATIVOS[b.id]();
+  }
+}
+
+function preencher(modelo, valores, titulo) {
+  return { ...modelo, title: titulo, layer: modelo.layer.map((camada) => ({ ...camada, data: { values: valores } })) };
+}
+
+// Mesma conta de `impacto_lesoes.MatrizImpacto.valores_heatmap`
+function linhasImpacto(l, marcadas, gravidade) {
+  const indices = marcadas.map((nome) => l.combinaveis.indexOf(nome));
+  return l.fases.flatMap((fase, i) => l.divisoes.map((divisao, j) => {
+    const residuais = indices.map((k) => l.contrib_residual[k][j]).filter((r) => r !== null);
+    const normal = l.contrib_normal[i][j], lesionada = residuais.length > 0;
+    const contrib = normal + gravidade * (lesionada ? Math.min(...residuais) - normal : 0.0);
+    return { "Fase": fase, "Divisão": divisao, "Contribuição": contrib, "Normal": normal,
+             "Perda": normal - contrib, "Lesionada": lesionada };
+  }));
+}
+
+function diagrama(d) {
+  if (d.svg) return el("img", { className: "diagrama", src: d.svg });
+  const destino = el("div", { className: "diagrama" });
+  Viz.instance().then((viz) => destino.append(viz.renderSVGElement(d.dot)));
+  return destino;
+}
+
+const INTERATIVOS = {
+  movimento() {
+    const m = PACOTE.movimento;
+    const deslizante = el("input", { type: "range", min: 0, max: m.fases.length - 1, value: 0 });
+    const rotulo = el("strong"), alvo = grafico(), detalhes = el("div");
+    function mostrar() {
+      const fase = m.fases[deslizante.value], d = m.detalhes[fase];
+      rotulo.textContent = fase;
+      vegaEmbed(alvo, m.graficos[fase], OPCOES_VEGA);
+      detalhes.replaceChildren(
+        md(`#### Detalhes da Fase: ${fase}\\n\\n**Visão Geral:** ${d.desc_geral}\\n\\n`
+           + d.detalhes.map((x) => `- ${x}`).join("\\n")),
+        el("div", { className: "legenda", textContent: "Este gráfico é uma representação esquemática da "
+                    + "intensidade relativa da contribuição de cada divisão." }));
+    }
+    deslizante.addEventListener("input", mostrar);
+    mostrar();
+    return el("div", {}, [controle("Selecione a Fase do Movimento:", el("div", {}, [deslizante, " ", rotulo])),
+                          alvo, detalhes]);
+  },
+
+  lesoes() {
+    const l = PACOTE.lesoes;
+    const escolha = selecao(l.lesoes, l.lesoes[0]);
+    const caixas = l.combinaveis.map((nome) => el("input", { type: "checkbox", value: nome }));
+    const severidade = selecao(l.severidades, l.severidades[l.severidades.length - 1],
+                               (s) => `${Math.round(s * 100)}%`);
+    const fase = selecao(l.fases, l.fase_padrao);
+    const sintomas = el("div"), titulo = el("div"), mapa = grafico(), barras = grafico();
+    const legenda = el("div", { className: "legenda" }), impacto = el("div");
+
+    function mostrarLesao() {
+      const nome = l.lesoes[escolha.value], texto = l.textos[nome];
+      caixas.forEach((caixa) => { caixa.checked = caixa.value === nome; });
+      sintomas.replaceChildren(md(`### Sintomatologia Principal da Lesão no **${nome}**`),
+        nome === l.normal ? el("div", { className: "sucesso", innerHTML: marked.parse(texto.sintomas[0]) })
+                          : md(texto.sintomas.map((s) => `- ${s}`).join("\\n")),
+        el("hr"));
+      titulo.replaceChildren(md(`### Impacto Funcional da Lesão no **${nome}**`));
+      impacto.replaceChildren(md("#### Impacto nas Etapas do Movimento (Resumido):"), md(texto.impacto_fases));
+      mostrarImpacto();
+    }
+    function mostrarImpacto() {
+      const marcadas = caixas.filter((c) => c.checked).map((c) => c.value);
+      const gravidade = l.severidades[severidade.value], nomeFase = l.fases[fase.value];
+      const descricao = marcadas.length ? marcadas.join(" + ") : "nenhuma divisão";
+      const percentual = `${Math.round(gravidade * 100)}%`;
+      const linhas = linhasImpacto(l, marcadas, gravidade);
+      vegaEmbed(mapa, preencher(l.modelos.impacto, linhas,
+        `Contribuição por Fase e Divisão com Lesão em: ${descricao} (${percentual})`), OPCOES_VEGA);
+      const linhasFase = linhas.filter((linha) => linha["Fase"] === nomeFase).map((linha) => (
+        { ...linha, cor_barra: linha["Lesionada"] ? l.cor_lesionada : l.cores[linha["Divisão"]] }));
+      vegaEmbed(barras, preencher(l.modelos.impacto_fase, linhasFase,
+        `Contribuição Relativa Simulada na Fase de ${nomeFase} com Lesão em: ${descricao}`), OPCOES_VEGA);
+      legenda.innerHTML = marked.parse(`O mapa mostra, para todas as fases, como a contribuição das divisões `
+        + `seria afetada com lesão em **${descricao}** (gravidade ${percentual}); o gráfico de barras `
+        + `detalha a fase de **${nomeFase}**. A área cinza representa a função comprometida.`);
+    }
+    escolha.addEventListener("change", mostrarLesao);
+    [severidade, fase, ...caixas].forEach((c) => c.addEventListener("change", mostrarImpacto));
+    mostrarLesao();
+    return el("div", {}, [
+      controle("Selecione a Área Cerebelar Lesada para Simulação:", escolha), sintomas, titulo,
+      controle("Divisões lesionadas (combine para lesões extensas):",
+               el("div", {}, caixas.map((c) => el("label", {}, [c, ` ${c.value} `])))),
+      controle("Gravidade da lesão:", severidade), mapa,
+      controle("Fase em destaque:", fase), barras, legenda, impacto,
+    ]);
+  },
+
+  circuito() {
+    const c = CIRCUITO, n = c.eixo.length, passo = c.eixo[1] - c.eixo[0];
+    const deslizante = (valor) => el("input", { type: "range", min: 0, max: n - 1,
+                                               value: Math.round(valor / passo) });
+    const fm = deslizante(c.padrao.fm), ft = deslizante(c.padrao.ft), pc = deslizante(c.padrao.pc);
+    const rotulos = [fm, ft, pc].map(() => el("strong"));
+    const metricas = el("div", { className: "metricas" }), status = el("div"), alvo = grafico();
+    const metrica = (rotulo, valor) => el("div", { className: "metrica" },
+                                          [el("span", { textContent: rotulo }), el("strong", { textContent: valor })]);
+    let vista = null;
+
+    function mostrar() {
+      const i = (Number(fm.value) * n + Number(ft.value)) * n + Number(pc.value);
+      [fm, ft, pc].forEach((d, k) => { rotulos[k].textContent = c.eixo[d.value].toFixed(1); });
+      const taxa = c.taxa_hz[i];
+      metricas.replaceChildren(
+        metrica("Excitação Direta Total nos NCP", `${c.excitacao_hz[i].toFixed(1)} Hz`),
+        metrica("Inibição Efetiva da CP nos NCP", `${c.inibicao_hz[i].toFixed(1)} Hz (redução)`),
+        metrica("Taxa de Disparo Final Estimada (NCP)", `${taxa.toFixed(1)} Hz`),
+        metrica("vs Basal", `${(taxa - c.basal_hz).toFixed(1)} Hz`));
+      status.textContent = taxa === 0 ? "Os Núcleos Cerebelares Profundos estão silenciados."
+                                      : `Frequência de disparos nos NCP: ${taxa.toFixed(1)} Hz.`;
+      const picos = new Set(c.picos_ms[i]);
+      const valores = Array.from({ length: c.duracao_ms }, (_, t) => ({
+        "Tempo (ms)": t, "Potencial de Membrana (mV)": picos.has(t) ? c.pico_mv : c.repouso_mv }));
+      if (vista) vista.data("tensao", valores).runAsync();
+    }
+    [fm, ft, pc].forEach((d) => d.addEventListener("input", mostrar));
+    vegaEmbed(alvo, c.grafico_tensao, OPCOES_VEGA).then((r) => { vista = r.view; mostrar(); });
+    mostrar();
+    return el("div", {}, [
+      controle("⚡ Fibras Musgosas (FM)", el("div", {}, [fm, " ", rotulos[0]])),
+      controle("🌋 Fibras Trepadeiras (FT)", el("div", {}, [ft, " ", rotulos[1]])),
+      controle("🛡️ Inibição da CP sobre os NCP", el("div", {}, [pc, " ", rotulos[2]])),
+      metricas, el("h3", { textContent: "📈 Potenciais de Ação dos NCP (Esquemático)" }), alvo, status,
+      el("div", { className: "legenda", textContent: `Versão estática: controles em passos de ${passo}, `
+        + `${c.duracao_ms} ms simulados com a semente padrão do app.` }),
+    ]);
+  },
+};
+
+function mostrarApp(app) {
+  document.querySelectorAll("#apps button").forEach((b) => b.classList.toggle("ativo", b.dataset.id === app.id));
+  const [inicio, ...abas] = app.secoes;
+  const corpo = el("div");
+  const navAbas = el("nav", { className: "abas" });
+  abas.forEach((secao, i) => {
+    const botao = el("button", { textContent: secao.rotulo });
+    botao.addEventListener("click", () => {
+      navAbas.querySelectorAll("button").forEach((b) => b.classList.toggle("ativo", b === botao));
+      corpo.replaceChildren(...secao.blocos.map(bloco));
+    });
+    navAbas.append(botao);
+    if (i === 0) botao.click();
+  });
+  if (!abas.length) corpo.replaceChildren();
+  document.getElementById("conteudo").replaceChildren(
+    ...inicio.blocos.map(bloco), ...(abas.length ? [navAbas] : []), corpo);
+}
+
+Promise.all([fetch("pacote.json").then((r) => r.json()), fetch("circuito.json").then((r) => r.json())])
+  .then(([pacote, circuito]) => {
+    PACOTE = pacote; CIRCUITO = circuito;
+    const rotulos = { divisoes: "🧠 Divisões Funcionais", circuito: "🔬 Circuito Cerebelar" };
+    for (const app of PACOTE.apps) {
+      const botao = el("button", { textContent: rotulos[app.id] || app.id });
+      botao.dataset.id = app.id;
+      botao.addEventListener("click", () => mostrarApp(app));
+      document.getElementById("apps").append(botao);
+    }
+    mostrarApp(PACOTE.apps[0]);
+  });
+</script>
+</body>
+</html>
+"""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera a versão estática (HTML + JSON) dos apps.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Diretório de saída.")
+    args = parser.parse_args(argv)
+    inicio = time.perf_counter()
+    tamanhos = build(args.output)
+    for arquivo, n_bytes in tamanhos.items():
+        print(f"{arquivo}: {n_bytes / 1024:.0f} KiB")
+    print(f"Pacote estático em {args.output} ({time.perf_counter() - inicio:.1f} s). "
+          f"Sirva com, p.ex.: python -m http.server -d {args.output}")
+
+
+if __name__ == "__main__":
+    main()
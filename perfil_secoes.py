@@ -0,0 +1,163 @@
+"""Tempo de execução por seção dos apps, com painel oculto e exportação Prometheus.
+
+Cada app marca o início das suas seções com `timer.lap("nome")` e encerra o
+rerun com `timer.finish()`; a seção corrente vai até a próxima marca, então
+o script não precisa ser reindentado em blocos `with`. As amostras ficam num
+registro do processo (janela móvel por seção) que alimenta o painel da barra
+lateral (último, p50, p95) e o arquivo de métricas no formato texto do
+Prometheus, reescrito de forma atômica a cada rerun para o "textfile
+collector" do node_exporter.
+
+O perfil é ligado pelo parâmetro de URL `?perfil=1` ou pela variável
+`CEREBELO_PROFILE=1`. Desligado, `start_profile` devolve um cronômetro nulo
+cujos métodos não fazem nada: o custo por seção é uma chamada de método vazia.
+"""
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+METRICS_PATH = Path(os.environ.get("CEREBELO_METRICS_FILE", Path(".cache") / "metricas" / "cerebelo.prom"))
+PROFILE_ALWAYS_ON = os.environ.get("CEREBELO_PROFILE", "") == "1"
+QUERY_PARAM = "perfil"
+DEFAULT_WINDOW = 200             # Amostras por seção usadas em p50/p95
+METRIC_NAME = "cerebelo_section_seconds"
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SectionProfiler:
+    """Registro thread-safe das durações por (app, seção), compartilhado pelas sessões."""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}   # (app, seção) -> deque com as últimas durações (s)
+        self._totals = {}    # (app, seção) -> [contagem, soma]
+
+    def record(self, app, section, seconds):
+        key = (app, section)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+                self._totals[key] = [0, 0.0]
+            samples.append(seconds)
+            totals = self._totals[key]
+            totals[0] += 1
+            totals[1] += seconds
+
+    def summary(self, app=None):
+        """Linhas (na ordem de primeira ocorrência) com último valor, p50, p95 e contagem."""
+        with self._lock:
+            items = [(key, np.array(samples), *self._totals[key]) for key, samples in self._samples.items()
+                     if app is None or key[0] == app]
+        rows = []
+        for (app_name, section), samples, count, total in items:
+            p50, p95 = np.percentile(samples, [50, 95])
+            rows.append({
+                "app": app_name, "section": section, "last_s": float(samples[-1]),
+                "p50_s": float(p50), "p95_s": float(p95), "count": count, "sum_s": total,
+            })
+        return rows
+
+    def to_prometheus(self):
+        lines = [
+            f"# HELP {METRIC_NAME} Tempo de execução por seção do app (janela de {self.window} reruns).",
+            f"# TYPE {METRIC_NAME} summary",
+        ]
+        for row in self.summary():
+            labels = f'app="{_label(row["app"])}",section="{_label(row["section"])}"'
+            lines.append(f'{METRIC_NAME}{{{labels},quantile="0.5"}} {row["p50_s"]:.6g}')
+            lines.append(f'{METRIC_NAME}{{{labels},quantile="0.95"}} {row["p95_s"]:.6g}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {row['sum_s']:.6g}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path=METRICS_PATH):
+        # Escrita atômica: o coletor nunca lê um arquivo pela metade
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+PROFILER = SectionProfiler()
+
+
+class SectionTimer:
+    """Cronômetro de um rerun: cada `lap` fecha a seção anterior e abre a próxima."""
+
+    __slots__ = ("app", "profiler", "_section", "_start")
+
+    def __init__(self, app, profiler=PROFILER):
+        self.app = app
+        self.profiler = profiler
+        self._section = None
+        self._start = 0.0
+
+    def lap(self, section):
+        now = time.perf_counter()
+        if self._section is not None:
+            self.profiler.record(self.app, self._section, now - self._start)
+        self._section, self._start = section, now
+
+    def finish(self, path=METRICS_PATH):
+        self.lap(None)
+        self.profiler.write_prometheus(path)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def lap(self, section):
+        pass
+
+    def finish(self, path=None):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def profiling_enabled():
+    import streamlit as st
+
+    return PROFILE_ALWAYS_ON or st.query_params.get(QUERY_PARAM) == "1"
+
+
+def start_profile(app):
+    """Cronômetro do rerun atual, ou o cronômetro nulo com o perfil desligado."""
+    return SectionTimer(app) if profiling_enabled() else _NULL_TIMER
+
+
+def render_panel(app, profiler=PROFILER):
+    """Painel de desenvolvimento na barra lateral (só aparece com o perfil ligado)."""
+    if not profiling_enabled():
+        return
+    import streamlit as st
+
+    # Tabela em markdown: st.dataframe importaria o pandas só para o painel
+    table = ["| Seção | Último (ms) | p50 (ms) | p95 (ms) | Reruns |", "|:--|--:|--:|--:|--:|"]
+    table += [
+        f"| {r['section']} | {r['last_s'] * 1000:.1f} | {r['p50_s'] * 1000:.1f} "
+        f"| {r['p95_s'] * 1000:.1f} | {r['count']} |"
+        for r in profiler.summary(app)
+    ]
+    with st.sidebar.expander("🛠️ Perfil por seção (dev)", expanded=True):
+        st.markdown("\n".join(table))
+        st.caption(f"p50/p95 das últimas {profiler.window} execuções de cada seção. "
+                   f"Métricas Prometheus em `{METRICS_PATH}`.")
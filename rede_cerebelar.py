@@ -0,0 +1,206 @@
+"""Microcircuito cerebelar com conectividade esparsa (FM→GC→FP→CP→NCP).
+
+Populações: fibras musgosas (FM) e trepadeiras (FT) como fontes de Poisson;
+células granulares (GC), células de Purkinje (CP) e neurônios dos NCP como
+unidades integra-e-dispara. Toda a conectividade fica numa única matriz CSR
+indexada pelo neurônio pré-sináptico (isto é, W transposta), de modo que o
+produto W·s de cada passo percorre apenas as linhas dos neurônios que
+dispararam. Usa somente NumPy; uma implementação densa (~50k × 50k) não
+caberia no orçamento de ~1 s por rerun.
+
+O custo cresce com a duração (~1,35 s por segundo simulado com 50 000 GC),
+por isso `simulate_network` aceita no máximo `MAX_DURATION_MS`: mesmo com as
+maiores populações do app, um rerun fica perto do orçamento.
+"""
+import time
+from dataclasses import dataclass
+from typing import NamedTuple
+
+import numpy as np
+
+# --- Mapeamento dos controles do app para taxas de entrada ---
+MF_HZ_PER_UNIT = 8.0     # FM: 0-10 → 0-80 Hz
+CF_HZ_PER_UNIT = 0.5     # FT: 0-10 → 0-5 Hz (fibras trepadeiras disparam pouco)
+MAX_DURATION_MS = 1000.0 # ~1,5-1,7 s de simulação com 50 000 GC e 100-500 CP
+
+
+@dataclass(frozen=True)
+class NetworkConfig:
+    n_mf: int = 1000
+    n_gc: int = 50_000
+    n_pc: int = 100
+    n_ncp: int = 20
+    mf_per_gc: int = 4          # Cada GC recebe ~4 rosetas de FM
+    pf_per_pc: int = 2000       # Fibras paralelas amostradas por CP
+    pc_per_ncp: int = 20
+    mf_per_ncp: int = 50        # Colaterais de FM nos NCP
+    cf_per_ncp: int = 5         # Colaterais de FT nos NCP
+    # Pesos sinápticos (mV por pico pré-sináptico)
+    w_mf_gc: float = 4.0
+    w_pf_pc: float = 0.08
+    w_cf_pc: float = 25.0
+    w_mf_ncp: float = 0.6
+    w_cf_ncp: float = 3.0
+    w_pc_ncp_max: float = 1.5   # Inibição máxima (escala da CP = 10)
+    dt_ms: float = 0.5
+    seed: int = 0
+
+
+class CSRMatrix(NamedTuple):
+    """Matriz esparsa CSR mínima (linhas = neurônios pré-sinápticos)."""
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    shape: tuple
+
+    @classmethod
+    def from_coo(cls, rows, cols, data, shape):
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(shape[0] + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=shape[0]), out=indptr[1:])
+        return cls(indptr, cols[order].astype(np.int32), data[order].astype(np.float32), shape)
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def spike_matvec(self, active, data=None):
+        """Produto W·s para um vetor de picos binário dado pelos índices ativos."""
+        data = self.data if data is None else data
+        starts = self.indptr[active]
+        counts = self.indptr[active + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.zeros(self.shape[1], dtype=np.float32)
+        offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        return np.bincount(self.indices[offsets], weights=data[offsets], minlength=self.shape[1])
+
+
+@dataclass(frozen=True)
+class _PopulationParams:
+    tau_ms: float
+    threshold_mv: float
+    reset_mv: float
+    bias_mv: float
+    refractory_ms: float
+
+
+# Parâmetros (potencial relativo ao repouso) de cada população integra-e-dispara
+GC_PARAMS = _PopulationParams(tau_ms=5.0, threshold_mv=10.0, reset_mv=0.0, bias_mv=0.0, refractory_ms=2.0)
+PC_PARAMS = _PopulationParams(tau_ms=10.0, threshold_mv=15.0, reset_mv=0.0, bias_mv=16.0, refractory_ms=5.0)
+NCP_PARAMS = _PopulationParams(tau_ms=20.0, threshold_mv=15.0, reset_mv=5.0, bias_mv=15.5, refractory_ms=2.0)
+
+
+class CerebellarNetwork:
+    """Conectividade e parâmetros fixos de uma rede; independente dos controles do app."""
+
+    def __init__(self, config=NetworkConfig()):
+        self.config = c = config
+        rng = np.random.default_rng(c.seed)
+
+        # Espaço pós-sináptico: [GC | CP | NCP]; espaço pré-sináptico: [FM | FT | GC | CP]
+        self.n_post = c.n_gc + c.n_pc + c.n_ncp
+        self.pc_start, self.ncp_start = c.n_gc, c.n_gc + c.n_pc
+        self.cf_pre, self.gc_pre = c.n_mf, c.n_mf + c.n_pc
+        self.pc_pre = self.gc_pre + c.n_gc
+        n_pre = self.pc_pre + c.n_pc
+
+        def block(pre_offset, pre_choice, post_offset, weight):
+            n_post_block, fan_in = pre_choice.shape
+            post = post_offset + np.repeat(np.arange(n_post_block), fan_in)
+            return pre_offset + pre_choice.ravel(), post, np.full(post.size, weight)
+
+        blocks = [
+            block(0, rng.integers(0, c.n_mf, (c.n_gc, c.mf_per_gc)), 0, c.w_mf_gc),
+            block(self.gc_pre, rng.integers(0, c.n_gc, (c.n_pc, c.pf_per_pc)), self.pc_start, c.w_pf_pc),
+            block(self.cf_pre, np.arange(c.n_pc)[:, None], self.pc_start, c.w_cf_pc),
+            block(0, rng.integers(0, c.n_mf, (c.n_ncp, c.mf_per_ncp)), self.ncp_start, c.w_mf_ncp),
+            block(self.cf_pre, rng.integers(0, c.n_pc, (c.n_ncp, c.cf_per_ncp)), self.ncp_start, c.w_cf_ncp),
+            block(self.pc_pre, rng.integers(0, c.n_pc, (c.n_ncp, c.pc_per_ncp)), self.ncp_start,
+                  -c.w_pc_ncp_max),
+        ]
+        rows, cols, data = (np.concatenate(parts) for parts in zip(*blocks))
+        self.weights = CSRMatrix.from_coo(rows, cols, data, (n_pre, self.n_post))
+        # Fatia contígua de `data` com as sinapses CP→NCP (escalada a cada simulação)
+        self.pc_slice = slice(int(self.weights.indptr[self.pc_pre]), int(self.weights.indptr[n_pre]))
+
+        sizes = (c.n_gc, c.n_pc, c.n_ncp)
+        pops = (GC_PARAMS, PC_PARAMS, NCP_PARAMS)
+        per_unit = lambda f: np.repeat([f(p) for p in pops], sizes).astype(np.float32)
+        self.decay = per_unit(lambda p: np.exp(-c.dt_ms / p.tau_ms))
+        self.drive = per_unit(lambda p: (1.0 - np.exp(-c.dt_ms / p.tau_ms)) * p.bias_mv)
+        self.threshold = per_unit(lambda p: p.threshold_mv)
+        self.reset = per_unit(lambda p: p.reset_mv)
+        self.refractory_steps = np.repeat(
+            [max(1, int(round(p.refractory_ms / c.dt_ms))) for p in pops], sizes
+        ).astype(np.int16)
+
+
+@dataclass
+class NetworkResult:
+    time_ms: np.ndarray
+    gc_rate_hz: np.ndarray
+    pc_rate_hz: np.ndarray
+    ncp_rate_hz: np.ndarray
+    elapsed_s: float
+    nnz: int
+
+    def mean_rates(self):
+        return {name: float(getattr(self, f"{name}_rate_hz").mean()) for name in ("gc", "pc", "ncp")}
+
+
+def simulate_network(network, fm_strength, ft_strength, pc_inhibition_scale, duration_ms,
+                     rng=None, rate_bin_ms=5.0):
+    """Simula a rede com os controles do app; uma multiplicação esparsa por passo."""
+    if not 0 < duration_ms <= MAX_DURATION_MS:
+        raise ValueError(f"duration_ms deve estar entre 0 e {MAX_DURATION_MS:.0f} ms (recebido {duration_ms}).")
+    c = network.config
+    rng = np.random.default_rng() if rng is None else rng
+    dt = c.dt_ms
+    n_steps = int(round(duration_ms / dt))
+    steps_per_bin = max(1, int(round(rate_bin_ms / dt)))
+    n_bins = n_steps // steps_per_bin
+
+    data = network.weights.data.copy()
+    data[network.pc_slice] *= pc_inhibition_scale / 10.0
+    p_mf = fm_strength * MF_HZ_PER_UNIT * dt / 1000.0
+    p_cf = ft_strength * CF_HZ_PER_UNIT * dt / 1000.0
+
+    u = rng.uniform(0.0, 1.0, network.n_post).astype(np.float32) * network.threshold
+    refractory = np.zeros(network.n_post, dtype=np.int16)
+    in_refractory = np.empty(network.n_post, dtype=bool)
+    spiking = np.empty(network.n_post, dtype=bool)
+    fired = np.empty(0, dtype=np.int64)
+    counts = np.zeros((n_bins, 3), dtype=np.int64)
+    bounds = [0, network.pc_start, network.ncp_start, network.n_post]
+
+    start = time.perf_counter()
+    for step in range(n_steps):
+        # Picos pré-sinápticos: fontes de Poisson (FM, FT) + GC/CP do passo anterior
+        mf = np.flatnonzero(rng.random(c.n_mf) < p_mf)
+        cf = c.n_mf + np.flatnonzero(rng.random(c.n_pc) < p_cf)
+        local = fired[fired < network.ncp_start] + c.n_mf + c.n_pc
+        active = np.concatenate((mf, cf, local))
+
+        u *= network.decay
+        u += network.drive
+        u += network.weights.spike_matvec(active, data)
+        np.greater(refractory, 0, out=in_refractory)
+        u[in_refractory] = network.reset[in_refractory]
+        refractory[in_refractory] -= 1
+
+        np.greater_equal(u, network.threshold, out=spiking)
+        fired = np.flatnonzero(spiking)
+        u[fired] = network.reset[fired]
+        refractory[fired] = network.refractory_steps[fired]
+        if step // steps_per_bin < n_bins:
+            counts[step // steps_per_bin] += np.diff(np.searchsorted(fired, bounds))
+    elapsed = time.perf_counter() - start
+
+    bin_s = steps_per_bin * dt / 1000.0
+    rates = counts / (np.array([c.n_gc, c.n_pc, c.n_ncp]) * bin_s)
+    return NetworkResult(
+        time_ms=(np.arange(n_bins) + 0.5) * steps_per_bin * dt,
+        gc_rate_hz=rates[:, 0], pc_rate_hz=rates[:, 1], ncp_rate_hz=rates[:, 2],
+        elapsed_s=elapsed, nnz=network.weights.nnz,
+    )
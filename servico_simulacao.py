@@ -0,0 +1,254 @@
+"""Serviço de simulação fora do processo do Streamlit, com coalescência de pedidos.
+
+As simulações (trem de picos, lotes de ensaios Monte Carlo, população LIF,
+rede esparsa, lotes do modelo dinâmico de taxas) rodam num pool de
+processos: o script de cada sessão só espera pelo resultado, sem disputar o
+GIL com as demais sessões do servidor. Pedidos idênticos (mesma chave de
+`cache_simulacao.cache_key`) que chegam enquanto a primeira execução ainda
+está em andamento recebem o mesmo `Future`, ou seja, uma única computação.
+
+Arrays grandes voltam por memória compartilhada: o worker grava cada array
+num bloco `SharedMemory` e devolve só o descritor (nome, dtype, forma); o
+processo principal copia o bloco para a sua memória e o libera. Os
+resultados concluídos entram no `SimulationCache` compartilhado. Se um worker
+morre (ex.: falta de memória), os pedidos afetados falham com
+`BrokenProcessPool` e o pool é recriado para os seguintes.
+
+`CEREBELO_SIM_WORKERS` define o número de processos (padrão: número de CPUs);
+0 executa os jobs na própria thread que os submete.
+"""
+import dataclasses
+import os
+import sys
+import threading
+import types
+import weakref
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+from multiprocessing import get_context, shared_memory
+from typing import NamedTuple
+
+import numpy as np
+
+from cache_simulacao import STREAM_LIF_POPULATION, STREAM_NETWORK, STREAM_SPIKE_TRAIN, philox_rng
+from dinamica_taxas import simulate_rate_batch
+from ensaios_monte_carlo import simulate_trial_batch
+from populacao_lif import simulate_lif_population
+from rede_cerebelar import CerebellarNetwork, simulate_network
+from trem_de_picos import poisson_spike_times
+
+DEFAULT_WORKERS = int(os.environ.get("CEREBELO_SIM_WORKERS", os.cpu_count() or 1))
+SHM_MIN_BYTES = 64 * 1024        # Arrays menores voltam junto com o pickle do resultado
+
+_services = weakref.WeakSet()    # Serviços vivos no processo, para `shutdown_all`
+
+
+# --- Jobs (executados nos workers) ---
+
+@lru_cache(maxsize=4)
+def _network(config):
+    # Cada worker constrói a conectividade uma vez por configuração
+    return CerebellarNetwork(config)
+
+
+def _spike_train_job(rate_hz, duration_ms, seed, refractory_ms, resolution_ms):
+    return poisson_spike_times(rate_hz, duration_ms, rng=philox_rng(seed, STREAM_SPIKE_TRAIN),
+                               refractory_ms=refractory_ms, resolution_ms=resolution_ms)
+
+
+def _lif_population_job(n_neurons, excitation_hz, inhibition_hz, duration_ms, seed):
+    return simulate_lif_population(n_neurons, excitation_hz, inhibition_hz, duration_ms,
+                                   rng=philox_rng(seed, STREAM_LIF_POPULATION))
+
+
+def _network_job(config, fm_strength, ft_strength, pc_inhibition_scale, duration_ms, seed):
+    return simulate_network(_network(config), fm_strength, ft_strength, pc_inhibition_scale, duration_ms,
+                            rng=philox_rng(seed, STREAM_NETWORK))
+
+
+JOBS = {
+    "spike_train": _spike_train_job,
+    "monte_carlo_batch": simulate_trial_batch,
+    "lif_population": _lif_population_job,
+    "network": _network_job,
+    "rate_dynamics": simulate_rate_batch,
+}
+
+
+# --- Transporte de arrays por memória compartilhada ---
+
+class SharedArray(NamedTuple):
+    name: str
+    dtype: str
+    shape: tuple
+
+
+def _export(value):
+    """Troca arrays grandes por descritores de blocos de memória compartilhada (no worker)."""
+    if isinstance(value, np.ndarray) and value.nbytes >= SHM_MIN_BYTES:
+        block = shared_memory.SharedMemory(create=True, size=value.nbytes)
+        np.copyto(np.ndarray(value.shape, value.dtype, buffer=block.buf), value)
+        descriptor = SharedArray(block.name, value.dtype.str, value.shape)
+        block.close()
+        return descriptor
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{f.name: _export(getattr(value, f.name))
+                                             for f in dataclasses.fields(value) if f.init})
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(_export(v) for v in value)
+    return value
+
+
+def _import(value):
+    """Operação inversa de `_export`: copia e libera cada bloco (no processo principal)."""
+    if isinstance(value, SharedArray):
+        block = shared_memory.SharedMemory(name=value.name)
+        try:
+            return np.ndarray(value.shape, np.dtype(value.dtype), buffer=block.buf).copy()
+        finally:
+            block.close()
+            block.unlink()
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{f.name: _import(getattr(value, f.name))
+                                             for f in dataclasses.fields(value) if f.init})
+    if isinstance(value, tuple) and not hasattr(value, "_fields"):
+        return tuple(_import(v) for v in value)
+    return value
+
+
+def _run_job(kind, args):
+    return _export(JOBS[kind](*args))
+
+
+# --- Serviço ---
+
+@contextmanager
+def _bare_main():
+    # O Streamlit instala o script do app como `__main__`; com "spawn", cada worker
+    # reexecutaria o app inteiro ao iniciar. Enquanto os workers são criados, o
+    # `__main__` visível é um módulo vazio.
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class SimulationService:
+    """Pool de processos com coalescência de pedidos idênticos e cache de resultados."""
+
+    def __init__(self, cache=None, workers=DEFAULT_WORKERS):
+        self.cache = cache
+        self.workers = workers
+        self._pool = self._start_pool() if workers > 0 else None
+        self._pool_lock = threading.Lock()
+        self._in_flight = {}    # chave -> Future do resultado já importado
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.coalesced = 0
+        self.restarts = 0
+        _services.add(self)
+
+    def _start_pool(self):
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context("spawn"))
+        # O executor cria um worker por submissão até o máximo: todos nascem aqui
+        with _bare_main():
+            warmup = [pool.submit(os.getpid) for _ in range(self.workers)]
+        for future in warmup:
+            future.result()
+        return pool
+
+    def _replace_pool(self, broken):
+        """Troca um pool quebrado (ex.: worker morto por falta de memória) por um novo."""
+        with self._pool_lock:
+            if self._pool is not broken:
+                return          # Outro pedido já trocou este pool
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._start_pool()
+            self.restarts += 1
+
+    def submit(self, key, kind, *args):
+        """Future com o resultado de `JOBS[kind](*args)`; pedidos com a mesma chave compartilham o Future."""
+        if kind not in JOBS:
+            raise ValueError(f"Tipo de simulação desconhecido: {kind!r} (disponíveis: {sorted(JOBS)}).")
+        with self._lock:
+            # A consulta ao cache fica sob o mesmo lock que `_in_flight`: `_finish` grava
+            # no cache antes de retirar a chave, então um pedido nunca vê os dois vazios
+            cached = None if self.cache is None else self.cache.get(key)
+            if cached is not None:
+                future = Future()
+                future.set_result(cached)
+                return future
+            future = self._in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            future = self._in_flight[key] = Future()
+            self.submitted += 1
+
+        if self._pool is None:
+            try:
+                self._finish(key, future, JOBS[kind](*args), None)
+            except Exception as exc:  # noqa: BLE001 - repassada a quem espera pelo Future
+                self._finish(key, future, None, exc)
+            return future
+
+        pool = self._pool
+
+        def done(job):
+            try:
+                self._finish(key, future, _import(job.result()), None)
+            except Exception as exc:  # noqa: BLE001 - idem
+                if isinstance(exc, BrokenProcessPool):
+                    self._replace_pool(pool)
+                self._finish(key, future, None, exc)
+
+        # Com o pool quebrado (worker morto enquanto ocioso), `submit` falha na hora:
+        # uma nova tentativa num pool novo; se ainda falhar, o Future sai de
+        # `_in_flight` com a exceção, em vez de ficar pendente para os pedidos seguintes
+        try:
+            try:
+                job = pool.submit(_run_job, kind, args)
+            except BrokenProcessPool:
+                self._replace_pool(pool)
+                pool = self._pool
+                job = pool.submit(_run_job, kind, args)
+        except Exception as exc:  # noqa: BLE001 - idem
+            self._finish(key, future, None, exc)
+            return future
+        job.add_done_callback(done)
+        return future
+
+    def _finish(self, key, future, result, error):
+        if error is None and self.cache is not None:
+            result = self.cache.put(key, result)
+        with self._lock:
+            self._in_flight.pop(key, None)
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(error)
+
+    def stats(self):
+        with self._lock:
+            return {"workers": self.workers, "in_flight": len(self._in_flight),
+                    "submitted": self.submitted, "coalesced": self.coalesced, "restarts": self.restarts}
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+
+def shutdown_all():
+    """Encerra os pools de todos os serviços do processo.
+
+    Necessário antes de sair de um processo filho de `multiprocessing` (ex.: o
+    medidor de `desempenho_apps`): ao sair, ele espera pelos próprios filhos
+    antes de rodar o encerramento automático dos pools, e os workers ociosos
+    nunca terminariam.
+    """
+    for service in list(_services):
+        service.shutdown()
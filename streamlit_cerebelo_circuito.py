@@ -1,11 +1,120 @@
-import streamlit as st
-import pandas as pd
+import time
+from concurrent.futures import as_completed
+
 import numpy as np
+import streamlit as st
+
+from aprendizado_ltd import MAX_RUNS, MAX_TRIALS_PER_CALL, LearningConfig, LearningRun
+from cache_simulacao import STREAM_OSCILLOSCOPE, SimulationCache, cache_key, philox_rng
+from decimacao import DEFAULT_MAX_POINTS, decimate_columns, minmax_decimate, raster_limit, spike_trace_envelope
+from dinamica_taxas import DEFAULT_SWEEP_SCENARIOS, SOLVERS, WAVEFORM_KINDS, Waveform
+from diagramas import CIRCUIT_DIAGRAM_DETAILED, exibir_diagrama
+from ensaios_monte_carlo import DEFAULT_PSTH_BIN_MS, MAX_TRIALS, TrialAggregate, batch_ranges
+from estatisticas_picos import spike_train_stats
+from graficos_circuito import bar_chart_spec, line_chart_spec, scatter_chart_spec
+from modelo_ncp import NCPParams, ncp_response
+from osciloscopio import DEFAULT_HISTORY_MS, FRAME_INTERVAL_S, Oscilloscope
+from perfil_secoes import render_panel, start_profile
+from populacao_lif import DEFAULT_DT_MS, DEFAULT_RASTER_NEURONS, MAX_NEURONS, THROUGHPUT_TARGET_NEURON_STEPS_PER_S
+from rede_cerebelar import MAX_DURATION_MS as NETWORK_MAX_DURATION_MS, NetworkConfig
+from servico_simulacao import SimulationService
+from trem_de_picos import MIN_RESOLUTION_MS, RESTING_POTENTIAL_MV, SPIKE_PEAK_MV, voltage_trace
 
 # --- Configuração da Página ---
 st.set_page_config(page_title="Circuito Cerebelar Avançado", layout="wide")
+timer = start_profile("circuito")
+
+
+@st.cache_resource
+def simulation_cache():
+    # Uma única instância por processo, compartilhada por todas as sessões
+    return SimulationCache()
+
+
+@st.cache_resource
+def simulation_service():
+    # Pool de processos compartilhado; pedidos idênticos em andamento viram uma única simulação
+    return SimulationService(simulation_cache())
+
+
+@st.cache_resource(max_entries=MAX_RUNS)
+def learning_run(config):
+    # Um treino por configuração, compartilhado pelas sessões; continua do último checkpoint em disco
+    return LearningRun(config)
+
+
+def run_simulation(key, kind, *args):
+    """Resultado do job; enquanto ele está pendente, um aviso ocupa o lugar do gráfico."""
+    future = simulation_service().submit(key, kind, *args)
+    if future.done():
+        return future.result()
+    placeholder = st.empty()
+    placeholder.info("⏳ Simulação em andamento em um processo separado...")
+    result = future.result()
+    placeholder.empty()
+    return result
+
+
+def _formatar(valor, formato, unidade=""):
+    return "–" if not np.isfinite(valor) else format(valor, formato) + unidade
+
+
+def exibir_estatisticas(stats):
+    """Métricas e gráficos de ISI e autocorrelograma de um `SpikeTrainStats`."""
+    col_taxa, col_isi, col_cv, col_fano = st.columns(4)
+    col_taxa.metric("Taxa medida", _formatar(stats.rate_hz, '.1f', " Hz"))
+    col_isi.metric("ISI médio", _formatar(stats.isi_mean_ms, '.1f', " ms"))
+    col_cv.metric("CV do ISI", _formatar(stats.isi_cv, '.2f'),
+                  help="Desvio-padrão / média dos intervalos: 1 para Poisson, menor com período refratário.")
+    col_fano.metric(f"Fano ({stats.fano_window_ms:.0f} ms)", _formatar(stats.fano_factor, '.2f'),
+                    help="Variância / média das contagens de picos em janelas fixas: 1 para Poisson.")
+    col_hist, col_acg = st.columns(2)
+    col_hist.vega_lite_chart(bar_chart_spec({'ISI (ms)': stats.isi_centers_ms, 'Intervalos': stats.isi_hist},
+                                            'ISI (ms)', 'Intervalos', height=180), width="stretch")
+    col_acg.vega_lite_chart(line_chart_spec({'Defasagem (ms)': stats.lag_centers_ms,
+                                             'Taxa condicional (Hz)': stats.autocorrelogram_hz},
+                                            'Defasagem (ms)', height=180), width="stretch")
+
+
+def osciloscopio_quadro():
+    # Executado como fragmento: mover estes controles (ou o relógio do modo ao vivo)
+    # reexecuta só este trecho; a simulação continua de onde parou e a nova taxa
+    # vale a partir do próximo bloco
+    frame_timer = start_profile("circuito")
+    frame_timer.lap("Osciloscópio: bloco")
+    col_fm, col_ft, col_pc = st.columns(3)
+    live_fm = col_fm.slider("FM (osciloscópio)", 0.0, 10.0, fm_strength, 0.1, key="osc_fm")
+    live_ft = col_ft.slider("FT (osciloscópio)", 0.0, 10.0, ft_strength, 0.1, key="osc_ft")
+    live_pc = col_pc.slider("Inibição CP (osciloscópio)", 0.0, 10.0, pc_inhibition_scale, 0.1, key="osc_pc")
+    live_rate_hz = float(ncp_response(live_fm, live_ft, live_pc, MODEL_PARAMS).final_rate_hz)
+
+    config = (SEED, REFRACTORY_MS)
+    scope = st.session_state.get("osciloscopio")
+    if scope is None or st.session_state.get("osciloscopio_config") != config:
+        scope = st.session_state["osciloscopio"] = Oscilloscope(
+            philox_rng(SEED, STREAM_OSCILLOSCOPE), refractory_ms=REFRACTORY_MS)
+        st.session_state["osciloscopio_config"] = config
+    scope.step_realtime(live_rate_hz, time.monotonic())
+
+    frame_timer.lap("Osciloscópio: gráfico")
+    time_ms, voltage_mv = scope.buffer.view()
+    st.vega_lite_chart(line_chart_spec({'Tempo (s)': time_ms / 1000.0, 'Potencial de Membrana (mV)': voltage_mv},
+                                       'Tempo (s)', height=300), width="stretch")
+    st.caption(f"Taxa atual: {live_rate_hz:.1f} Hz · tempo simulado {scope.stream.t_ms / 1000:.1f} s · "
+               f"{scope.n_spikes} picos no total · histórico fixo de {scope.buffer.size} amostras.")
+
+    frame_timer.lap("Osciloscópio: estatísticas")
+    if st.button("Zerar estatísticas", key="osc_zerar",
+                 help="As estatísticas acumulam desde o início; zere após mudar a taxa para medir o novo regime."):
+        scope.reset_stats()
+    exibir_estatisticas(scope.stats)
+    st.caption(f"Estatísticas de {scope.stats.duration_ms / 1000:.1f} s simulados, acumuladas bloco a bloco "
+               f"(histogramas de bins fixos, sem guardar os picos).")
+    frame_timer.finish()
+
 
 # --- Título e Introdução ---
+timer.lap("Introdução (markdown)")
 st.title("🧠 Circuito Cerebelar: Simulação Interativa Detalhada")
 st.markdown("""
 Bem-vindo a uma simulação mais detalhada do circuito cerebelar!
@@ -15,47 +124,9 @@ o impacto na frequência de disparos dos **Núcleos Cerebelares Profundos (NCP)*
 """)
 
 # --- Diagrama Detalhado do Circuito (CORRIGIDO) ---
+timer.lap("Diagrama (Graphviz)")
 st.subheader("Diagrama do Circuito Cerebelar")
-circuit_diagram_detailed = """
-digraph CerebellarCircuitDetailed {
-    rankdir=LR;
-    node [shape=box, style="rounded,filled", fillcolor=lightgrey];
-
-    subgraph cluster_Cortex {
-        label = "Córtex Cerebelar";
-        style = "filled";
-        color = "lightyellow";
-        node [fillcolor=white];
-
-        GC [label="Células Granulares\n(Glutamato)"];
-        CP [label="CÉLULA DE PURKINJE\n(GABA)", fillcolor=lightpink, shape=ellipse, style="filled,bold"];
-        // Nota: Fibras Paralelas são os axônios das Células Granulares
-    }
-
-    FM [label="FIBRAS MUSGOSAS\n(Entrada Excitatória - Glutamato)", fillcolor=lightblue];
-    FT [label="FIBRAS TREPADEIRAS\n(Entrada Excitatória - Aspartato/Glutamato)", fillcolor=lightcyan];
-    NCP [label="NÚCLEOS CEREBELARES PROFUNDOS\n(Saída Excitatória - Glutamato)", fillcolor=lightgreen, shape=ellipse, style="filled,bold"];
-    Output [label="Saída para outras áreas\ndo SNC (ex: Tálamo, Tronco)", shape=cds, fillcolor=gold];
-
-    FM -> GC [label=" excita (+)"];
-    GC -> CP [label=" excita (+)\n(via Fibras Paralelas)"]; // Representa a ação das Fibras Paralelas
-
-    FT -> CP [label=" excita MUITO (+)\n(Picos Complexos)", color=purple, penwidth=2];
-
-    FM -> NCP [label=" excita (+)\n(colateral)"];
-    FT -> NCP [label=" excita (+)\n(colateral)", color=purple];
-
-    CP -> NCP [label=" INIBE (-)", color=red, fontcolor=red, penwidth=2, style=bold];
-    NCP -> Output [label=" modula"];
-
-    {rank=same; FM; FT;}
-    {rank=same; GC;}
-    {rank=same; CP;}
-    {rank=same; NCP;}
-    {rank=same; Output;}
-}
-"""
-st.graphviz_chart(circuit_diagram_detailed)
+exibir_diagrama(CIRCUIT_DIAGRAM_DETAILED)
 st.caption("""
 **Legenda do Fluxograma:**
 - **Fibras Musgosas (FM):** Principal via de entrada. Ativam Células Granulares (GC) e enviam colaterais para os NCP. (Neurotransmissor principal: Glutamato).
@@ -68,6 +139,7 @@ st.caption("""
 st.markdown("---")
 
 # --- Simulação Interativa ---
+timer.lap("Controles")
 st.header("🔬 Simulação da Atividade Neuronal")
 
 col_params, col_plot = st.columns([1, 2])
@@ -91,19 +163,40 @@ with col_params:
     )
 
     # Parâmetros do Modelo (didáticos)
-    NCP_BASELINE_ACTIVITY_HZ = 10 # Atividade tônica intrínseca dos NCP em Hz
-    FM_TO_NCP_GAIN = 4.0          # Ganho da excitação das FM para os NCP
-    FT_TO_NCP_GAIN = 6.0          # Ganho da excitação das FT para os NCP
-    MAX_TOTAL_PC_INHIBITORY_POTENTIAL_HZ = 120
+    MODEL_PARAMS = NCPParams()
+    NCP_BASELINE_ACTIVITY_HZ = MODEL_PARAMS.baseline_hz # Atividade tônica intrínseca dos NCP em Hz
+
+    with st.expander("⚙️ Opções da Simulação de Picos"):
+        DURATION_MS = st.slider(
+            "Duração total simulada (ms)", min_value=200, max_value=10000, value=200, step=100,
+        )
+        TIME_STEP_MS = st.select_slider(
+            "Resolução temporal (ms)", options=[1.0, 0.1, MIN_RESOLUTION_MS], value=1.0,
+            help="Os picos são gerados como eventos; a resolução só define a grade dos tempos e do traço."
+        )
+        REFRACTORY_MS = st.slider(
+            "Período refratário (ms)", min_value=0.0, max_value=5.0, value=1.0, step=0.1,
+        )
+        WINDOW_MS = st.slider(
+            "Janela visível (ms)", min_value=50, max_value=10000, value=200, step=50,
+            help="Apenas o final da simulação, com esta largura, é convertido em traço de voltagem."
+        )
+        MAX_CHART_POINTS = st.slider(
+            "Máximo de pontos no gráfico", min_value=500, max_value=10000, value=DEFAULT_MAX_POINTS, step=500,
+            help="Traços mais longos são decimados (mínimo/máximo por intervalo) antes de ir ao navegador; os picos continuam visíveis."
+        )
+        SEED = st.number_input(
+            "Semente aleatória", min_value=0, max_value=2**32 - 1, value=0, step=1,
+            help="Mesmos parâmetros e mesma semente reproduzem exatamente os mesmos picos."
+        )
 
 
 # --- Cálculos do Modelo ---
-ncp_excitation_from_fm = fm_strength * FM_TO_NCP_GAIN
-ncp_excitation_from_ft = ft_strength * FT_TO_NCP_GAIN
-total_direct_excitation_ncp = NCP_BASELINE_ACTIVITY_HZ + ncp_excitation_from_fm + ncp_excitation_from_ft
-effective_pc_inhibition_on_ncp = (pc_inhibition_scale / 10.0) * MAX_TOTAL_PC_INHIBITORY_POTENTIAL_HZ
-ncp_final_firing_rate_hz = total_direct_excitation_ncp - effective_pc_inhibition_on_ncp
-ncp_final_firing_rate_hz = max(0, ncp_final_firing_rate_hz)
+timer.lap("Modelo NCP e métricas")
+ncp_model = ncp_response(fm_strength, ft_strength, pc_inhibition_scale, MODEL_PARAMS)
+total_direct_excitation_ncp = float(ncp_model.total_direct_excitation)
+effective_pc_inhibition_on_ncp = float(ncp_model.effective_pc_inhibition)
+ncp_final_firing_rate_hz = float(ncp_model.final_rate_hz)
 
 with col_params:
     st.markdown("---")
@@ -118,27 +211,258 @@ with col_params:
 with col_plot:
     st.subheader("📈 Visualização dos Potenciais de Ação dos NCP (Esquemático)")
 
-    DURATION_MS = 200
-    TIME_STEP_MS = 1
-    time_ms = np.arange(0, DURATION_MS, TIME_STEP_MS)
-    RESTING_POTENTIAL_MV = -70
-    SPIKE_PEAK_MV = 30
-    spikes_per_ms = ncp_final_firing_rate_hz / 1000.0
-    spike_train = np.random.rand(len(time_ms)) < spikes_per_ms
-    voltage_trace = np.full_like(time_ms, RESTING_POTENTIAL_MV, dtype=float)
-    voltage_trace[spike_train] = SPIKE_PEAK_MV
-    df_voltage = pd.DataFrame({'Tempo (ms)': time_ms, 'Potencial de Membrana (mV)': voltage_trace})
-
-    st.line_chart(df_voltage.set_index('Tempo (ms)'), height=300)
-    
+    modo_visualizacao = st.radio(
+        "Modo de visualização",
+        options=["Traço único (esquemático)", "Osciloscópio ao vivo", "Múltiplos ensaios (Monte Carlo)",
+                 "População LIF", "Rede esparsa (FM→GC→CP→NCP)", "Aprendizado (LTD nas FP→CP)",
+                 "Dinâmica (entradas no tempo)"],
+        horizontal=True,
+        help="A população LIF simula N neurônios integra-e-dispara recebendo a mesma excitação e inibição. "
+             "O modo Monte Carlo repete o traço único K vezes para separar sinal de ruído. "
+             "O modo Aprendizado treina as sinapses FP→CP com o erro sinalizado pelas FT. "
+             "O modo Dinâmica integra as taxas de GC, CP e NCP para entradas que mudam no tempo."
+    )
+
+    # Uma seção por modo: cada modo tem custo próprio, e as percentis não devem misturá-los
+    timer.lap(f"Simulação: {modo_visualizacao}")
+    if modo_visualizacao == "Traço único (esquemático)":
+        spike_times_ms = run_simulation(
+            cache_key("spike_train", fm_strength, ft_strength, pc_inhibition_scale, DURATION_MS,
+                      TIME_STEP_MS, SEED, REFRACTORY_MS),
+            "spike_train", ncp_final_firing_rate_hz, DURATION_MS, SEED, REFRACTORY_MS, TIME_STEP_MS,
+        )
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        window_start_ms = max(0.0, DURATION_MS - WINDOW_MS)
+        n_window_samples = int(round((DURATION_MS - window_start_ms) / TIME_STEP_MS))
+        if n_window_samples <= MAX_CHART_POINTS:
+            time_ms, voltage_trace_mv = voltage_trace(spike_times_ms, window_start_ms, DURATION_MS, TIME_STEP_MS)
+        else:
+            time_ms, voltage_trace_mv = spike_trace_envelope(
+                spike_times_ms, window_start_ms, DURATION_MS, MAX_CHART_POINTS, RESTING_POTENTIAL_MV, SPIKE_PEAK_MV,
+            )
+        voltage_data = {'Tempo (ms)': time_ms, 'Potencial de Membrana (mV)': voltage_trace_mv}
+
+        st.vega_lite_chart(line_chart_spec(voltage_data, 'Tempo (ms)', height=300), width="stretch")
+        st.caption(f"Simulação de {DURATION_MS} ms ({len(spike_times_ms)} picos), exibindo os últimos "
+                   f"{DURATION_MS - window_start_ms:.0f} ms em {len(time_ms)} pontos. "
+                   f"Picos de {RESTING_POTENTIAL_MV}mV a {SPIKE_PEAK_MV}mV.")
+        timer.lap("Estatísticas do trem")
+        exibir_estatisticas(spike_train_stats(spike_times_ms, DURATION_MS))
+    elif modo_visualizacao == "Osciloscópio ao vivo":
+        ao_vivo = st.toggle(
+            "▶️ Ao vivo", value=False,
+            help=f"Avança a simulação em tempo real, {1 / FRAME_INTERVAL_S:.0f} quadros por segundo, "
+                 f"mantendo os últimos {DEFAULT_HISTORY_MS / 1000:.0f} s."
+        )
+        st.fragment(osciloscopio_quadro, run_every=FRAME_INTERVAL_S if ao_vivo else None)()
+    elif modo_visualizacao == "Múltiplos ensaios (Monte Carlo)":
+        col_trials, col_bin = st.columns(2)
+        n_trials = col_trials.slider("Número de ensaios (K)", min_value=10, max_value=MAX_TRIALS, value=1000, step=10)
+        psth_bin_ms = col_bin.select_slider("Largura do bin do PSTH (ms)", options=[1.0, 5.0, 10.0, 20.0, 50.0],
+                                            value=DEFAULT_PSTH_BIN_MS)
+        # Lotes em paralelo no pool; cada lote concluído é somado ao agregado e descartado
+        aggregate = TrialAggregate.empty(ncp_final_firing_rate_hz, DURATION_MS, psth_bin_ms)
+        batches = {
+            simulation_service().submit(
+                cache_key("monte_carlo_batch", fm_strength, ft_strength, pc_inhibition_scale, DURATION_MS,
+                          TIME_STEP_MS, SEED, REFRACTORY_MS, psth_bin_ms, first_trial, batch_trials),
+                "monte_carlo_batch", ncp_final_firing_rate_hz, DURATION_MS, REFRACTORY_MS, TIME_STEP_MS,
+                psth_bin_ms, SEED, first_trial, batch_trials,
+            )
+            for first_trial, batch_trials in batch_ranges(n_trials)
+        }
+        progress = st.empty() if not all(f.done() for f in batches) else None
+        for future in as_completed(batches):
+            aggregate.merge(future.result())
+            if progress is not None:
+                progress.progress(aggregate.n_trials / n_trials, text=f"{aggregate.n_trials} de {n_trials} ensaios")
+        if progress is not None:
+            progress.empty()
+
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        band_low_hz, band_high_hz = aggregate.band_hz
+        # Com bins de 1 ms e 10 s são 10⁴ bins por série: limitados a `MAX_CHART_POINTS` linhas
+        psth_data = decimate_columns({
+            'Tempo (ms)': aggregate.bin_centers_ms,
+            'PSTH médio (Hz)': aggregate.psth_hz,
+            'IC 95% inferior (Hz)': band_low_hz,
+            'IC 95% superior (Hz)': band_high_hz,
+        }, 'Tempo (ms)', MAX_CHART_POINTS)
+        st.vega_lite_chart(line_chart_spec(psth_data, 'Tempo (ms)', height=250), width="stretch")
+        rate_data = {'Taxa do ensaio (Hz)': aggregate.rate_centers_hz, 'Ensaios': aggregate.rate_hist}
+        st.vega_lite_chart(bar_chart_spec(rate_data, 'Taxa do ensaio (Hz)', 'Ensaios', height=180), width="stretch")
+        rate_low_hz, rate_high_hz = aggregate.rate_quantiles()
+        st.caption(
+            f"{aggregate.n_trials} ensaios independentes de {DURATION_MS} ms (bins de {psth_bin_ms:.0f} ms). "
+            f"Taxa média: {aggregate.mean_rate_hz:.1f} Hz (modelo: {ncp_final_firing_rate_hz:.1f} Hz); "
+            f"95% dos ensaios isolados entre {rate_low_hz:.1f} e {rate_high_hz:.1f} Hz. "
+            f"A banda do PSTH estreita com √K: o ruído de cada ensaio se cancela na média."
+        )
+    elif modo_visualizacao == "População LIF":
+        n_neurons = st.slider(
+            "Número de neurônios NCP (N)", min_value=10, max_value=MAX_NEURONS, value=1000, step=10,
+        )
+        population = run_simulation(
+            cache_key("lif_population", fm_strength, ft_strength, pc_inhibition_scale, DURATION_MS,
+                      DEFAULT_DT_MS, SEED, n_neurons),
+            "lif_population", n_neurons, total_direct_excitation_ncp, effective_pc_inhibition_on_ncp,
+            DURATION_MS, SEED,
+        )
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        # Raster e taxa limitados a `MAX_CHART_POINTS`, como o traço único
+        raster_times_ms, raster_neurons, n_raster_shown = raster_limit(
+            population.raster_times_ms, population.raster_neurons, min(n_neurons, DEFAULT_RASTER_NEURONS),
+            MAX_CHART_POINTS)
+        raster_data = {'Tempo (ms)': raster_times_ms, 'Neurônio': raster_neurons}
+        st.vega_lite_chart(scatter_chart_spec(raster_data, 'Tempo (ms)', 'Neurônio', height=250), width="stretch")
+        rate_time_ms, rate_hz = minmax_decimate(population.rate_time_ms, population.rate_hz, MAX_CHART_POINTS)
+        rate_data = {'Tempo (ms)': rate_time_ms, 'Taxa Populacional (Hz)': rate_hz}
+        st.vega_lite_chart(line_chart_spec(rate_data, 'Tempo (ms)', height=200), width="stretch")
+        st.caption(
+            f"{n_neurons} neurônios LIF, {DURATION_MS} ms com dt = {DEFAULT_DT_MS} ms "
+            f"(raster dos primeiros {n_raster_shown} de {min(n_neurons, DEFAULT_RASTER_NEURONS)} gravados, "
+            f"{len(raster_times_ms)} picos). "
+            f"Taxa média da população: {population.mean_rate_hz:.1f} Hz. "
+            f"Desempenho: {population.neuron_steps_per_s:.2e} neurônio-passos/s "
+            f"(meta: {THROUGHPUT_TARGET_NEURON_STEPS_PER_S:.0e} com N = {MAX_NEURONS} num CPU de notebook, "
+            f"a qualquer taxa de disparo; com N menor o custo fixo por passo domina)."
+        )
+    elif modo_visualizacao == "Rede esparsa (FM→GC→CP→NCP)":
+        col_gc, col_pc, col_ncp = st.columns(3)
+        n_gc = col_gc.slider("Células Granulares", min_value=1000, max_value=50000, value=50000, step=1000)
+        n_pc = col_pc.slider("Células de Purkinje", min_value=10, max_value=500, value=100, step=10)
+        n_ncp = col_ncp.slider("Neurônios NCP", min_value=5, max_value=200, value=20, step=5)
+        network_config = NetworkConfig(n_gc=n_gc, n_pc=n_pc, n_ncp=n_ncp)
+        # ~1,35 s por segundo simulado com 50 000 GC: a rede simula no máximo o primeiro segundo
+        network_duration_ms = min(DURATION_MS, NETWORK_MAX_DURATION_MS)
+        network_result = run_simulation(
+            cache_key("network", fm_strength, ft_strength, pc_inhibition_scale, network_duration_ms,
+                      network_config.dt_ms, SEED, network_config),
+            "network", network_config, fm_strength, ft_strength, pc_inhibition_scale, network_duration_ms, SEED,
+        )
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        network_data = decimate_columns({
+            'Tempo (ms)': network_result.time_ms,
+            'Células Granulares (Hz)': network_result.gc_rate_hz,
+            'Células de Purkinje (Hz)': network_result.pc_rate_hz,
+            'NCP (Hz)': network_result.ncp_rate_hz,
+        }, 'Tempo (ms)', MAX_CHART_POINTS)
+        st.vega_lite_chart(line_chart_spec(network_data, 'Tempo (ms)', height=300), width="stretch")
+        mean_rates = network_result.mean_rates()
+        truncated = (f" (a rede simula só os primeiros {NETWORK_MAX_DURATION_MS:.0f} dos {DURATION_MS} ms)"
+                     if DURATION_MS > network_duration_ms else "")
+        st.caption(
+            f"Rede com {n_gc} GC, {n_pc} CP e {n_ncp} NCP ({network_result.nnz} sinapses em matriz CSR), "
+            f"{network_duration_ms:.0f} ms simulados em {network_result.elapsed_s:.2f} s{truncated}. "
+            f"Taxas médias: GC {mean_rates['gc']:.1f} Hz, CP {mean_rates['pc']:.1f} Hz, NCP {mean_rates['ncp']:.1f} Hz."
+        )
+
+    elif modo_visualizacao == "Aprendizado (LTD nas FP→CP)":
+        learning_config = LearningConfig(fm_strength=fm_strength, ft_strength=ft_strength, seed=SEED)
+        run = learning_run(learning_config)
+        col_trials, col_train, col_reset = st.columns([2, 1, 1], vertical_alignment="bottom")
+        n_learning_trials = col_trials.slider("Ensaios por treino", min_value=100, max_value=MAX_TRIALS_PER_CALL,
+                                              value=5000, step=100)
+        train = col_train.button("▶️ Treinar", width="stretch")
+        if col_reset.button("↺ Reiniciar", width="stretch"):
+            # No próprio objeto compartilhado: as sessões com esta configuração veem o reinício
+            with run.lock:
+                run.reset()
+
+        curve_placeholder = st.empty()
+
+        def draw_learning_curve():
+            trial_axis, abs_error, ncp_mean = run.learning_curve()
+            curve_data = {'Ensaio': trial_axis, '|Erro| médio (Hz)': abs_error}
+            for context, target_hz in enumerate(run.targets_hz):
+                curve_data[f'NCP mov. {context + 1} (alvo {target_hz:.0f} Hz)'] = ncp_mean[:, context]
+            # Uma janela a cada 100 ensaios, sem limite de ensaios acumulados
+            curve_data = decimate_columns(curve_data, 'Ensaio', MAX_CHART_POINTS)
+            curve_placeholder.vega_lite_chart(line_chart_spec(curve_data, 'Ensaio', height=300), width="stretch")
+
+        if train:
+            progress = st.progress(0.0)
+            start_trial, last_draw_s = run.trial, time.monotonic()
+            for trial in run.train(n_learning_trials):
+                # Curva redesenhada no máximo a cada quadro do osciloscópio, não a cada bloco
+                if time.monotonic() - last_draw_s >= FRAME_INTERVAL_S:
+                    draw_learning_curve()
+                    last_draw_s = time.monotonic()
+                # Outras sessões podem treinar a mesma configuração entre dois blocos
+                progress.progress(min((trial - start_trial) / n_learning_trials, 1.0),
+                                  text=f"Ensaio {trial} ({trial - start_trial} de {n_learning_trials})")
+            progress.empty()
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        draw_learning_curve()
+        st.caption(
+            f"{run.trial} ensaios acumulados, {run.config.n_pc} CP × {run.config.n_pf} FP "
+            f"({run.config.n_contexts} movimentos, {run.active_pf.shape[1]} FP ativas em cada). "
+            f"As FT disparam acima do basal quando a saída dos NCP fica abaixo do alvo: a LTD nas FP ativas "
+            f"reduz a inibição das CP e a saída sobe. Com FT = 0 não há sinal de erro e nada é aprendido. "
+            f"Pesos salvos em disco a cada checkpoint; o treino continua de onde parou."
+        )
+
+    else:
+        col_fm_wave, col_ft_wave = st.columns(2)
+        fm_kind = col_fm_wave.selectbox("Forma de onda das FM", WAVEFORM_KINDS, index=0)
+        fm_amplitude = col_fm_wave.slider("Amplitude das FM (além do basal)", -10.0, 10.0, 3.0, 0.1)
+        ft_kind = col_ft_wave.selectbox("Forma de onda das FT", WAVEFORM_KINDS, index=2)
+        ft_amplitude = col_ft_wave.slider("Amplitude das FT (além do basal)", -10.0, 10.0, 10.0, 0.1)
+        col_start, col_width, col_solver = st.columns(3)
+        wave_start_ms = col_start.slider("Início (ms)", 0, DURATION_MS, DURATION_MS // 4, 10)
+        wave_width_ms = col_width.slider("Duração do pulso / subida da rampa (ms)", 5, 1000, 50, 5)
+        solver = col_solver.radio("Integrador", SOLVERS, horizontal=True,
+                                  help="rk4: passo fixo de 1 ms. rk23: passo adaptativo comum ao lote, "
+                                       "parando exatamente nas quinas das formas de onda.")
+
+        def waveform(kind, baseline, amplitude):
+            return Waveform(kind, baseline, amplitude, float(wave_start_ms), float(wave_width_ms))
+
+        # Cenário 0 é o escolhido; os demais varrem a amplitude das FT, todos num único lote
+        sweep_amplitudes = np.linspace(0.0, 10.0, DEFAULT_SWEEP_SCENARIOS)
+        fm_waves = (waveform(fm_kind, fm_strength, fm_amplitude),) * (DEFAULT_SWEEP_SCENARIOS + 1)
+        ft_waves = (waveform(ft_kind, ft_strength, ft_amplitude),) + tuple(
+            waveform(ft_kind, ft_strength, float(amplitude)) for amplitude in sweep_amplitudes)
+        dynamics = run_simulation(
+            cache_key("rate_dynamics", fm_waves[0], ft_waves[0], pc_inhibition_scale, DURATION_MS, solver,
+                      DEFAULT_SWEEP_SCENARIOS),
+            "rate_dynamics", fm_waves, ft_waves, pc_inhibition_scale, DURATION_MS, solver,
+        )
+        timer.lap(f"Gráfico: {modo_visualizacao}")
+        # rk4 grava um ponto por ms: até 10⁴ por série, limitados a `MAX_CHART_POINTS` linhas
+        dynamics_data = decimate_columns({
+            'Tempo (ms)': dynamics.time_ms,
+            'Células Granulares (Hz)': dynamics.gc_rate_hz[0],
+            'Células de Purkinje (Hz)': dynamics.pc_rate_hz[0],
+            'NCP (Hz)': dynamics.ncp_rate_hz[0],
+        }, 'Tempo (ms)', MAX_CHART_POINTS)
+        st.vega_lite_chart(line_chart_spec(dynamics_data, 'Tempo (ms)', height=300), width="stretch")
+        input_data = decimate_columns({'Tempo (ms)': dynamics.time_ms, 'FM': dynamics.fm[0], 'FT': dynamics.ft[0]},
+                                      'Tempo (ms)', MAX_CHART_POINTS)
+        st.vega_lite_chart(line_chart_spec(input_data, 'Tempo (ms)', height=150), width="stretch")
+        after_start = dynamics.time_ms >= wave_start_ms
+        sweep_data = decimate_columns({
+            'Amplitude das FT': sweep_amplitudes,
+            'Pico dos NCP após o início (Hz)': dynamics.ncp_rate_hz[1:, after_start].max(axis=1),
+            'Mínimo da CP após o início (Hz)': dynamics.pc_rate_hz[1:, after_start].min(axis=1),
+        }, 'Amplitude das FT', MAX_CHART_POINTS)
+        st.vega_lite_chart(line_chart_spec(sweep_data, 'Amplitude das FT', height=200), width="stretch")
+        st.caption(
+            f"{dynamics.n_scenarios} cenários de {DURATION_MS} ms integrados juntos ({dynamics.solver}, "
+            f"{dynamics.n_steps} passos) em {dynamics.elapsed_s:.2f} s. Uma salva das FT excita a CP por um "
+            f"instante (pico complexo) e em seguida a pausa: a inibição cai e os NCP escapam, mesmo quando a taxa "
+            f"estacionária ({ncp_final_firing_rate_hz:.1f} Hz) é baixa."
+        )
+
+    timer.lap("Status")
     if ncp_final_firing_rate_hz == 0:
         st.info("Os Núcleos Cerebelares Profundos estão silenciados.")
     elif ncp_final_firing_rate_hz > NCP_BASELINE_ACTIVITY_HZ * 1.5:
         st.success(f"Alta frequência de disparos nos NCP: {ncp_final_firing_rate_hz:.1f} Hz.")
     else:
         st.write(f"Frequência de disparos nos NCP: {ncp_final_firing_rate_hz:.1f} Hz.")
-    st.caption(f"Simulação de {DURATION_MS} ms. Picos de {RESTING_POTENTIAL_MV}mV a {SPIKE_PEAK_MV}mV.")
 
+timer.lap("Resumo (markdown)")
 st.markdown("---")
 # --- Resumo do Fluxo de Informação e Neurotransmissores (SIMPLIFICADO) ---
 st.subheader("📖 Resumo do Fluxo de Informação e Neurotransmissores Principais")
@@ -170,8 +494,23 @@ st.markdown("""
 **Funcionamento Geral:** Os NCPs integram as aferências excitatórias diretas (FM, FT) e a potente inibição das CPs. Este balanço permite que o cerebelo module a atividade motora, contribuindo para a coordenação, precisão e aprendizado de movimentos.
 """)
 
+timer.lap("Barra lateral")
 st.sidebar.header("Sobre o App")
 st.sidebar.info(
     "Simulação interativa para demonstrar como as entradas cerebelares e a modulação pelas Células de Purkinje afetam a saída dos Núcleos Cerebelares Profundos."
     "\n\nCriado para fins didáticos."
-)
\ No newline at end of file
+)
+cache_stats = simulation_cache().stats()
+st.sidebar.caption(
+    f"Cache de simulações: {cache_stats['hits']} acertos, {cache_stats['misses']} faltas "
+    f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} entradas, "
+    f"{cache_stats['bytes'] / 1024**2:.1f} de {cache_stats['max_bytes'] / 1024**2:.0f} MB."
+)
+service_stats = simulation_service().stats()
+st.sidebar.caption(
+    f"Serviço de simulação: {service_stats['workers']} processos, {service_stats['submitted']} jobs, "
+    f"{service_stats['coalesced']} pedidos coalescidos, {service_stats['in_flight']} em andamento, "
+    f"{service_stats['restarts']} reinícios do pool."
+)
+timer.finish()
+render_panel("circuito")
@@ -0,0 +1,95 @@
+"""Treino por LTD (`aprendizado_ltd`): checkpoints, retomada e lock por bloco."""
+import threading
+
+import numpy as np
+import pytest
+
+from aprendizado_ltd import CHECKPOINT_EVERY, CHECKPOINT_FILE, LearningConfig, LearningRun, prune_runs
+
+CONFIG = LearningConfig(n_pf=200, n_pc=10)
+
+
+def train(run, n_trials):
+    for _ in run.train(n_trials):
+        pass
+
+
+def test_nothing_is_written_before_training(tmp_path):
+    LearningRun(CONFIG, tmp_path / "run")
+    assert not (tmp_path / "run").exists()
+
+
+def test_checkpoint_round_trip_matches_continuous_training(tmp_path):
+    continuous = LearningRun(CONFIG, tmp_path / "continuo")
+    train(continuous, 1200)
+
+    first = LearningRun(CONFIG, tmp_path / "retomado")
+    train(first, 700)
+    resumed = LearningRun(CONFIG, tmp_path / "retomado")     # Outro processo abrindo o mesmo diretório
+    assert resumed.trial == 700
+    np.testing.assert_array_equal(resumed.weights, first.weights)
+    np.testing.assert_array_equal(resumed.curves, first.curves)
+    train(resumed, 500)
+    np.testing.assert_array_equal(resumed.weights, continuous.weights)
+    np.testing.assert_array_equal(resumed.curves, continuous.curves)
+    assert len(list((tmp_path / "retomado").glob("weights-*.npy"))) == 1
+
+
+def test_abandoned_training_keeps_last_block_and_releases_lock(tmp_path):
+    run = LearningRun(CONFIG, tmp_path / "run")
+    steps = run.train(5000, block_trials=100)
+    assert next(steps) == 100
+    # Entre dois blocos o lock está livre: outra sessão não espera pelo gerador abandonado
+    acquired = run.lock.acquire(timeout=1)
+    assert acquired
+    run.lock.release()
+    steps.close()                                             # Como um rerun que descarta o gerador
+    assert LearningRun(CONFIG, tmp_path / "run").trial == 100
+
+
+def test_interleaved_sessions_count_their_own_trials(tmp_path):
+    run = LearningRun(CONFIG, tmp_path / "run")
+    threads = [threading.Thread(target=train, args=(run, 300)) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert run.trial == len(run.curves) == 900
+    single = LearningRun(CONFIG, tmp_path / "sozinho")
+    train(single, 900)
+    # Cada ensaio depende só do seu índice e dos pesos: a ordem dos blocos é a mesma sequência
+    np.testing.assert_array_equal(run.weights, single.weights)
+
+
+def test_uncommitted_curve_rows_are_ignored(tmp_path):
+    run = LearningRun(CONFIG, tmp_path / "run")
+    train(run, CHECKPOINT_EVERY)
+    with open(tmp_path / "run" / "curves.f32", "ab") as f:
+        f.write(np.zeros((7, 3), dtype=np.float32).tobytes())  # Gravadas, mas sem checkpoint
+    assert len(LearningRun(CONFIG, tmp_path / "run").curves) == CHECKPOINT_EVERY
+
+
+def test_reset_and_pruned_directory(tmp_path):
+    run = LearningRun(CONFIG, tmp_path / "run")
+    train(run, 200)
+    prune_runs(tmp_path, max_runs=0)                          # Diretório apagado com o treino aberto
+    assert not (tmp_path / "run").exists()
+    train(run, 100)
+    reopened = LearningRun(CONFIG, tmp_path / "run")
+    assert reopened.trial == 300 and len(reopened.curves) == 300
+    with run.lock:
+        run.reset()
+    assert run.trial == 0 and not (tmp_path / "run" / CHECKPOINT_FILE).exists()
+
+
+def test_other_config_checkpoint_is_rejected(tmp_path):
+    train(LearningRun(CONFIG, tmp_path / "run"), 100)
+    with pytest.raises(ValueError):
+        LearningRun(LearningConfig(n_pf=200, n_pc=10, seed=1), tmp_path / "run")
+
+
+def test_learning_reduces_error(tmp_path):
+    run = LearningRun(LearningConfig(), tmp_path / "run")         # Configuração do app
+    train(run, 5000)
+    _, abs_error, _ = run.learning_curve()
+    assert abs_error[-1] < 0.05 * abs_error[0]
@@ -0,0 +1,33 @@
+"""Cache de simulações (`cache_simulacao`): determinismo do Philox e descarte LRU por memória."""
+import numpy as np
+
+from cache_simulacao import SimulationCache, cache_key, philox_rng
+
+
+def test_philox_streams_are_reproducible_and_independent():
+    draw = lambda *key: philox_rng(*key).standard_normal(8)  # noqa: E731
+    np.testing.assert_array_equal(draw(3, 1, 2), draw(3, 1, 2))
+    assert not np.array_equal(draw(3, 1, 2), draw(3, 1, 3))
+    assert not np.array_equal(draw(3, 1, 2), draw(3, 2, 2))
+
+
+def test_cache_key_absorbs_float_noise():
+    assert cache_key("x", 0.1 + 0.2, 5) == cache_key("x", 0.3, 5)
+
+
+def test_lru_eviction_by_bytes():
+    cache = SimulationCache(max_bytes=3 * 800)
+    for k in range(3):
+        cache.put(k, np.zeros(100))               # 800 bytes cada
+    assert cache.get(0) is not None               # 0 passa a ser o mais recente
+    cache.put(3, np.zeros(100))
+    assert cache.get(1) is None                   # o menos recente sai
+    assert all(cache.get(k) is not None for k in (0, 2, 3))
+    assert cache.stats()["evictions"] == 1
+    assert cache.total_bytes == 3 * 800
+
+
+def test_oversized_values_are_not_stored():
+    cache = SimulationCache(max_bytes=100)
+    value = cache.put("grande", np.zeros(100))
+    assert value is not None and cache.get("grande") is None
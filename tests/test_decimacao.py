@@ -0,0 +1,57 @@
+"""Decimação dos traços (`decimacao`): limite de pontos sem perder picos."""
+import numpy as np
+import pytest
+
+from decimacao import decimate_columns, minmax_decimate, raster_limit, spike_trace_envelope
+
+
+@pytest.fixture
+def trace():
+    rng = np.random.default_rng(0)
+    t = np.arange(100_000) * 0.1
+    y = rng.standard_normal(len(t))
+    y[[123, 45_678, 99_999]] = [50.0, -50.0, 40.0]
+    return t, y
+
+
+def test_minmax_keeps_extremes_in_order(trace):
+    t, y = trace
+    td, yd = minmax_decimate(t, y, 2000)
+    assert len(td) <= 2000
+    assert np.all(np.diff(td) > 0)
+    assert {50.0, -50.0, 40.0} <= set(yd.tolist())
+    np.testing.assert_array_equal(minmax_decimate(t[:100], y[:100], 2000)[1], y[:100])
+
+
+def test_decimate_columns_bounds_rows_and_keeps_every_series_extremes(trace):
+    t, y = trace
+    z = -y
+    z[500:600] = np.nan                                            # p.ex. janela sem ensaios
+    data = decimate_columns({"t": t, "a": y, "b": z, "c": y * 2}, "t", 2000)
+    assert len(data["t"]) <= 2000
+    assert np.all(np.diff(data["t"]) > 0)
+    assert np.nanmax(data["a"]) == 50.0 and np.nanmin(data["a"]) == -50.0
+    assert np.nanmax(data["b"]) == np.nanmax(z)
+    assert all(len(values) == len(data["t"]) for values in data.values())
+    small = {"t": t[:10], "a": y[:10]}
+    np.testing.assert_array_equal(decimate_columns(small, "t")["a"], y[:10])
+
+
+def test_spike_envelope_shows_every_bucket_with_a_spike():
+    spikes = np.array([0.5, 333.3, 333.4, 999.0])
+    t, v = spike_trace_envelope(spikes, 0.0, 1000.0, max_points=100, resting_mv=-70.0, peak_mv=30.0)
+    assert len(t) == 100 and np.all(np.diff(t) >= 0)
+    peaks = t[v == 30.0]
+    assert len(peaks) == 3                                         # Dois picos no mesmo balde viram um
+    np.testing.assert_allclose(peaks, [0.5, 333.3, 999.0])
+
+
+def test_raster_limit_keeps_whole_rows():
+    neurons = np.repeat(np.arange(10), 300)
+    times = np.tile(np.arange(300.0), 10)
+    t, n, shown = raster_limit(times, neurons, 10, max_points=1000)
+    assert shown == 3 and len(t) == 900 and n.max() == 2
+    t, n, shown = raster_limit(times, neurons, 10, max_points=100)
+    assert shown == 1 and len(t) == 100                            # Um neurônio, truncado
+    t, n, shown = raster_limit(times, neurons, 10, max_points=5000)
+    assert shown == 10 and len(t) == 3000
@@ -0,0 +1,59 @@
+"""Ensaios Monte Carlo (`ensaios_monte_carlo`): agregados independentes da divisão em lotes."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_MONTE_CARLO, philox_rng
+from ensaios_monte_carlo import CHUNK_TRIALS, TrialAggregate, batch_ranges, simulate_trial_batch
+from trem_de_picos import poisson_spike_times
+
+ARGS = dict(rate_hz=40.0, duration_ms=500.0, refractory_ms=2.0, resolution_ms=0.1, bin_ms=10.0, seed=5)
+
+
+def batch(first_trial, n_trials):
+    return simulate_trial_batch(first_trial=first_trial, n_trials=n_trials, **ARGS)
+
+
+def assert_same(a, b):
+    assert a.n_trials == b.n_trials
+    np.testing.assert_allclose(a.count_sum, b.count_sum)
+    np.testing.assert_allclose(a.count_sq_sum, b.count_sq_sum)
+    np.testing.assert_array_equal(a.rate_hist, b.rate_hist)
+
+
+def test_batches_merge_to_the_single_run():
+    n_trials = CHUNK_TRIALS + 130                                  # Mais de um bloco dentro do lote
+    single = batch(0, n_trials)
+    merged = TrialAggregate.empty(ARGS["rate_hz"], ARGS["duration_ms"], ARGS["bin_ms"])
+    for first_trial, batch_trials in reversed(batch_ranges(n_trials, batch_trials=97)):
+        merged.merge(batch(first_trial, batch_trials))             # Em qualquer ordem
+    assert_same(merged, single)
+
+
+def test_fold_matches_direct_counts():
+    aggregate = batch(3, 20)
+    counts = np.array([
+        np.bincount((poisson_spike_times(ARGS["rate_hz"], ARGS["duration_ms"], philox_rng(5, STREAM_MONTE_CARLO, k),
+                                         ARGS["refractory_ms"], ARGS["resolution_ms"]) // 10).astype(int),
+                    minlength=50)[:50]
+        for k in range(3, 23)
+    ])
+    np.testing.assert_allclose(aggregate.count_sum, counts.sum(axis=0))
+    np.testing.assert_allclose(aggregate.count_sq_sum, (counts ** 2).sum(axis=0))
+    assert aggregate.rate_hist.sum() == 20
+
+
+def test_band_and_rates():
+    aggregate = batch(0, 400)
+    low, high = aggregate.band_hz
+    assert np.all(low <= aggregate.psth_hz) and np.all(aggregate.psth_hz <= high)
+    assert aggregate.mean_rate_hz == pytest.approx(ARGS["rate_hz"], rel=0.05)
+    rate_low, rate_high = aggregate.rate_quantiles()
+    assert rate_low < ARGS["rate_hz"] < rate_high
+
+
+def test_incompatible_aggregates_and_ranges():
+    with pytest.raises(ValueError):
+        batch(0, 5).merge(simulate_trial_batch(**{**ARGS, "bin_ms": 5.0}, first_trial=0, n_trials=5))
+    assert batch_ranges(1001, 500) == [(0, 500), (500, 500), (1000, 1)]
+    with pytest.raises(ValueError):
+        batch_ranges(0)
@@ -0,0 +1,69 @@
+"""Estatísticas em fluxo (`estatisticas_picos`) contra o cálculo direto sobre o trem inteiro."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_SPIKE_TRAIN, philox_rng
+from estatisticas_picos import SpikeTrainStats, spike_train_stats
+from trem_de_picos import poisson_spike_times
+
+DURATION_MS = 20_000.0
+
+
+@pytest.fixture(scope="module")
+def spikes():
+    return poisson_spike_times(50.0, DURATION_MS, rng=philox_rng(0, STREAM_SPIKE_TRAIN),
+                               refractory_ms=2.0, resolution_ms=0.1)
+
+
+def batch_statistics(spikes, stats):
+    """Mesmas grandezas de `SpikeTrainStats`, calculadas de uma vez com o trem inteiro."""
+    isi = np.diff(spikes)
+    isi_idx = np.minimum((isi // stats.isi_bin_ms).astype(int), len(stats.isi_hist) - 1)
+    n_windows = int(DURATION_MS // stats.fano_window_ms)
+    counts = np.bincount((spikes // stats.fano_window_ms).astype(int), minlength=n_windows + 1)[:n_windows]
+    lags = np.concatenate([spikes[i + 1:np.searchsorted(spikes, t + stats.max_lag_ms)] - t
+                           for i, t in enumerate(spikes)])
+    return {
+        "isi_mean_ms": isi.mean(),
+        "isi_cv": isi.std(ddof=1) / isi.mean(),
+        "fano_factor": counts.var(ddof=1) / counts.mean(),
+        "isi_hist": np.bincount(isi_idx, minlength=len(stats.isi_hist)),
+        "lag_hist": np.bincount((lags // stats.lag_bin_ms).astype(int), minlength=len(stats.lag_hist)),
+    }
+
+
+def assert_matches_batch(stats, spikes):
+    expected = batch_statistics(spikes, stats)
+    assert stats.n_spikes == len(spikes)
+    assert stats.window_counts.n == int(DURATION_MS // stats.fano_window_ms)
+    for name in ("isi_mean_ms", "isi_cv", "fano_factor"):
+        assert getattr(stats, name) == pytest.approx(expected[name], rel=1e-12)
+    np.testing.assert_array_equal(stats.isi_hist, expected["isi_hist"])
+    np.testing.assert_array_equal(stats.lag_hist, expected["lag_hist"])
+
+
+@pytest.mark.parametrize("chunk_ms", [7.0, 37.0, 100.0, 1000.0, DURATION_MS])
+def test_streaming_matches_batch(spikes, chunk_ms):
+    assert_matches_batch(spike_train_stats(spikes, DURATION_MS, chunk_ms=chunk_ms), spikes)
+
+
+def test_irregular_chunks_match_batch(spikes):
+    # Blocos de duração variável, como os quadros do osciloscópio
+    edges = np.concatenate(([0.0], np.sort(np.random.default_rng(1).uniform(0, DURATION_MS, 300)), [DURATION_MS]))
+    stats = SpikeTrainStats()
+    for start_ms, end_ms in zip(edges[:-1], edges[1:]):
+        lo, hi = np.searchsorted(spikes, [start_ms, end_ms])
+        stats.update(start_ms, end_ms, spikes[lo:hi])
+    assert_matches_batch(stats, spikes)
+
+
+def test_empty_train():
+    stats = spike_train_stats(np.empty(0), 1000.0)
+    assert stats.n_spikes == 0
+    assert stats.rate_hz == 0.0
+    assert np.isnan(stats.isi_cv) and np.isnan(stats.fano_factor)
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        SpikeTrainStats(fano_window_ms=0.0)
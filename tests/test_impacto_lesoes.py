@@ -0,0 +1,48 @@
+"""Matriz de impacto (`impacto_lesoes`): combinações resolvidas na hora, sem o conjunto das partes."""
+import numpy as np
+import pytest
+
+from impacto_lesoes import MatrizImpacto, carregar_matriz_impacto
+
+INF = np.inf
+
+
+@pytest.fixture
+def matriz():
+    return MatrizImpacto(
+        fases=("f1", "f2"), divisoes=("d1", "d2", "d3"), lesoes=("A", "B"), severidades=(0.5, 1.0),
+        normal=np.array([[4.0, 2.0, 3.0], [1.0, 5.0, 2.0]]),
+        residual=np.array([[1.0, INF, INF], [2.0, 0.5, INF]]),
+    )
+
+
+def test_combination_takes_smallest_residual(matriz):
+    np.testing.assert_array_equal(matriz.fatia([], 1.0), matriz.normal)
+    np.testing.assert_array_equal(matriz.fatia(["A"], 1.0), [[1.0, 2.0, 3.0], [1.0, 5.0, 2.0]])
+    np.testing.assert_array_equal(matriz.fatia(["A", "B"], 1.0), [[1.0, 0.5, 3.0], [1.0, 0.5, 2.0]])
+    np.testing.assert_array_equal(matriz.mascara(["B"]), [True, True, False])
+
+
+def test_order_and_repeats_do_not_matter(matriz):
+    np.testing.assert_array_equal(matriz.fatia(["B", "A", "B"], 0.5), matriz.fatia(["A", "B"], 0.5))
+    assert matriz.indices_lesoes(["B", "A"]) == [0, 1]
+
+
+def test_severity_interpolates_between_normal_and_residual(matriz):
+    half, full = matriz.fatia(["A", "B"], 0.5), matriz.fatia(["A", "B"], 1.0)
+    np.testing.assert_allclose(half, 0.5 * (matriz.normal + full))
+
+
+def test_invalid_inputs(matriz):
+    with pytest.raises(ValueError):
+        matriz.fatia(["C"], 1.0)
+    with pytest.raises(ValueError):
+        matriz.fatia(["A"], 0.3)
+
+
+def test_content_matrix_is_linear_in_lesions():
+    matriz = carregar_matriz_impacto()
+    assert matriz.residual.shape == (len(matriz.lesoes), len(matriz.divisoes))
+    linhas = matriz.valores_heatmap(list(matriz.lesoes), matriz.severidades[-1])
+    assert len(linhas) == len(matriz.fases) * len(matriz.divisoes)
+    assert all(linha["Perda"] >= 0 or not linha["Lesionada"] for linha in linhas)
@@ -0,0 +1,28 @@
+"""Modelo de taxas dos NCP (`modelo_ncp`): valores de referência e broadcasting."""
+import numpy as np
+import pytest
+
+from modelo_ncp import (FM_TO_NCP_GAIN, FT_TO_NCP_GAIN, NCP_BASELINE_ACTIVITY_HZ, NCPParams,
+                        ncp_final_firing_rate_hz, ncp_rate_grid, ncp_response)
+
+
+def test_reference_values():
+    response = ncp_response(2.0, 1.0, 5.0)
+    assert response.total_direct_excitation == pytest.approx(NCP_BASELINE_ACTIVITY_HZ + 2 * FM_TO_NCP_GAIN
+                                                             + FT_TO_NCP_GAIN)
+    assert response.effective_pc_inhibition == pytest.approx(60.0)
+    assert response.final_rate_hz == 0.0                    # Inibição maior que a excitação: zera, não fica negativa
+    assert ncp_final_firing_rate_hz(0.0, 0.0, 0.0) == NCP_BASELINE_ACTIVITY_HZ
+
+
+def test_grid_matches_scalar_calls():
+    fm, ft, pc = np.linspace(0, 10, 5), np.linspace(0, 10, 4), np.linspace(0, 10, 3)
+    grid = ncp_rate_grid(fm, ft, pc)
+    assert grid.final_rate_hz.shape == (5, 4, 3)
+    for i, j, k in [(0, 0, 0), (4, 3, 2), (2, 1, 1), (4, 0, 2)]:
+        assert grid.final_rate_hz[i, j, k] == ncp_final_firing_rate_hz(fm[i], ft[j], pc[k])
+
+
+def test_custom_params():
+    params = NCPParams(baseline_hz=0.0, fm_gain=1.0, ft_gain=0.0)
+    np.testing.assert_array_equal(ncp_final_firing_rate_hz(np.arange(3.0), 7.0, 0.0, params), [0.0, 1.0, 2.0])
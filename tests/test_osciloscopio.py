@@ -0,0 +1,48 @@
+"""Osciloscópio (`osciloscopio`): buffer circular, fluxo de picos em blocos e quadros."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_OSCILLOSCOPE, philox_rng
+from osciloscopio import Oscilloscope, RingBuffer, SpikeStream
+
+
+def test_ring_buffer_wraparound_keeps_the_latest_samples():
+    rng = np.random.default_rng(0)
+    ring, written = RingBuffer(100), np.empty(0)
+    for size in [30, 50, 70, 1, 0, 99, 100, 250, 3]:               # Volta ao início, blocos maiores que o buffer
+        block = np.arange(len(written), len(written) + size, dtype=float)
+        ring.extend(block, rng.standard_normal(size).astype(np.float32))
+        written = np.concatenate((written, block))
+        time, _ = ring.view()
+        np.testing.assert_array_equal(time, written[-100:])
+        assert ring.size == min(100, len(written))
+
+
+def test_stream_rate_and_refractory_across_chunks():
+    stream = SpikeStream(philox_rng(0, STREAM_OSCILLOSCOPE), refractory_ms=2.0, resolution_ms=0.1)
+    chunks = [stream.advance(50.0, chunk_ms) for chunk_ms in np.tile([7.0, 100.0, 33.3], 1000)]
+    spikes = np.concatenate([spikes for _, spikes in chunks])
+    duration_s = stream.t_ms / 1000.0
+    assert len(spikes) / duration_s == pytest.approx(50.0, rel=0.05)
+    assert np.diff(spikes).min() >= 2.0 - 1e-9
+    starts = [start for start, _ in chunks]
+    assert starts[0] == 0.0 and np.all(np.diff(starts) > 0)
+
+
+def test_rate_change_takes_effect_in_the_next_chunk():
+    stream = SpikeStream(philox_rng(1, STREAM_OSCILLOSCOPE))
+    _, silent = stream.advance(0.0, 1000.0)
+    _, active = stream.advance(100.0, 10_000.0)
+    assert len(silent) == 0 and len(active) == pytest.approx(1000, abs=150)
+
+
+def test_frames_have_fixed_size_and_stats_follow_the_stream():
+    scope = Oscilloscope(philox_rng(2, STREAM_OSCILLOSCOPE), refractory_ms=2.0, resolution_ms=1.0, history_ms=500.0)
+    first = scope.step_realtime(30.0, now_s=0.0)
+    assert first == 500                                            # Primeiro quadro enche o histórico
+    for k in range(1, 50):
+        scope.step_realtime(30.0, now_s=k * 0.1)
+    time, value = scope.buffer.view()
+    assert len(time) == 500 and np.all(np.diff(time) == 1.0)
+    assert time[-1] == scope.stream.t_ms - 1.0
+    assert scope.stats.n_spikes == scope.n_spikes
@@ -0,0 +1,49 @@
+"""População LIF (`populacao_lif`): raster, taxa e período refratário."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_LIF_POPULATION, philox_rng
+from populacao_lif import MAX_NEURONS, LIFParams, simulate_lif_population
+
+DT_MS = 0.25
+
+
+def simulate(n_neurons=300, excitation_hz=80.0, duration_ms=400.0, seed=0, **options):
+    return simulate_lif_population(n_neurons, excitation_hz, 0.0, duration_ms, dt_ms=DT_MS,
+                                   rng=philox_rng(seed, STREAM_LIF_POPULATION), **options)
+
+
+def test_reproducible_with_same_stream():
+    a, b = simulate(), simulate()
+    np.testing.assert_array_equal(a.raster_times_ms, b.raster_times_ms)
+    np.testing.assert_array_equal(a.rate_hz, b.rate_hz)
+
+
+def test_raster_covers_first_neurons_and_matches_rate():
+    # Com todos os neurônios gravados, o raster tem exatamente os picos que entram na taxa
+    result = simulate(n_raster=300, chunk_steps=60)              # Blocos que não dividem a duração
+    assert result.raster_neurons.max() < 300
+    spikes = len(result.raster_times_ms)
+    assert spikes == pytest.approx(result.rate_hz.mean() * 300 * 0.4, rel=1e-9)
+    assert np.all(np.diff(result.raster_times_ms) >= 0)
+    partial = simulate(n_raster=50)
+    assert partial.raster_neurons.max() < 50
+
+
+def test_refractory_period_is_respected():
+    params = LIFParams()
+    result = simulate(excitation_hz=200.0, n_raster=300, params=params)
+    for neuron in range(0, 300, 37):
+        isi = np.diff(result.raster_times_ms[result.raster_neurons == neuron])
+        assert len(isi) and isi.min() > params.refractory_ms - 1e-6
+
+
+def test_rate_grows_with_excitation():
+    rates = [simulate(excitation_hz=hz).mean_rate_hz for hz in (0.0, 40.0, 80.0, 200.0)]
+    assert np.all(np.diff(rates) > 0)
+    assert len(simulate().rate_hz) == 400 / 5.0                   # Bins de 5 ms
+
+
+def test_neuron_count_is_bounded():
+    with pytest.raises(ValueError):
+        simulate(n_neurons=MAX_NEURONS + 1)
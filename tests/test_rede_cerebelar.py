@@ -0,0 +1,55 @@
+"""Rede esparsa (`rede_cerebelar`): produto CSR contra o denso e efeito dos controles."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_NETWORK, philox_rng
+from rede_cerebelar import MAX_DURATION_MS, CerebellarNetwork, CSRMatrix, NetworkConfig, simulate_network
+
+CONFIG = NetworkConfig(n_mf=200, n_gc=2000, n_pc=20, n_ncp=10, pf_per_pc=200)
+
+
+@pytest.fixture(scope="module")
+def network():
+    return CerebellarNetwork(CONFIG)
+
+
+def simulate(network, fm=5.0, ft=5.0, pc_scale=5.0, duration_ms=500.0, seed=0):
+    return simulate_network(network, fm, ft, pc_scale, duration_ms, rng=philox_rng(seed, STREAM_NETWORK))
+
+
+def test_spike_matvec_matches_dense():
+    rng = np.random.default_rng(0)
+    rows, cols = rng.integers(0, 50, 400), rng.integers(0, 30, 400)
+    data = rng.standard_normal(400)
+    matrix = CSRMatrix.from_coo(rows, cols, data, (50, 30))
+    dense = np.zeros((50, 30))
+    np.add.at(dense, (rows, cols), data)
+    active = np.array([0, 3, 7, 49])
+    np.testing.assert_allclose(matrix.spike_matvec(active), dense[active].sum(axis=0), rtol=1e-5, atol=1e-5)
+    assert not matrix.spike_matvec(np.empty(0, dtype=np.int64)).any()
+
+
+def test_connectivity_counts(network):
+    c = CONFIG
+    assert network.weights.nnz == (c.n_gc * c.mf_per_gc + c.n_pc * (c.pf_per_pc + 1)
+                                   + c.n_ncp * (c.mf_per_ncp + c.cf_per_ncp + c.pc_per_ncp))
+    # A fatia CP→NCP só tem os pesos inibitórios
+    assert np.all(network.weights.data[network.pc_slice] == -c.w_pc_ncp_max)
+
+
+def test_reproducible_with_same_stream(network):
+    a, b = simulate(network), simulate(network)
+    np.testing.assert_array_equal(a.ncp_rate_hz, b.ncp_rate_hz)
+    assert len(a.time_ms) == len(a.gc_rate_hz) == 100               # Bins de 5 ms
+
+
+def test_controls_move_rates_in_the_expected_direction(network):
+    quiet, driven = simulate(network, fm=0.0).mean_rates(), simulate(network, fm=10.0).mean_rates()
+    assert driven["gc"] > quiet["gc"]
+    strong, weak = simulate(network, pc_scale=10.0).mean_rates(), simulate(network, pc_scale=0.0).mean_rates()
+    assert weak["ncp"] > strong["ncp"]
+
+
+def test_duration_is_bounded(network):
+    with pytest.raises(ValueError):
+        simulate(network, duration_ms=MAX_DURATION_MS + 1)
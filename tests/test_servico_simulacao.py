@@ -0,0 +1,68 @@
+"""Serviço de simulação (`servico_simulacao`): coalescência, memória compartilhada e troca de pool quebrado."""
+import os
+import signal
+import time
+
+import numpy as np
+import pytest
+
+from cache_simulacao import SimulationCache, cache_key
+from servico_simulacao import SHM_MIN_BYTES, SimulationService
+
+ARGS = (100.0, 1_000_000.0, 3, 1.0, 0.1)     # ~10⁵ picos: volta por memória compartilhada
+
+
+@pytest.fixture
+def service():
+    service = SimulationService(workers=1)
+    yield service
+    service.shutdown()
+
+
+def inline(*args):
+    return SimulationService(workers=0).submit(cache_key("spike_train", *args), "spike_train", *args).result()
+
+
+def test_pool_result_matches_inline_run(service):
+    result = service.submit(cache_key("spike_train", *ARGS), "spike_train", *ARGS).result()
+    assert result.nbytes >= SHM_MIN_BYTES
+    np.testing.assert_array_equal(result, inline(*ARGS))
+
+
+def test_identical_requests_share_one_future(service):
+    key = cache_key("spike_train", *ARGS)
+    first = service.submit(key, "spike_train", *ARGS)
+    second = service.submit(key, "spike_train", *ARGS)      # Antes de o worker terminar o primeiro
+    assert second is first
+    first.result()
+    assert service.stats()["submitted"] == 1 and service.stats()["coalesced"] == 1
+    assert service.stats()["in_flight"] == 0
+
+
+def test_finished_requests_are_served_from_cache():
+    service = SimulationService(SimulationCache(), workers=0)
+    key = cache_key("spike_train", *ARGS)
+    first = service.submit(key, "spike_train", *ARGS).result()
+    second = service.submit(key, "spike_train", *ARGS).result()
+    assert second is first
+    assert service.stats()["submitted"] == 1 and service.cache.hits == 1
+
+
+def test_dead_worker_is_replaced(service):
+    broken = service._pool
+    for pid in list(broken._processes):
+        os.kill(pid, signal.SIGKILL)
+    deadline = time.monotonic() + 30
+    while not broken._broken and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert broken._broken
+    # O pedido seguinte roda num pool novo, sem deixar a chave pendente
+    result = service.submit(cache_key("spike_train", *ARGS), "spike_train", *ARGS).result()
+    np.testing.assert_array_equal(result, inline(*ARGS))
+    assert service._pool is not broken
+    assert service.stats()["restarts"] == 1 and service.stats()["in_flight"] == 0
+
+
+def test_unknown_kind():
+    with pytest.raises(ValueError):
+        SimulationService(workers=0).submit("k", "inexistente")
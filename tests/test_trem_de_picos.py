@@ -0,0 +1,36 @@
+"""Trem de picos de Poisson (`trem_de_picos`): taxa, período refratário, grade e traço."""
+import numpy as np
+import pytest
+
+from cache_simulacao import STREAM_SPIKE_TRAIN, philox_rng
+from trem_de_picos import MIN_RESOLUTION_MS, poisson_spike_times, voltage_trace
+
+DURATION_MS = 100_000.0
+
+
+@pytest.mark.parametrize("rate_hz, refractory_ms", [(5.0, 0.0), (50.0, 2.0), (200.0, 3.0)])
+def test_rate_and_refractory_period(rate_hz, refractory_ms):
+    spikes = poisson_spike_times(rate_hz, DURATION_MS, philox_rng(0, STREAM_SPIKE_TRAIN), refractory_ms, 0.1)
+    expected = rate_hz * DURATION_MS / 1000.0
+    assert len(spikes) == pytest.approx(expected, abs=5 * np.sqrt(expected))   # Taxa corrigida pelo refratário
+    assert spikes.min() >= 0.0 and spikes.max() < DURATION_MS
+    assert np.diff(spikes).min() >= refractory_ms - 1e-9
+    np.testing.assert_allclose(spikes / 0.1, np.round(spikes / 0.1), atol=1e-6)
+
+
+def test_saturated_rate_fires_every_refractory_period():
+    spikes = poisson_spike_times(1000.0, 100.0, philox_rng(0, STREAM_SPIKE_TRAIN), refractory_ms=2.0, resolution_ms=1.0)
+    np.testing.assert_array_equal(spikes, np.arange(2.0, 100.0, 2.0))
+
+
+def test_silent_and_invalid_inputs():
+    assert len(poisson_spike_times(0.0, 1000.0)) == 0
+    with pytest.raises(ValueError):
+        poisson_spike_times(10.0, 1000.0, resolution_ms=MIN_RESOLUTION_MS / 2)
+
+
+def test_voltage_trace_window():
+    time_ms, voltage = voltage_trace(np.array([1.0, 12.0, 14.0, 30.0]), 10.0, 20.0, 1.0, -70, 30)
+    np.testing.assert_array_equal(time_ms, np.arange(10.0, 20.0))
+    np.testing.assert_array_equal(np.flatnonzero(voltage == 30), [2, 4])       # Só os picos dentro da janela
+    assert np.all(voltage[voltage != 30] == -70)
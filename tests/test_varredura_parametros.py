@@ -0,0 +1,32 @@
+"""Estatísticas da varredura (`varredura_parametros`) contra trens gerados por `poisson_spike_times`."""
+import numpy as np
+import pytest
+
+from cache_simulacao import philox_rng
+from trem_de_picos import poisson_spike_times
+from varredura_parametros import MAX_ISI_COLUMNS, spike_statistics
+
+RATES_HZ = np.array([0.0, 5.0, 50.0, 150.0])
+N_TRIALS = 200
+REFRACTORY_MS = 1.0
+RESOLUTION_MS = 1.0
+
+
+def reference(rate_hz, duration_ms):
+    """Taxa média e CV dos ISIs dos mesmos ensaios, a partir dos tempos dos picos."""
+    rng = np.random.default_rng(7)
+    trains = [poisson_spike_times(rate_hz, duration_ms, rng, REFRACTORY_MS, RESOLUTION_MS) for _ in range(N_TRIALS)]
+    isi = np.concatenate([np.diff(train) for train in trains])
+    return np.mean([len(train) for train in trains]) / (duration_ms / 1000.0), isi.std() / isi.mean()
+
+
+@pytest.mark.parametrize("duration_ms", [200.0, 20 * MAX_ISI_COLUMNS])   # Uma passada e várias
+def test_statistics_match_spike_times(duration_ms):
+    stats = spike_statistics(RATES_HZ, N_TRIALS, duration_ms, REFRACTORY_MS, RESOLUTION_MS, philox_rng(0, 6))
+    assert stats["spike_rate_mean_hz"][0] == 0.0
+    for i, rate_hz in enumerate(RATES_HZ[1:], start=1):
+        mean_hz, cv = reference(rate_hz, duration_ms)
+        # Mesmo processo, sorteios diferentes: concordância estatística
+        assert stats["spike_rate_mean_hz"][i] == pytest.approx(mean_hz, rel=0.1, abs=1.0)
+        if rate_hz * duration_ms / 1000.0 >= 5:
+            assert stats["isi_cv"][i] == pytest.approx(cv, rel=0.1)
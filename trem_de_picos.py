@@ -0,0 +1,67 @@
+"""Gerador de trens de picos de Poisson orientado a eventos.
+
+Os picos são guardados como arrays de tempos (ms), obtidos a partir de
+intervalos entre picos exponenciais; o custo cresce com o número de picos e
+não com a duração ou a resolução. O traço de voltagem é montado apenas para
+a janela visível.
+"""
+import numpy as np
+
+MIN_RESOLUTION_MS = 0.01   # Resolução temporal mínima suportada (ms)
+RESTING_POTENTIAL_MV = -70
+SPIKE_PEAK_MV = 30
+
+
+def _check_resolution(resolution_ms):
+    if resolution_ms < MIN_RESOLUTION_MS:
+        raise ValueError(f"resolution_ms deve ser >= {MIN_RESOLUTION_MS} ms (recebido {resolution_ms}).")
+
+
+def poisson_spike_times(rate_hz, duration_ms, rng=None, refractory_ms=0.0,
+                        resolution_ms=MIN_RESOLUTION_MS, start_ms=0.0):
+    """Tempos de disparo (ms) de um processo de Poisson com período refratário.
+
+    Cada intervalo entre picos é `refractory_ms + Exp(1/λ')`, com λ' corrigido
+    para que a taxa média continue igual a `rate_hz`. Os tempos são
+    arredondados para a grade de `resolution_ms`.
+    """
+    _check_resolution(resolution_ms)
+    rng = np.random.default_rng() if rng is None else rng
+    if rate_hz <= 0 or duration_ms <= 0:
+        return np.empty(0)
+
+    rate_per_ms = rate_hz / 1000.0
+    dead_fraction = rate_per_ms * refractory_ms
+    if dead_fraction >= 1.0:
+        # Taxa saturada: o neurônio dispara a cada período refratário
+        times = start_ms + np.arange(refractory_ms, duration_ms, refractory_ms)
+        return np.round(times / resolution_ms) * resolution_ms
+    mean_exp_ms = (1.0 - dead_fraction) / rate_per_ms
+
+    # Sorteia blocos de intervalos até cobrir a duração pedida
+    expected = rate_per_ms * duration_ms
+    block = int(expected + 5.0 * np.sqrt(expected) + 10)
+    chunks = []
+    t_last = 0.0
+    while t_last < duration_ms:
+        isi = refractory_ms + rng.exponential(mean_exp_ms, size=block)
+        times = t_last + np.cumsum(isi)
+        chunks.append(times)
+        t_last = times[-1]
+    times = np.concatenate(chunks)
+    times = times[:np.searchsorted(times, duration_ms)]
+    return start_ms + np.round(times / resolution_ms) * resolution_ms
+
+
+def voltage_trace(spike_times_ms, window_start_ms, window_end_ms, resolution_ms=1.0,
+                  resting_mv=RESTING_POTENTIAL_MV, peak_mv=SPIKE_PEAK_MV):
+    """Traço esquemático (tempo, voltagem) restrito à janela [início, fim)."""
+    _check_resolution(resolution_ms)
+    n_samples = int(round((window_end_ms - window_start_ms) / resolution_ms))
+    time_ms = window_start_ms + np.arange(n_samples) * resolution_ms
+    voltage = np.full(n_samples, resting_mv, dtype=float)
+
+    lo, hi = np.searchsorted(spike_times_ms, [window_start_ms, window_end_ms])
+    idx = np.round((spike_times_ms[lo:hi] - window_start_ms) / resolution_ms).astype(np.int64)
+    voltage[idx[idx < n_samples]] = peak_mv
+    return time_ms, voltage
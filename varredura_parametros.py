@@ -0,0 +1,321 @@
+"""Varredura FM × FT × inibição da CP pela linha de comando, em partes retomáveis.
+
+Para cada combinação da grade calcula a taxa dos NCP (`modelo_ncp`) e
+estatísticas de K ensaios do trem de picos (mesmo processo de Poisson com
+período refratário de `trem_de_picos`): taxa média e desvio entre ensaios,
+fator de Fano das contagens e média/CV dos intervalos entre picos (ISI).
+
+    python varredura_parametros.py --fm 0 10 0.1 --ft 0 10 0.1 --pc 0 10 0.1 --trials 10
+
+(a grade padrão é a dos sliders do app: 101³ ≈ 10⁶ combinações). As
+combinações são numeradas em ordem C (FM, FT, CP) e cortadas em partes de
+`--chunk-rows` linhas; cada parte é um job de um processo do pool, com o
+subfluxo Philox do seu índice, e é gravada de forma atômica como
+`parte-NNNNN.parquet` (ou `.csv`). A memória de cada processo fica limitada
+a uma parte. O `manifesto.json` guarda a configuração: rodar de novo o mesmo
+comando no mesmo diretório pula as partes já gravadas e continua uma
+varredura interrompida com os mesmos números que ela teria produzido.
+
+Parquet depende do pacote opcional `pyarrow`; CSV não tem dependências.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+from cache_simulacao import STREAM_SWEEP, philox_rng
+from modelo_ncp import DEFAULT_PARAMS, ncp_response
+from trem_de_picos import MIN_RESOLUTION_MS
+
+DEFAULT_OUTPUT = Path(os.environ.get("CEREBELO_SWEEP_DIR", Path(".cache") / "varredura"))
+DEFAULT_AXIS = (0.0, 10.0, 0.1)          # Faixa e passo dos sliders do app
+DEFAULT_TRIALS = 10
+DEFAULT_CHUNK_ROWS = 50_000              # Combinações por arquivo
+TRAINS_PER_BLOCK = 8192                  # Trens materializados de cada vez dentro de uma parte
+MAX_ISI_COLUMNS = 256                    # ISIs sorteados por trem em cada passada (trens longos: várias)
+FORMATS = ("parquet", "csv")
+COLUMNS = ("fm_strength", "ft_strength", "pc_inhibition_scale", "ncp_rate_hz", "spike_rate_mean_hz",
+           "spike_rate_std_hz", "fano_factor", "isi_mean_ms", "isi_cv")
+
+
+def sweep_axis(start, stop, step):
+    """Valores start, start + step, ..., até stop (inclusive, com folga de arredondamento)."""
+    if step <= 0 or stop < start:
+        raise ValueError(f"Eixo inválido: início {start}, fim {stop}, passo {step}.")
+    n = int(np.floor((stop - start) / step + 1e-9)) + 1
+    return np.round(start + step * np.arange(n), 10)
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    fm: tuple = DEFAULT_AXIS
+    ft: tuple = DEFAULT_AXIS
+    pc: tuple = DEFAULT_AXIS
+    n_trials: int = DEFAULT_TRIALS
+    duration_ms: float = 200.0           # Padrões das opções da simulação de picos do app
+    refractory_ms: float = 1.0
+    resolution_ms: float = 1.0
+    seed: int = 0
+    chunk_rows: int = DEFAULT_CHUNK_ROWS
+    format: str = "parquet"
+
+    def __post_init__(self):
+        if self.n_trials < 1:
+            raise ValueError(f"n_trials deve ser >= 1 (recebido {self.n_trials}).")
+        if self.duration_ms <= 0 or self.refractory_ms < 0:
+            raise ValueError("duration_ms deve ser > 0 e refractory_ms >= 0.")
+        if self.resolution_ms < MIN_RESOLUTION_MS:
+            raise ValueError(f"resolution_ms deve ser >= {MIN_RESOLUTION_MS} ms (recebido {self.resolution_ms}).")
+        if self.chunk_rows < 1:
+            raise ValueError(f"chunk_rows deve ser >= 1 (recebido {self.chunk_rows}).")
+        if self.format not in FORMATS:
+            raise ValueError(f"format deve ser um de {FORMATS} (recebido {self.format!r}).")
+
+    def axes(self):
+        return sweep_axis(*self.fm), sweep_axis(*self.ft), sweep_axis(*self.pc)
+
+    @property
+    def shape(self):
+        return tuple(len(axis) for axis in self.axes())
+
+    @property
+    def n_combinations(self):
+        return int(np.prod(self.shape))
+
+    @property
+    def n_chunks(self):
+        return -(-self.n_combinations // self.chunk_rows)
+
+    def chunk_path(self, directory, chunk):
+        return Path(directory) / f"parte-{chunk:05d}.{self.format}"
+
+    def as_json(self):
+        return json.loads(json.dumps(asdict(self)))     # Tuplas viram listas, como no manifesto
+
+
+# --- Estatísticas dos trens ---
+
+def _train_statistics(rates_hz, duration_ms, refractory_ms, resolution_ms, rng):
+    """Contagem e somas dos ISIs de um trem por taxa, sem guardar os tempos.
+
+    Mesmo processo de `poisson_spike_times` (ISI = refratário + Exp corrigida,
+    tempos arredondados para a grade), sorteado para todos os trens de uma vez
+    em blocos de até `MAX_ISI_COLUMNS` colunas, até todos passarem de
+    `duration_ms`: a memória não depende da duração.
+    """
+    n = len(rates_hz)
+    counts = np.zeros(n, dtype=np.int64)
+    n_isi = np.zeros(n, dtype=np.int64)
+    isi_sum = np.zeros(n)
+    isi_sq_sum = np.zeros(n)
+
+    rows = np.flatnonzero(rates_hz > 0)
+    rate_per_ms = rates_hz[rows] / 1000.0
+    # Taxa saturada (refratário ≥ 1/λ): ISI = refratário, como no gerador
+    mean_exp_ms = np.maximum(1.0 - rate_per_ms * refractory_ms, 0.0) / rate_per_ms
+    t_last = np.zeros(len(rows))
+    last_rounded = np.full(len(rows), np.nan)
+    while len(rows):
+        expected = duration_ms / (refractory_ms + mean_exp_ms.min())
+        n_cols = min(int(expected + 5.0 * np.sqrt(expected) + 10), MAX_ISI_COLUMNS)
+        isi = refractory_ms + rng.standard_exponential((len(rows), n_cols)) * mean_exp_ms[:, None]
+        times = t_last[:, None] + np.cumsum(isi, axis=1)
+        inside = times < duration_ms
+        rounded = np.round(times / resolution_ms) * resolution_ms
+        diffs = np.diff(rounded, axis=1, prepend=last_rounded[:, None])
+        valid = inside & ~np.isnan(diffs)
+        diffs = np.where(valid, diffs, 0.0)
+        n_inside = inside.sum(axis=1)
+
+        counts[rows] += n_inside
+        n_isi[rows] += valid.sum(axis=1)
+        isi_sum[rows] += diffs.sum(axis=1)
+        isi_sq_sum[rows] += np.einsum("ij,ij->i", diffs, diffs)
+        has_spikes = n_inside > 0
+        last_rounded[has_spikes] = rounded[has_spikes, n_inside[has_spikes] - 1]
+
+        going = times[:, -1] < duration_ms
+        rows, mean_exp_ms = rows[going], mean_exp_ms[going]
+        t_last, last_rounded = times[going, -1], last_rounded[going]
+    return counts, n_isi, isi_sum, isi_sq_sum
+
+
+def spike_statistics(rates_hz, n_trials, duration_ms, refractory_ms, resolution_ms, rng):
+    """Estatísticas de `n_trials` ensaios por taxa; memória limitada a `TRAINS_PER_BLOCK` trens."""
+    rates_hz = np.asarray(rates_hz, dtype=float)
+    n = len(rates_hz)
+    stats = {name: np.full(n, np.nan) for name in COLUMNS[4:]}
+    duration_s = duration_ms / 1000.0
+    per_block = max(1, TRAINS_PER_BLOCK // n_trials)
+    for start in range(0, n, per_block):
+        block = slice(start, min(start + per_block, n))
+        counts, *isi_sums = _train_statistics(np.repeat(rates_hz[block], n_trials), duration_ms,
+                                              refractory_ms, resolution_ms, rng)
+        counts = counts.reshape(-1, n_trials)
+        # ISIs agrupados dos ensaios de cada combinação
+        n_isi, isi_sum, isi_sq_sum = (a.reshape(-1, n_trials).sum(axis=1) for a in isi_sums)
+        mean_count = counts.mean(axis=1)
+        stats["spike_rate_mean_hz"][block] = mean_count / duration_s
+        if n_trials > 1:
+            var_count = counts.var(axis=1, ddof=1)
+            stats["spike_rate_std_hz"][block] = np.sqrt(var_count) / duration_s
+            with np.errstate(divide="ignore", invalid="ignore"):
+                stats["fano_factor"][block] = np.where(mean_count > 0, var_count / mean_count, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            isi_mean = np.where(n_isi > 0, isi_sum / n_isi, np.nan)
+            isi_var = np.maximum(isi_sq_sum / n_isi - isi_mean ** 2, 0.0)
+            stats["isi_mean_ms"][block] = isi_mean
+            stats["isi_cv"][block] = np.where((n_isi > 1) & (isi_mean > 0), np.sqrt(isi_var) / isi_mean, np.nan)
+    return stats
+
+
+# --- Partes ---
+
+def compute_chunk(config, chunk, params=DEFAULT_PARAMS):
+    """Colunas (dict nome → array) das combinações da parte `chunk`."""
+    fm_axis, ft_axis, pc_axis = config.axes()
+    first = chunk * config.chunk_rows
+    index = np.arange(first, min(first + config.chunk_rows, config.n_combinations))
+    i_fm, i_ft, i_pc = np.unravel_index(index, config.shape)
+    fm, ft, pc = fm_axis[i_fm], ft_axis[i_ft], pc_axis[i_pc]
+    ncp_rate = ncp_response(fm, ft, pc, params).final_rate_hz
+    stats = spike_statistics(ncp_rate, config.n_trials, config.duration_ms, config.refractory_ms,
+                             config.resolution_ms, philox_rng(config.seed, STREAM_SWEEP, chunk))
+    columns = {"fm_strength": fm, "ft_strength": ft, "pc_inhibition_scale": pc, "ncp_rate_hz": ncp_rate}
+    columns.update((name, values.astype(np.float32)) for name, values in stats.items())
+    return columns
+
+
+def write_chunk(columns, path, file_format):
+    """Grava as colunas de forma atômica (arquivo temporário + `os.replace`)."""
+    path = Path(path)
+    tmp = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        pq.write_table(pa.table(columns), tmp)
+    else:
+        np.savetxt(tmp, np.column_stack([columns[name] for name in COLUMNS]), fmt="%.6g", delimiter=",",
+                   header=",".join(COLUMNS), comments="")
+    os.replace(tmp, path)
+
+
+def _run_chunk(config, directory, chunk):
+    start = time.perf_counter()
+    columns = compute_chunk(config, chunk)
+    write_chunk(columns, config.chunk_path(directory, chunk), config.format)
+    return chunk, len(columns["ncp_rate_hz"]), time.perf_counter() - start
+
+
+def prepare_directory(config, directory):
+    """Cria o diretório e o manifesto, ou confere o manifesto de uma varredura anterior.
+
+    Devolve as partes que ainda faltam.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / "manifesto.json"
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest["config"] != config.as_json():
+            raise ValueError(f"{directory} contém uma varredura com outra configuração; use outro --output.")
+    else:
+        tmp = directory / "manifesto.tmp.json"
+        tmp.write_text(json.dumps({"config": config.as_json(), "columns": list(COLUMNS), "shape": config.shape,
+                                   "n_combinations": config.n_combinations, "n_chunks": config.n_chunks},
+                                  indent=2), encoding="utf-8")
+        os.replace(tmp, manifest_path)
+    for stale in directory.glob("parte-*.tmp.*"):
+        stale.unlink()
+    return [chunk for chunk in range(config.n_chunks) if not config.chunk_path(directory, chunk).exists()]
+
+
+def run_sweep(config, directory, workers=os.cpu_count() or 1, progress=None):
+    """Calcula as partes que faltam em `workers` processos; devolve quantas foram calculadas agora."""
+    pending = prepare_directory(config, directory)
+    if not pending:
+        return 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(pending)), mp_context=get_context("spawn")) as pool:
+        # No máximo duas partes por processo em voo: a fila não cresce com a grade
+        queue = iter(pending)
+        running = set()
+        try:
+            while True:
+                while len(running) < 2 * workers:
+                    chunk = next(queue, None)
+                    if chunk is None:
+                        break
+                    running.add(pool.submit(_run_chunk, config, str(directory), chunk))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()      # Sempre: a exceção de um worker interrompe a varredura
+                    if progress is not None:
+                        progress(*result)
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varredura FM × FT × inibição da CP do modelo dos NCP.")
+    for axis, name in (("fm", "FM"), ("ft", "FT"), ("pc", "inibição da CP")):
+        parser.add_argument(f"--{axis}", nargs=3, type=float, default=list(DEFAULT_AXIS),
+                            metavar=("INICIO", "FIM", "PASSO"), help=f"Faixa de {name} (padrão: 0 10 0.1).")
+    parser.add_argument("--trials", type=int, default=DEFAULT_TRIALS, help="Ensaios do trem de picos por combinação.")
+    parser.add_argument("--duration", type=float, default=SweepConfig.duration_ms, help="Duração de cada ensaio (ms).")
+    parser.add_argument("--refractory", type=float, default=SweepConfig.refractory_ms, help="Período refratário (ms).")
+    parser.add_argument("--resolution", type=float, default=SweepConfig.resolution_ms,
+                        help="Grade dos tempos dos picos (ms).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Combinações por arquivo.")
+    parser.add_argument("--format", choices=FORMATS, default="parquet", help="Formato das partes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Processos de cálculo.")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Diretório de saída.")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet requer o pacote opcional pyarrow; use --format csv.")
+    try:
+        config = SweepConfig(tuple(args.fm), tuple(args.ft), tuple(args.pc), args.trials, args.duration,
+                             args.refractory, args.resolution, args.seed, args.chunk_rows, args.format)
+    except ValueError as error:
+        parser.error(str(error))
+
+    print(f"{config.n_combinations} combinações {config.shape} × {config.n_trials} ensaios "
+          f"em {config.n_chunks} partes de até {config.chunk_rows} linhas → {args.output}")
+    start = time.perf_counter()
+    finished = [0]
+
+    def progress(chunk, rows, elapsed_s):
+        finished[0] += 1
+        print(f"  parte {chunk:>5}: {rows} linhas em {elapsed_s:.1f} s ({finished[0]} nesta execução)")
+
+    try:
+        computed = run_sweep(config, args.output, args.workers, progress)
+    except KeyboardInterrupt:
+        print(f"Interrompida após {finished[0]} partes; rode o mesmo comando para retomar.", file=sys.stderr)
+        return 130
+    except ValueError as error:
+        print(f"erro: {error}", file=sys.stderr)
+        return 2
+    skipped = config.n_chunks - computed
+    print(f"Varredura completa em {time.perf_counter() - start:.1f} s: {computed} partes calculadas"
+          + (f", {skipped} já existentes." if skipped else "."))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())